@@ -1,10 +1,31 @@
 from django.contrib import admin
-from .models import Consultation
+
+from jevelon_backend.admin import LargeTableAdminMixin
+from .models import TIME_SLOTS, Consultation, SlotAvailability
 
 @admin.register(Consultation)
-class ConsultationAdmin(admin.ModelAdmin):
+class ConsultationAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ['name', 'email', 'project_type', 'preferred_date', 'status', 'email_sent']
     list_filter = ['status', 'project_type', 'email_sent', 'created_at']
     search_fields = ['name', 'email', 'company', 'additional_notes']
     readonly_fields = ['created_at']
     ordering = ['-created_at']
+    date_hierarchy = 'created_at'
+
+
+@admin.register(SlotAvailability)
+class SlotAvailabilityAdmin(admin.ModelAdmin):
+    """Read-only view of the index; it is maintained from the bookings."""
+
+    list_display = ['date', 'booked_slots']
+    ordering = ['-date']
+
+    @admin.display(description='Booked slots')
+    def booked_slots(self, obj):
+        return f"{bin(obj.booked).count('1')}/{len(TIME_SLOTS)}"
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
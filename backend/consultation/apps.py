@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class ConsultationConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'consultation'
+
+    def ready(self):
+        from jevelon_backend import caching
+        from . import signals  # noqa: F401
+        caching.watch(self.get_model('Consultation'))
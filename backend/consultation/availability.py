@@ -0,0 +1,90 @@
+"""
+Slot bookings and the per-day availability index.
+
+``claim`` and ``release`` flip one bit of a ``SlotAvailability`` row with a
+conditional UPDATE, so booking costs one indexed single-row write and two
+concurrent bookings of the same slot serialize on that row alone: the
+second one sees the bit already set, updates nothing and is refused. They
+are called from the ``Consultation`` signal handlers inside the saving
+transaction, so a refused booking rolls back with its record.
+"""
+
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from jevelon_backend.submissions import SubmissionConflict
+from .models import TIME_SLOTS, Consultation, SlotAvailability
+
+FULLY_BOOKED = (1 << len(TIME_SLOTS)) - 1
+
+
+class SlotUnavailable(SubmissionConflict):
+    def __init__(self):
+        super().__init__({'preferred_time': ['This time slot is already booked.']})
+
+
+def _set_bit(date, bit):
+    return (
+        SlotAvailability.objects.alias(held=F('booked').bitand(bit))
+        .filter(date=date, held=0)
+        .update(booked=F('booked') + bit)
+    )
+
+
+def claim(date, slot):
+    """Mark ``slot`` on ``date`` booked, or raise ``SlotUnavailable``."""
+    bit = 1 << slot
+    if _set_bit(date, bit):
+        return
+    try:
+        with transaction.atomic():
+            SlotAvailability.objects.create(date=date, booked=bit)
+        return
+    except IntegrityError:
+        # The day's row exists (or a concurrent booking just created it).
+        pass
+    if not _set_bit(date, bit):
+        raise SlotUnavailable()
+
+
+def release(date, slot):
+    bit = 1 << slot
+    (
+        SlotAvailability.objects.alias(held=F('booked').bitand(bit))
+        .filter(date=date, held=bit)
+        .update(booked=F('booked') - bit)
+    )
+
+
+def is_booked(date, slot):
+    mask = SlotAvailability.objects.filter(date=date).values_list('booked', flat=True).first() or 0
+    return bool(mask & (1 << slot))
+
+
+def free_slots(mask):
+    return [slot for index, slot in enumerate(TIME_SLOTS) if not mask & (1 << index)]
+
+
+def availability(start, end):
+    """``[(date, free slot labels)]`` for every day from ``start`` to ``end``, in one query."""
+    booked = dict(SlotAvailability.objects.filter(date__range=(start, end)).values_list('date', 'booked'))
+    days = (end - start).days + 1
+    return [(day, free_slots(booked.get(day, 0))) for day in (start + timedelta(days=i) for i in range(days))]
+
+
+def rebuild():
+    """Recompute the whole index from the bookings, e.g. after ``bulk_create``."""
+    masks = {}
+    active = Consultation.objects.filter(
+        status__in=Consultation.ACTIVE_STATUSES, preferred_time__in=TIME_SLOTS,
+    ).values_list('preferred_date', 'preferred_time')
+    for date, time in active.iterator():
+        masks[date] = masks.get(date, 0) | 1 << TIME_SLOTS.index(time)
+    with transaction.atomic():
+        SlotAvailability.objects.all().delete()
+        SlotAvailability.objects.bulk_create(
+            SlotAvailability(date=date, booked=mask) for date, mask in masks.items()
+        )
+    return len(masks)
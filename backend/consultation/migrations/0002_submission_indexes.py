@@ -0,0 +1,29 @@
+# Generated by Django 5.0 on 2026-10-18 12:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('consultation', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='consultation',
+            index=models.Index(fields=['-created_at', '-id'], name='consult_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='consultation',
+            index=models.Index(fields=['status', '-created_at'], name='consult_status_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='consultation',
+            index=models.Index(fields=['project_type', '-created_at'], name='consult_type_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='consultation',
+            index=models.Index(condition=models.Q(('email_sent', False)), fields=['created_at'], name='consult_unsent_idx'),
+        ),
+    ]
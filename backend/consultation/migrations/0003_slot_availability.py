@@ -0,0 +1,48 @@
+# Generated by Django 5.0 on 2026-10-18 13:26
+
+from django.db import migrations, models
+
+TIME_SLOTS = [
+    '9:00 AM', '9:30 AM', '10:00 AM', '10:30 AM', '11:00 AM', '11:30 AM',
+    '12:00 PM', '12:30 PM', '1:00 PM', '1:30 PM', '2:00 PM', '2:30 PM',
+    '3:00 PM', '3:30 PM', '4:00 PM', '4:30 PM', '5:00 PM', '5:30 PM',
+]
+
+
+def build_index(apps, schema_editor):
+    """Index the bookings that already exist; duplicates simply share a bit."""
+    Consultation = apps.get_model('consultation', 'Consultation')
+    SlotAvailability = apps.get_model('consultation', 'SlotAvailability')
+    masks = {}
+    active = Consultation.objects.filter(
+        status__in=['pending', 'confirmed'], preferred_time__in=TIME_SLOTS,
+    ).values_list('preferred_date', 'preferred_time')
+    for date, time in active.iterator():
+        masks[date] = masks.get(date, 0) | 1 << TIME_SLOTS.index(time)
+    SlotAvailability.objects.bulk_create(SlotAvailability(date=date, booked=mask) for date, mask in masks.items())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('consultation', '0002_submission_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlotAvailability',
+            fields=[
+                ('date', models.DateField(primary_key=True, serialize=False)),
+                ('booked', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name_plural': 'slot availability',
+            },
+        ),
+        migrations.AlterField(
+            model_name='consultation',
+            name='preferred_time',
+            field=models.CharField(choices=[('9:00 AM', '9:00 AM'), ('9:30 AM', '9:30 AM'), ('10:00 AM', '10:00 AM'), ('10:30 AM', '10:30 AM'), ('11:00 AM', '11:00 AM'), ('11:30 AM', '11:30 AM'), ('12:00 PM', '12:00 PM'), ('12:30 PM', '12:30 PM'), ('1:00 PM', '1:00 PM'), ('1:30 PM', '1:30 PM'), ('2:00 PM', '2:00 PM'), ('2:30 PM', '2:30 PM'), ('3:00 PM', '3:00 PM'), ('3:30 PM', '3:30 PM'), ('4:00 PM', '4:00 PM'), ('4:30 PM', '4:30 PM'), ('5:00 PM', '5:00 PM'), ('5:30 PM', '5:30 PM')], max_length=20),
+        ),
+        migrations.RunPython(build_index, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,16 @@
+from django.core.exceptions import ValidationError
 from django.db import models
 
 # Create your models here.
 
+# Bookable half-hour slots (IST), in the order the frontend offers them.
+TIME_SLOTS = [
+    '9:00 AM', '9:30 AM', '10:00 AM', '10:30 AM', '11:00 AM', '11:30 AM',
+    '12:00 PM', '12:30 PM', '1:00 PM', '1:30 PM', '2:00 PM', '2:30 PM',
+    '3:00 PM', '3:30 PM', '4:00 PM', '4:30 PM', '5:00 PM', '5:30 PM',
+]
+
+
 class Consultation(models.Model):
     STATUS_CHOICES = [
         ('pending', 'Pending'),
@@ -9,6 +18,9 @@ class Consultation(models.Model):
         ('completed', 'Completed'),
         ('cancelled', 'Cancelled'),
     ]
+    # Bookings in these states hold their slot.
+    ACTIVE_STATUSES = ('pending', 'confirmed')
+    TIME_CHOICES = [(slot, slot) for slot in TIME_SLOTS]
     
     name = models.CharField(max_length=100)
     email = models.EmailField()
@@ -16,14 +28,68 @@ class Consultation(models.Model):
     company = models.CharField(max_length=100, blank=True)
     project_type = models.CharField(max_length=50)
     preferred_date = models.DateField()
-    preferred_time = models.CharField(max_length=20)
+    preferred_time = models.CharField(max_length=20, choices=TIME_CHOICES)
     additional_notes = models.TextField(blank=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     created_at = models.DateTimeField(auto_now_add=True)
     email_sent = models.BooleanField(default=False)
     
+    # (date, slot index) this booking held when loaded: None for new or
+    # inactive bookings, DEFERRED if loaded without the fields to tell.
+    DEFERRED = object()
+    _loaded_slot = None
+
     def __str__(self):
         return f"{self.name} - {self.project_type}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if {'status', 'preferred_date', 'preferred_time'}.issubset(field_names):
+            instance._loaded_slot = instance.held_slot()
+        else:
+            instance._loaded_slot = cls.DEFERRED
+        return instance
+
+    def clean(self):
+        from .availability import is_booked
+
+        slot = self.held_slot()
+        if slot and slot != self._loaded_slot and is_booked(*slot):
+            raise ValidationError({'preferred_time': 'This time slot is already booked.'})
+
+    def held_slot(self):
+        """The ``(preferred_date, slot index)`` this booking occupies, if any."""
+        if self.status not in self.ACTIVE_STATUSES or self.preferred_time not in TIME_SLOTS:
+            return None
+        return self.preferred_date, TIME_SLOTS.index(self.preferred_time)
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='consult_recent_idx'),
+            models.Index(fields=['status', '-created_at'], name='consult_status_recent_idx'),
+            models.Index(fields=['project_type', '-created_at'], name='consult_type_recent_idx'),
+            # Only the (few) rows still waiting on their notification.
+            models.Index(fields=['created_at'], name='consult_unsent_idx', condition=models.Q(email_sent=False)),
+        ]
+
+
+
+class SlotAvailability(models.Model):
+    """Per-day index of booked slots, maintained as bookings change.
+
+    Bit ``i`` of ``booked`` is set while an active consultation holds
+    ``TIME_SLOTS[i]`` on ``date``; days without a row are fully free. Setting
+    a bit is a conditional UPDATE of this one row, which is also what stops
+    two requests from booking the same slot.
+    """
+
+    date = models.DateField(primary_key=True)
+    booked = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.date} ({bin(self.booked).count('1')} booked)"
+
+    class Meta:
+        verbose_name_plural = 'slot availability'
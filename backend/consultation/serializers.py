@@ -1,7 +1,8 @@
 from rest_framework import serializers
+from jevelon_backend.serializers import PrecompiledFieldsMixin
 from .models import Consultation
 
-class ConsultationSerializer(serializers.ModelSerializer):
+class ConsultationSerializer(PrecompiledFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Consultation
         fields = [
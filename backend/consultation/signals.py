@@ -0,0 +1,34 @@
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from . import availability
+from .models import Consultation
+
+
+@receiver(pre_save, sender=Consultation)
+@receiver(pre_delete, sender=Consultation)
+def load_held_slot(sender, instance, **kwargs):
+    # Loaded with .only()/.defer(): read the slot it holds before it changes.
+    if instance._loaded_slot is Consultation.DEFERRED:
+        stored = Consultation.objects.filter(pk=instance.pk).first()
+        instance._loaded_slot = stored.held_slot() if stored else None
+
+
+@receiver(post_save, sender=Consultation)
+def update_availability(sender, instance, raw=False, **kwargs):
+    """Move the booking's bit in the availability index when its slot changes."""
+    if raw:
+        return
+    held, wanted = instance._loaded_slot, instance.held_slot()
+    if held != wanted:
+        if held:
+            availability.release(*held)
+        if wanted:
+            availability.claim(*wanted)
+    instance._loaded_slot = wanted
+
+
+@receiver(post_delete, sender=Consultation)
+def free_slot(sender, instance, **kwargs):
+    if instance._loaded_slot:
+        availability.release(*instance._loaded_slot)
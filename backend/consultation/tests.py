@@ -1,3 +1,158 @@
+from datetime import timedelta
+
+from django.core.cache import cache, caches
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from jevelon_backend.testing import ChangelistQueriesMixin, QueryPlanMixin, SubmissionWritesMixin
+from . import availability
+from .models import TIME_SLOTS, Consultation, SlotAvailability
+
+
+class ScheduleConsultationTests(SubmissionWritesMixin, TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_single_insert_and_deferred_email_sent_update(self):
+        payload = {
+            'name': 'Ravi Kumar',
+            'email': 'ravi@example.com',
+            'project_type': 'mobile-app',
+            'preferred_date': '2026-11-02',
+            'preferred_time': '10:00 AM',
+        }
+
+        self.assertSubmissionWrites('/api/consultation/schedule/', payload, Consultation)
+
+
+class ConsultationAdminTests(ChangelistQueriesMixin, TestCase):
+    changelist_url = '/admin/consultation/consultation/'
+
+    def book(self, i):
+        return Consultation.objects.create(
+            name=f'Client {i}', email=f'client{i}@example.com', project_type='mobile-app',
+            preferred_date=timezone.localdate() + timedelta(days=1 + i // len(TIME_SLOTS)),
+            preferred_time=TIME_SLOTS[i % len(TIME_SLOTS)],
+        )
+
+    def test_queries_do_not_grow_with_rows(self):
+        self.book(0)
+        # session, user, capped count, page, date range, date drill-down, project type choices
+        self.assertChangelistQueries(7)
+        for i in range(1, 60):
+            self.book(i)
+        cache.clear()
+        self.assertChangelistQueries(7)
+
+    def test_facet_counts_and_date_drill_down_are_cached(self):
+        self.book(0)
+
+        self.assertChangelistQueries(11, _facets='True')
+        self.assertChangelistQueries(5, _facets='True')
+
+
+class ConsultationQueryPlanTests(QueryPlanMixin, TestCase):
+    def test_recent_listing_uses_index(self):
+        self.assertUsesIndex(Consultation.objects.all()[:50], 'consult_recent_idx')
+
+    def test_status_filter_uses_index(self):
+        self.assertUsesIndex(Consultation.objects.filter(status='pending'), 'consult_status_recent_idx')
+
+    def test_project_type_filter_uses_index(self):
+        self.assertUsesIndex(Consultation.objects.filter(project_type='mobile-app'), 'consult_type_recent_idx')
+
+    def test_unsent_retry_scan_uses_partial_index(self):
+        self.assertUsesIndex(
+            Consultation.objects.filter(email_sent=False).order_by('created_at'),
+            'consult_unsent_idx',
+        )
+
+
+class SlotAvailabilityTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        caches['idempotency'].clear()
+        self.day = timezone.localdate() + timedelta(days=7)
+
+    def book(self, time='10:00 AM', **fields):
+        return self.client.post('/api/consultation/schedule/', {
+            'name': 'Ravi Kumar',
+            'email': 'ravi@example.com',
+            'project_type': 'mobile-app',
+            'preferred_date': self.day.isoformat(),
+            'preferred_time': time,
+            **fields,
+        }, format='json')
+
+    def free_on(self, day):
+        response = self.client.get('/api/consultation/availability/', {'from': day, 'to': day})
+        return response.json()['days'][0]['available']
+
+    def test_second_booking_of_a_slot_is_refused(self):
+        self.assertEqual(self.book().status_code, 201)
+
+        response = self.book(email='other@example.com')
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['errors'], {'preferred_time': ['This time slot is already booked.']})
+        self.assertEqual(Consultation.objects.count(), 1)
+
+    def test_availability_is_one_query(self):
+        self.book()
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/consultation/availability/', {
+                'from': self.day, 'to': self.day + timedelta(days=6),
+            })
+
+        days = response.json()['days']
+        self.assertEqual(len(days), 7)
+        self.assertNotIn('10:00 AM', days[0]['available'])
+        self.assertEqual(days[1]['available'], TIME_SLOTS)
+
+    def test_cancelling_or_deleting_frees_the_slot(self):
+        self.book()
+        self.book(time='2:00 PM')
+        first, second = Consultation.objects.order_by('id')
+
+        first.status = 'cancelled'
+        first.save()
+        Consultation.objects.only('id').get(pk=second.pk).delete()
+
+        self.assertEqual(self.free_on(self.day), TIME_SLOTS)
+        self.assertEqual(self.book(email='next@example.com').status_code, 201)
+
+    def test_rescheduling_moves_the_booking(self):
+        self.book()
+        consultation = Consultation.objects.get()
+
+        consultation.preferred_time = '3:00 PM'
+        consultation.save()
+
+        free = self.free_on(self.day)
+        self.assertIn('10:00 AM', free)
+        self.assertNotIn('3:00 PM', free)
+
+    def test_rebuild_matches_incremental_index(self):
+        self.book()
+        self.book(time='9:00 AM')
+        expected = list(SlotAvailability.objects.values_list('date', 'booked'))
+
+        availability.rebuild()
+
+        self.assertEqual(list(SlotAvailability.objects.values_list('date', 'booked')), expected)
+
+    def test_invalid_ranges_are_rejected(self):
+        for params in ({'from': 'soon'}, {'from': self.day, 'to': self.day - timedelta(days=1)},
+                       {'from': self.day, 'to': self.day + timedelta(days=400)}):
+            with self.subTest(params=params):
+                response = self.client.get('/api/consultation/availability/', params)
+                self.assertEqual(response.status_code, 400)
+                self.assertFalse(response.json()['success'])
 
-# Create your tests here.
+    def test_impossible_dates_are_rejected(self):
+        for params in ({'from': '2026-02-30'}, {'from': '2026-13-01'}, {'to': '2026-04-31'}):
+            with self.subTest(params=params):
+                response = self.client.get('/api/consultation/availability/', params)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(set(response.json()['errors']), set(params))
@@ -1,6 +1,12 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 
+# Native async view when served over ASGI, DRF view otherwise
+schedule_view = views.aschedule_consultation if settings.ASYNC_SUBMIT_VIEWS else views.schedule_consultation
+
 urlpatterns = [
-    path('schedule/', views.schedule_consultation, name='schedule_consultation'),
-] 
\ No newline at end of file
+    path('schedule/', schedule_view, name='schedule_consultation'),
+    path('availability/', views.get_availability, name='consultation_availability'),
+    path('export/', views.export_consultations, name='export_consultations'),
+]
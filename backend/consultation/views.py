@@ -1,28 +1,32 @@
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import AllowAny
+from rest_framework.decorators import api_view, permission_classes, renderer_classes
+from rest_framework.permissions import AllowAny, IsAdminUser
 from rest_framework.response import Response
-from django.core.mail import send_mail
 from django.conf import settings
-from .models import Consultation
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from jevelon_backend.exports import EXPORT_RENDERERS, export_response
+from jevelon_backend.filters import filter_queryset
+from jevelon_backend.serializers import requested_fields
+from jevelon_backend.submissions import AsyncSubmissionView, SubmissionView
+from notifications import outbox
+from . import availability
+from .models import TIME_SLOTS, Consultation
 from .serializers import ConsultationSerializer
-from datetime import datetime
-import json
+from datetime import timedelta
 
-@api_view(['POST'])
-@permission_classes([AllowAny])
-def schedule_consultation(request):
+class ConsultationSubmissionView(SubmissionView):
     """Handle consultation booking requests"""
-    try:
-        # Create consultation record
-        serializer = ConsultationSerializer(data=request.data)
-        if serializer.is_valid():
-            consultation = serializer.save()
-            
-            # Send confirmation email to client
-            client_email_sent = False
-            try:
-                client_message = f"""
+
+    serializer_class = ConsultationSerializer
+    success_message = 'Consultation scheduled successfully'
+    id_field = 'consultation_id'
+    event_type = 'consultation'
+    dedup_fields = ('email', 'preferred_date', 'preferred_time')
+
+    def get_messages(self, consultation):
+        # Confirmation email to client
+        client_message = f"""
                 Dear {consultation.name},
                 
                 Your consultation has been successfully scheduled!
@@ -38,26 +42,9 @@ def schedule_consultation(request):
                 Best regards,
                 Jevelon Technologies Team
                 """
-                
-                send_mail(
-                    subject='Consultation Confirmed - Jevelon Technologies',
-                    message=client_message,
-                    from_email=settings.DEFAULT_FROM_EMAIL,
-                    recipient_list=[consultation.email],
-                    fail_silently=False,
-                )
-                
-                client_email_sent = True
-                print(f"✅ Client confirmation email sent to {consultation.email}")
-                
-            except Exception as e:
-                print(f"❌ Error sending client email: {e}")
-                client_email_sent = False
-            
-            # Send notification to admin
-            admin_email_sent = False
-            try:
-                admin_message = f"""
+        
+        # Notification to admin
+        admin_message = f"""
                 New consultation request received:
                 
                 👤 Name: {consultation.name}
@@ -71,39 +58,84 @@ def schedule_consultation(request):
                 
                 Please follow up with the client.
                 """
-                
-                send_mail(
-                    subject='New Consultation Request - Jevelon Technologies',
-                    message=admin_message,
-                    from_email=settings.DEFAULT_FROM_EMAIL,
-                    recipient_list=[settings.ADMIN_EMAIL],
-                    fail_silently=False,
-                )
-                
-                admin_email_sent = True
-                print(f"✅ Admin notification email sent to {settings.ADMIN_EMAIL}")
-                
-            except Exception as e:
-                print(f"❌ Error sending admin email: {e}")
-                admin_email_sent = False
-            
-            # Mark email as sent only if both emails were successful
-            consultation.email_sent = client_email_sent and admin_email_sent
-            consultation.save()
-            
-            return Response({
-                'success': True,
-                'message': 'Consultation scheduled successfully',
-                'consultation_id': consultation.id
-            }, status=status.HTTP_201_CREATED)
-        else:
-            return Response({
-                'success': False,
-                'errors': serializer.errors
-            }, status=status.HTTP_400_BAD_REQUEST)
-            
-    except Exception as e:
+        
+        return [
+            outbox.email(
+                subject='Consultation Confirmed - Jevelon Technologies',
+                body=client_message,
+                recipients=[consultation.email],
+            ),
+            outbox.email(
+                subject='New Consultation Request - Jevelon Technologies',
+                body=admin_message,
+                recipients=[settings.ADMIN_EMAIL],
+            ),
+        ]
+
+
+schedule_consultation = ConsultationSubmissionView.as_view()
+aschedule_consultation = AsyncSubmissionView.as_view(pipeline_class=ConsultationSubmissionView)
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+@renderer_classes(EXPORT_RENDERERS)
+def export_consultations(request):
+    """Stream consultation bookings as CSV or NDJSON (staff only).
+
+    Accepts the same filters as the admin (``status``, ``project_type``,
+    ``email_sent``, ``created_after``, ``created_before``) and an optional
+    ``?fields=`` column list.
+    """
+    consultations = filter_queryset(
+        Consultation.objects.all(),
+        request.query_params,
+        fields=['status', 'project_type'],
+        boolean_fields=['email_sent'],
+    )
+    columns = requested_fields(request, ConsultationSerializer) or ConsultationSerializer.Meta.fields
+    return export_response(request, consultations, columns, 'consultations')
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def get_availability(request):
+    """Free consultation slots per day between ``from`` and ``to`` (inclusive).
+
+    Both are ``YYYY-MM-DD``; ``from`` defaults to today and ``to`` to 30 days
+    later. Answered from the availability index in one query; days before
+    today have no free slots.
+    """
+    today = timezone.localdate()
+    errors = {}
+    bounds = {}
+    for param, default in (('from', today), ('to', None)):
+        value = request.query_params.get(param)
+        try:
+            bounds[param] = parse_date(value) if value else default
+        except ValueError:  # well formed but impossible, e.g. 2026-02-30
+            bounds[param] = None
+        if value and bounds[param] is None:
+            errors[param] = ['Enter a date in YYYY-MM-DD format.']
+    if not errors:
+        start = bounds['from']
+        end = bounds['to'] or start + timedelta(days=30)
+        if end < start:
+            errors['to'] = ['Must not be before "from".']
+        elif (end - start).days >= settings.CONSULTATION_AVAILABILITY_MAX_DAYS:
+            errors['to'] = [f'At most {settings.CONSULTATION_AVAILABILITY_MAX_DAYS} days per request.']
+    if errors:
         return Response({
             'success': False,
-            'error': str(e)
-        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            'errors': errors
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    days = [
+        {'date': day, 'available': free if day >= today else []}
+        for day, free in availability.availability(start, end)
+    ]
+    return Response({
+        'success': True,
+        'slots': TIME_SLOTS,
+        'days': days,
+    }, status=status.HTTP_200_OK)
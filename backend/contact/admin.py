@@ -1,10 +1,14 @@
 from django.contrib import admin
+
+from jevelon_backend.admin import LargeTableAdminMixin
+from jevelon_backend.search import FullTextSearchAdminMixin
 from .models import Contact
 
 @admin.register(Contact)
-class ContactAdmin(admin.ModelAdmin):
+class ContactAdmin(LargeTableAdminMixin, FullTextSearchAdminMixin, admin.ModelAdmin):
     list_display = ['name', 'email', 'service', 'created_at', 'email_sent']
     list_filter = ['service', 'email_sent', 'created_at']
     search_fields = ['name', 'email', 'message']
     readonly_fields = ['created_at']
     ordering = ['-created_at']
+    date_hierarchy = 'created_at'
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ContactConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'contact'
+
+    def ready(self):
+        from jevelon_backend import caching
+        caching.watch(self.get_model('Contact'))
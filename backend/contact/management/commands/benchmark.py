@@ -0,0 +1,101 @@
+import json
+import logging
+import os
+import tempfile
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings, setup_test_environment
+
+from jevelon_backend.benchmarking import (
+    SCENARIOS, LatencyStats, benchmark_users, compare, run_scenario, seed_rows,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmarks every API endpoint in-process on a throwaway database with a stubbed '
+        'email backend and reports throughput and p50/p95/p99 latency per concurrency level'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scenarios',
+            default='',
+            help=f"Comma-separated scenarios to run (default: all of {', '.join(s.name for s in SCENARIOS)})",
+        )
+        parser.add_argument('--requests', type=int, default=200, help='Timed requests per scenario and level')
+        parser.add_argument('--concurrency', default='1,8', help='Comma-separated numbers of client threads')
+        parser.add_argument('--rows', type=int, default=1000, help='Rows seeded per table before measuring')
+        parser.add_argument('--json', action='store_true', help='Print results as JSON instead of a table')
+        parser.add_argument('--output', help='Also write the JSON results to this file')
+        parser.add_argument('--compare', help='JSON results of an earlier run to check for regressions')
+        parser.add_argument(
+            '--threshold',
+            type=float,
+            default=0.10,
+            help='Fractional slowdown reported as a regression by --compare',
+        )
+
+    def handle(self, *args, **options):
+        scenarios = SCENARIOS
+        if options['scenarios']:
+            wanted = options['scenarios'].split(',')
+            unknown = set(wanted) - {scenario.name for scenario in SCENARIOS}
+            if unknown:
+                raise CommandError(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+            scenarios = [scenario for scenario in SCENARIOS if scenario.name in wanted]
+        levels = [int(level) for level in options['concurrency'].split(',')]
+
+        setup_test_environment()
+        with tempfile.TemporaryDirectory() as directory, override_settings(
+            EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+        ):
+            if connection.vendor == 'sqlite':
+                # A file, not the default in-memory database, so client threads share it.
+                connection.settings_dict['TEST']['NAME'] = os.path.join(directory, 'benchmark.sqlite3')
+            old_name = connection.creation.create_test_db(verbosity=0)
+            # Keep request logs out of the report; failures are counted per scenario.
+            logging.disable(logging.WARNING)
+            try:
+                results = self.run(scenarios, levels, options)
+            finally:
+                logging.disable(logging.NOTSET)
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        payload = [result.to_dict() for result in results]
+        if options['output']:
+            with open(options['output'], 'w') as handle:
+                json.dump(payload, handle, indent=2)
+        if options['json']:
+            self.stdout.write(json.dumps(payload, indent=2))
+        failed = [f"{result['name']} x{result['concurrency']}" for result in payload if result['errors']]
+        if failed:
+            # Timings of failing requests are not comparable, so the run is no baseline either.
+            raise CommandError(f"Requests failed in {', '.join(failed)}; the results are not valid")
+        if options['compare']:
+            self.report_regressions(options['compare'], payload, options['threshold'])
+
+    def run(self, scenarios, levels, options):
+        seed_rows(options['rows'])
+        users = benchmark_users()
+        if not options['json']:
+            self.stdout.write(LatencyStats.HEADER)
+        results = []
+        for scenario in scenarios:
+            for level in levels:
+                result = run_scenario(scenario, options['requests'], level, users=users)
+                results.append(result)
+                if not options['json']:
+                    self.stdout.write(result.row())
+        return results
+
+    def report_regressions(self, path, payload, threshold):
+        with open(path) as handle:
+            baseline = json.load(handle)
+        regressions = list(compare(baseline, payload, threshold))
+        for name, metric, before, after in regressions:
+            self.stderr.write(f'{name}: {metric} {before} -> {after}')
+        if regressions:
+            raise CommandError(f'{len(regressions)} regressions beyond {threshold:.0%}')
+        self.stderr.write(self.style.SUCCESS(f'No regressions beyond {threshold:.0%}'))
@@ -0,0 +1,78 @@
+import io
+import json
+import time
+
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+
+from consultation.views import ConsultationSubmissionView
+from contact.views import ContactSubmissionView
+from jevelon_backend.benchmarking import submit_payload
+from jevelon_backend.parsers import ORJSONParser
+from jevelon_backend.renderers import ORJSONRenderer
+from support.views import SupportTicketSubmissionView
+
+VIEWS = {
+    '/api/contact/submit/': ContactSubmissionView,
+    '/api/support/submit/': SupportTicketSubmissionView,
+    '/api/consultation/schedule/': ConsultationSubmissionView,
+}
+# Fails validation on every field it can, so the dispatch measurement never reaches the database.
+INVALID = {'name': '', 'email': 'not-an-email', 'priority': 'urgent', 'preferred_date': '2026-02-30'}
+
+
+class Command(BaseCommand):
+    help = (
+        'Measures the CPU time per submission spent parsing, validating and rendering, '
+        'stock DRF vs FAST_PATH (orjson and precompiled serializer fields)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000, help='Iterations timed per measurement')
+
+    def handle(self, *args, **options):
+        count = options['requests']
+        factory = APIRequestFactory()
+        self.stdout.write(f"{'endpoint':<30} {'measurement':<22} {'stock us':>9} {'fast us':>9} {'saved':>7}")
+        for path, view_class in VIEWS.items():
+            serializer_class = view_class.serializer_class
+            body = json.dumps(submit_payload(path)).encode()
+            response = {'success': True, 'message': view_class.success_message, 'id': 12345}
+
+            def pipeline(parser, renderer):
+                data = parser.parse(io.BytesIO(body))
+                serializer_class(data=data).is_valid()
+                renderer.render(response)
+
+            stock_view = view_class.as_view(parser_classes=[JSONParser], renderer_classes=[JSONRenderer])
+            fast_view = view_class.as_view(parser_classes=[ORJSONParser], renderer_classes=[ORJSONRenderer])
+            invalid = json.dumps(INVALID)
+
+            def dispatch(view):
+                response = view(factory.post(path, invalid, content_type='application/json'))
+                response.render()
+
+            for name, stock, fast in (
+                ('parse+validate+render', lambda: pipeline(JSONParser(), JSONRenderer()),
+                 lambda: pipeline(ORJSONParser(), ORJSONRenderer())),
+                ('dispatch (400)', lambda: dispatch(stock_view), lambda: dispatch(fast_view)),
+            ):
+                with override_settings(FAST_PATH=False):
+                    stock_us = self.cpu_us(stock, count)
+                with override_settings(FAST_PATH=True):
+                    fast_us = self.cpu_us(fast, count)
+                self.stdout.write(
+                    f'{path:<30} {name:<22} {stock_us:>9.1f} {fast_us:>9.1f} {1 - fast_us / stock_us:>7.0%}'
+                )
+
+    @staticmethod
+    def cpu_us(func, count):
+        for _ in range(min(count, 100)):
+            func()
+        started = time.process_time()
+        for _ in range(count):
+            func()
+        return (time.process_time() - started) / count * 1e6
@@ -0,0 +1,71 @@
+import logging
+import time
+
+from django.conf import settings
+from django.core.handlers.base import BaseHandler
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from django.test.utils import override_settings
+from django.urls import resolve
+
+from .benchmark_fastpath import INVALID
+
+# The middleware Django's startproject generates, which this project used for every path.
+STOCK = {
+    'jevelon_backend.middleware.SessionMiddleware': 'django.contrib.sessions.middleware.SessionMiddleware',
+    'jevelon_backend.middleware.CsrfViewMiddleware': 'django.middleware.csrf.CsrfViewMiddleware',
+    'jevelon_backend.middleware.AuthenticationMiddleware': 'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'jevelon_backend.middleware.MessageMiddleware': 'django.contrib.messages.middleware.MessageMiddleware',
+    'jevelon_backend.middleware.XFrameOptionsMiddleware': 'django.middleware.clickjacking.XFrameOptionsMiddleware',
+}
+
+
+
+class Command(BaseCommand):
+    help = (
+        'Measures the CPU time per request spent in the middleware stack, the full stack on '
+        'every path vs the slim profile for SLIM_MIDDLEWARE_PREFIXES, plus URL resolution'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000, help='Iterations timed per measurement')
+
+    def handle(self, *args, **options):
+        count = options['requests']
+        stock = [STOCK.get(name, name) for name in settings.MIDDLEWARE]
+        self.stdout.write(f"{'path':<38} {'full us':>9} {'slim us':>9} {'saved':>7}")
+        factory = RequestFactory(HTTP_HOST=settings.ALLOWED_HOSTS[0].lstrip('.'))
+        requests = {
+            # Invalid, so it is answered before the database is touched.
+            'POST /api/contact/submit/': lambda: factory.post(
+                '/api/contact/submit/', INVALID, content_type='application/json'
+            ),
+            'GET /livez': lambda: factory.get('/livez'),
+        }
+        # The 400 warnings would otherwise dominate the measurement.
+        logging.disable(logging.WARNING)
+        for name, build in requests.items():
+            with override_settings(MIDDLEWARE=stock):
+                full_us = self.cpu_us(self.handler(build), count)
+            slim_us = self.cpu_us(self.handler(build), count)
+            self.stdout.write(f'{name:<38} {full_us:>9.1f} {slim_us:>9.1f} {1 - slim_us / full_us:>7.0%}')
+        logging.disable(logging.NOTSET)
+
+        for path in ('/api/contact/submit/', '/admin/'):
+            self.stdout.write(f'resolve {path:<30} {self.cpu_us(lambda: resolve(path), count * 10):>9.2f} us')
+
+    @staticmethod
+    def handler(build):
+        # The handler Django builds per process, i.e. the configured MIDDLEWARE chain.
+        handler = BaseHandler()
+        handler.load_middleware()
+        return lambda: handler.get_response(build())
+
+    @staticmethod
+    def cpu_us(func, count):
+        for _ in range(min(count, 100)):
+            func()
+        started = time.process_time()
+        for _ in range(count):
+            func()
+        return (time.process_time() - started) / count * 1e6
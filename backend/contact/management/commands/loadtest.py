@@ -0,0 +1,113 @@
+import asyncio
+import json
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+from jevelon_backend.benchmarking import SUBMIT_PAYLOADS, LatencyStats, submit_payload
+
+
+class Command(BaseCommand):
+    help = (
+        'Drives a running server with concurrent keep-alive submissions and reports '
+        'throughput and latency per concurrency level; run it once against the sync '
+        'gunicorn profile and once against gunicorn_asgi.conf.py to compare them'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000', help='Base URL of the running server')
+        parser.add_argument(
+            '--path',
+            default='/api/contact/submit/',
+            choices=sorted(SUBMIT_PAYLOADS),
+            help='Submit endpoint to drive',
+        )
+        parser.add_argument(
+            '--concurrency',
+            default='1,8,32,128',
+            help='Comma-separated numbers of concurrent clients to sweep',
+        )
+        parser.add_argument('--duration', type=float, default=10.0, help='Seconds per concurrency level')
+        parser.add_argument('--timeout', type=float, default=30.0, help='Per-request timeout in seconds')
+        parser.add_argument('--json', action='store_true', help='Print results as JSON')
+
+    def handle(self, *args, **options):
+        url = urlsplit(options['url'])
+        if url.scheme != 'http' or not url.hostname:
+            raise CommandError('--url must be a plain http:// URL')
+        levels = [int(level) for level in options['concurrency'].split(',')]
+
+        results = [
+            asyncio.run(self.run_level(url, options['path'], level, options['duration'], options['timeout']))
+            for level in levels
+        ]
+
+        if options['json']:
+            self.stdout.write(json.dumps([result.to_dict() for result in results], indent=2))
+            return
+        self.stdout.write(LatencyStats.HEADER)
+        for result in results:
+            self.stdout.write(result.row())
+
+    async def run_level(self, url, path, concurrency, duration, timeout):
+        deadline = time.perf_counter() + duration
+        latencies, errors = [], [0]
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            self.client(url, path, deadline, timeout, latencies, errors) for _ in range(concurrency)
+        ))
+        return LatencyStats(path, latencies, time.perf_counter() - started, errors[0], concurrency)
+
+    async def client(self, url, path, deadline, timeout, latencies, errors):
+        """One keep-alive connection issuing submissions back to back."""
+        connection = None
+        while time.perf_counter() < deadline:
+            try:
+                if connection is None:
+                    connection = await asyncio.wait_for(
+                        asyncio.open_connection(url.hostname, url.port or 80), timeout
+                    )
+                sent = time.perf_counter()
+                status, keep_alive = await asyncio.wait_for(self.post(connection, url, path), timeout)
+                latencies.append(time.perf_counter() - sent)
+                if status != 201:
+                    errors[0] += 1
+                if not keep_alive:
+                    # Sync gunicorn workers close the connection after every response.
+                    connection[1].close()
+                    connection = None
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError, IndexError):
+                errors[0] += 1
+                if connection is not None:
+                    connection[1].close()
+                connection = None
+        if connection is not None:
+            connection[1].close()
+
+    async def post(self, connection, url, path):
+        reader, writer = connection
+        body = json.dumps(submit_payload(path)).encode()
+        writer.write(
+            f'POST {path} HTTP/1.1\r\n'
+            f'Host: {url.netloc}\r\n'
+            'Content-Type: application/json\r\n'
+            f'Content-Length: {len(body)}\r\n'
+            '\r\n'.encode() + body
+        )
+        await writer.drain()
+
+        status = int((await reader.readline()).split()[1])
+        length, keep_alive = 0, True
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            name = name.strip().lower()
+            if name == 'content-length':
+                length = int(value)
+            elif name == 'connection':
+                keep_alive = value.strip().lower() != 'close'
+        await reader.readexactly(length)
+        return status, keep_alive
@@ -0,0 +1,50 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from jevelon_backend.seeding import GENERATORS, seed
+
+
+class Command(BaseCommand):
+    help = (
+        'Generates synthetic contacts, consultations and support tickets with realistic '
+        'distributions for performance testing; the same --seed and --until give the same rows'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--contacts', type=int, default=0, help='Contact rows to create')
+        parser.add_argument('--consultations', type=int, default=0, help='Consultation rows to create')
+        parser.add_argument('--tickets', type=int, default=0, help='Support ticket rows to create')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per bulk_create and transaction')
+        parser.add_argument('--days', type=int, default=730, help='Spread created_at over this many days')
+        parser.add_argument('--until', help='Last day (YYYY-MM-DD) to date rows on; defaults to today')
+        parser.add_argument('--clear', action='store_true', help='Delete existing rows of the seeded tables first')
+
+    def handle(self, *args, **options):
+        counts = {name: options[name] for name in GENERATORS}
+        if not any(counts.values()):
+            raise CommandError('Nothing to do: pass --contacts, --consultations and/or --tickets')
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+        until = None
+        if options['until']:
+            until = parse_date(options['until'])
+            if until is None:
+                raise CommandError('--until must be a date in YYYY-MM-DD format')
+
+        for name, count in counts.items():
+            if not count:
+                continue
+            generator = GENERATORS[name](seed=options['seed'], days=options['days'], until=until)
+            if options['clear']:
+                generator.clear()
+
+            started = time.perf_counter()
+            for inserted in seed(generator, count, options['batch_size']):
+                if options['verbosity'] > 1 or inserted == count:
+                    elapsed = time.perf_counter() - started
+                    self.stdout.write(f'{name}: {inserted}/{count} rows ({inserted / elapsed:,.0f} rows/s)')
+
+        self.stdout.write(self.style.SUCCESS('Seeding complete'))
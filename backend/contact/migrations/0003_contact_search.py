@@ -0,0 +1,17 @@
+from django.db import migrations
+
+from jevelon_backend.search import FullTextIndex
+
+# Columns as of this migration, so later model changes do not rewrite history.
+index = FullTextIndex('contact_contact', {'name': 'A', 'email': 'A', 'message': 'B'})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contact', '0002_submission_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(index.install, index.uninstall),
+    ]
@@ -1,5 +1,7 @@
 from django.db import models
 
+from jevelon_backend.search import FullTextIndex
+
 # Create your models here.
 
 class Contact(models.Model):
@@ -9,9 +11,17 @@ class Contact(models.Model):
     message = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
     email_sent = models.BooleanField(default=False)
+
+    search_index = FullTextIndex('contact_contact', {'name': 'A', 'email': 'A', 'message': 'B'})
     
     def __str__(self):
         return f"{self.name} - {self.service}"
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='contact_recent_idx'),
+            models.Index(fields=['service', '-created_at'], name='contact_service_recent_idx'),
+            # Only the (few) rows still waiting on their notification.
+            models.Index(fields=['created_at'], name='contact_unsent_idx', condition=models.Q(email_sent=False)),
+        ]
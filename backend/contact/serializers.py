@@ -1,7 +1,8 @@
 from rest_framework import serializers
+from jevelon_backend.serializers import PrecompiledFieldsMixin
 from .models import Contact
 
-class ContactSerializer(serializers.ModelSerializer):
+class ContactSerializer(PrecompiledFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Contact
         fields = ['id', 'name', 'email', 'service', 'message', 'created_at']
@@ -1,3 +1,368 @@
-from django.test import TestCase
+import json
+import threading
+from datetime import date
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.core.cache import cache, caches
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import AsyncRequestFactory, RequestFactory, TestCase, TransactionTestCase, override_settings, tag
+from rest_framework.test import APIClient
+
+from jevelon_backend import idempotency
+from jevelon_backend.benchmarking import (
+    SCENARIOS, LatencyStats, benchmark_users, compare, run_scenario, seed_rows,
+)
+from jevelon_backend.metrics import MetricsMiddleware
+from jevelon_backend.testing import (
+    BenchmarkMixin, ChangelistQueriesMixin, QueryPlanMixin, SubmissionWritesMixin, sample,
+)
+from notifications.models import OutboxEntry
+from consultation.models import Consultation
+from support.models import SupportTicket
+from .models import Contact
+from .views import asubmit_contact
+
+
+def contact_payload(i):
+    return {
+        'name': f'Lead {i}',
+        'email': f'lead{i}@example.com',
+        'service': 'web-development',
+        'message': 'Replayed from the CRM.',
+    }
+
+
+class SubmitContactTests(SubmissionWritesMixin, TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_single_insert_and_deferred_email_sent_update(self):
+        self.assertSubmissionWrites('/api/contact/submit/', contact_payload(0), Contact)
+
+    def test_invalid_submission_writes_nothing(self):
+        response = self.client.post('/api/contact/submit/', {'name': 'No email'}, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['success'], False)
+        self.assertIn('email', response.json()['errors'])
+        self.assertFalse(OutboxEntry.objects.exists())
+
+
+class AsyncSubmitContactTests(TestCase):
+    def setUp(self):
+        caches['idempotency'].clear()
+
+    def post(self, body, **headers):
+        request = AsyncRequestFactory().post('/api/contact/submit/', body, content_type='application/json',
+                                             headers=headers)
+        return asubmit_contact(request)
+
+    async def test_matches_sync_view_response(self):
+        response = await self.post(contact_payload(0))
+        sync_response = await sync_to_async(APIClient().post)(
+            '/api/contact/submit/', contact_payload(1), format='json'
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(json.loads(response.content), sync_response.json())
+        self.assertEqual(await Contact.objects.acount(), 2)
+        self.assertEqual(await OutboxEntry.objects.acount(), 2)
+
+    async def test_validation_errors_match_sync_view(self):
+        response = await self.post({'name': 'No email'})
+        sync_response = await sync_to_async(APIClient().post)(
+            '/api/contact/submit/', {'name': 'No email'}, format='json'
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(json.loads(response.content), sync_response.json())
+        self.assertFalse(await OutboxEntry.objects.aexists())
+
+    async def test_replay_returns_first_response(self):
+        first = await self.post(contact_payload(0), **{'Idempotency-Key': 'form-1'})
+        replay = await self.post(contact_payload(0), **{'Idempotency-Key': 'form-1'})
+
+        self.assertEqual(replay.status_code, 201)
+        self.assertEqual(replay.content, first.content)
+        self.assertEqual(replay['Idempotent-Replayed'], 'true')
+        self.assertEqual(await Contact.objects.acount(), 1)
+
+    async def test_cache_and_database_work_stays_off_the_event_loop(self):
+        loop_thread = threading.current_thread()
+        threads = []
+        original = idempotency.claim
+
+        def claim(*args):
+            threads.append(threading.current_thread())
+            return original(*args)
+
+        middleware = MetricsMiddleware(asubmit_contact)
+        before = sample('jevelon_db_queries_per_request_sum', route='<unmatched>')
+        with mock.patch.object(idempotency, 'claim', claim):
+            request = AsyncRequestFactory().post('/api/contact/submit/', contact_payload(0),
+                                                 content_type='application/json', headers={'Idempotency-Key': 'k-1'})
+            response = await middleware(request)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertNotIn(loop_thread, threads)
+        # The INSERTs made on the executor thread are counted for the request.
+        self.assertGreaterEqual(sample('jevelon_db_queries_per_request_sum', route='<unmatched>') - before, 2)
+
+    async def test_malformed_json_is_rejected(self):
+        response = await self.post('{"name": ')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('JSON parse error', json.loads(response.content)['detail'])
+
+
+class IdempotentSubmitTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        caches['idempotency'].clear()
+
+    def submit(self, payload, key=None):
+        headers = {'Idempotency-Key': key} if key is not None else {}
+        return self.client.post('/api/contact/submit/', payload, format='json', headers=headers)
+
+    def test_retry_with_same_key_replays_without_writing(self):
+        first = self.submit(contact_payload(0), key='abc-1')
+
+        with self.assertNumQueries(0):
+            replay = self.submit(contact_payload(0), key='abc-1')
+
+        self.assertEqual(replay.status_code, 201)
+        self.assertEqual(replay.json(), first.json())
+        self.assertEqual(replay['Idempotent-Replayed'], 'true')
+        self.assertEqual(Contact.objects.count(), 1)
+        self.assertEqual(OutboxEntry.objects.count(), 1)
+
+    def test_key_reused_for_different_payload_is_rejected(self):
+        self.submit(contact_payload(0), key='abc-1')
+
+        response = self.submit(contact_payload(1), key='abc-1')
+
+        self.assertEqual(response.status_code, 422)
+        self.assertFalse(response.json()['success'])
+        self.assertEqual(Contact.objects.count(), 1)
+
+    def test_double_submit_without_key_is_suppressed_by_content(self):
+        self.submit(contact_payload(0))
+        duplicate = dict(contact_payload(0), name='Lead Zero', email='LEAD0@example.com ')
+
+        self.assertEqual(self.submit(duplicate).status_code, 201)
+        self.assertEqual(Contact.objects.count(), 1)
+
+        self.assertEqual(self.submit(dict(contact_payload(0), message='A follow-up.')).status_code, 201)
+        self.assertEqual(Contact.objects.count(), 2)
+
+    def test_failed_submission_releases_the_key(self):
+        invalid = dict(contact_payload(0), email='not-an-email')
+        self.assertEqual(self.submit(invalid, key='abc-1').status_code, 400)
+
+        self.assertEqual(self.submit(invalid | {'email': 'lead0@example.com'}, key='abc-2').status_code, 201)
+        self.assertEqual(self.submit(contact_payload(1), key='abc-1').status_code, 201)
+        self.assertEqual(Contact.objects.count(), 2)
+
+    def test_concurrent_duplicate_gets_conflict(self):
+        claim = idempotency.claim(RequestFactory().post('/', headers={'Idempotency-Key': 'abc-1'}),
+                                  contact_payload(0), '/api/contact/submit/', ())
+        self.assertIsNone(claim.begin())
+
+        response = self.submit(contact_payload(0), key='abc-1')
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(Contact.objects.count(), 0)
+
+    def test_oversized_key_is_rejected(self):
+        response = self.submit(contact_payload(0), key='k' * 256)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Idempotency-Key', response.json()['errors'])
+
+
+class BulkSubmitTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user('crm-sync'))
+
+    def test_valid_batch_is_inserted_with_one_digest(self):
+        response = self.client.post('/api/contact/bulk/', [contact_payload(i) for i in range(3)], format='json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['created'], 3)
+        self.assertEqual(Contact.objects.count(), 3)
+        entry = OutboxEntry.objects.get()
+        self.assertEqual(len(entry.messages), 1)
+        self.assertEqual(sorted(entry.object_ids), sorted(Contact.objects.values_list('pk', flat=True)))
+
+    def test_invalid_items_are_reported_per_index(self):
+        items = [contact_payload(0), {'name': 'No email'}, contact_payload(2)]
+
+        response = self.client.post('/api/contact/bulk/', items, format='json')
+
+        self.assertEqual(response.status_code, 207)
+        results = response.json()['results']
+        self.assertEqual([result['success'] for result in results], [True, False, True])
+        self.assertIn('email', results[1]['errors'])
+        self.assertEqual(Contact.objects.count(), 2)
+
+    def test_accepts_ndjson_body(self):
+        body = '\n'.join(json.dumps(contact_payload(i)) for i in range(2))
+
+        response = self.client.post('/api/contact/bulk/', body, content_type='application/x-ndjson')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Contact.objects.count(), 2)
+
+    @override_settings(BULK_SUBMIT_MAX_ITEMS=2)
+    def test_rejects_oversized_batch(self):
+        response = self.client.post('/api/contact/bulk/', [contact_payload(i) for i in range(3)], format='json')
+
+        self.assertEqual(response.status_code, 413)
+        self.assertFalse(Contact.objects.exists())
+
+    def test_requires_authentication(self):
+        response = APIClient().post('/api/contact/bulk/', [contact_payload(0)], format='json')
+
+        self.assertIn(response.status_code, (401, 403))
+
+
+class ContactQueryPlanTests(QueryPlanMixin, TestCase):
+    def test_recent_listing_uses_index(self):
+        self.assertUsesIndex(Contact.objects.all()[:50], 'contact_recent_idx')
+
+    def test_service_filter_uses_index(self):
+        self.assertUsesIndex(Contact.objects.filter(service='web-development'), 'contact_service_recent_idx')
+
+    def test_unsent_retry_scan_uses_partial_index(self):
+        self.assertUsesIndex(Contact.objects.filter(email_sent=False).order_by('created_at'), 'contact_unsent_idx')
+
+    def test_search_uses_full_text_index(self):
+        Contact.objects.create(name='Meera Nair', email='meera@example.com', service='consulting', message='Pricing?')
+        Contact.objects.create(name='Liam Smith', email='liam@example.com', service='consulting', message='Hello')
+        matches = Contact.search_index.search(Contact.objects.all(), 'pricing')
+
+        plan = self.explain(matches)
+
+        self.assertIn('contact_contact_search_idx' if connection.vendor == 'postgresql' else 'VIRTUAL TABLE', plan)
+        self.assertEqual([contact.name for contact in matches], ['Meera Nair'])
+
+
+class ContactAdminTests(ChangelistQueriesMixin, TestCase):
+    changelist_url = '/admin/contact/contact/'
+
+    def test_queries_do_not_grow_with_rows(self):
+        Contact.objects.create(**contact_payload(0))
+        # session, user, capped count, page, date range, date drill-down, service choices
+        self.assertChangelistQueries(7)
+        Contact.objects.bulk_create(Contact(**contact_payload(i)) for i in range(1, 60))
+        cache.clear()
+        self.assertChangelistQueries(7)
+
+    def test_facet_counts_and_date_drill_down_are_cached(self):
+        Contact.objects.create(**contact_payload(0))
+
+        self.assertChangelistQueries(10, _facets='True')
+        self.assertChangelistQueries(5, _facets='True')
+
+
+class BenchmarkSuiteTests(TransactionTestCase):
+    def test_every_scenario_succeeds(self):
+        seed_rows(5)
+        users = benchmark_users()
+
+        for scenario in SCENARIOS:
+            with self.subTest(scenario.name):
+                stats = run_scenario(scenario, requests=4, warmup=1, users=users).to_dict()
+                self.assertEqual(stats['requests'], 4)
+                self.assertEqual(stats['errors'], 0)
+                self.assertGreater(stats['p99_ms'], 0)
+
+    def test_failed_requests_invalidate_the_run(self):
+        results = [
+            LatencyStats('health', [0.001] * 4, 0.004, concurrency=8),
+            LatencyStats('contact.submit', [0.01] * 4, 0.04, errors=3, concurrency=8),
+        ]
+        command = 'contact.management.commands.benchmark'
+        with mock.patch(f'{command}.setup_test_environment'), \
+                mock.patch.dict(connection.settings_dict['TEST']), \
+                mock.patch.object(connection.creation, 'create_test_db'), \
+                mock.patch.object(connection.creation, 'destroy_test_db'), \
+                mock.patch(f'{command}.Command.run', return_value=results):
+            with self.assertRaisesMessage(CommandError, 'Requests failed in contact.submit x8'):
+                call_command('benchmark', '--json', stdout=StringIO())
+
+    def test_compare_flags_slowdowns_beyond_threshold(self):
+        before = [{'name': 'health', 'concurrency': 1, 'p50_ms': 1.0, 'p95_ms': 2.0, 'p99_ms': 3.0, 'throughput_rps': 100}]
+        after = [{'name': 'health', 'concurrency': 1, 'p50_ms': 1.05, 'p95_ms': 2.5, 'p99_ms': 3.0, 'throughput_rps': 80}]
+
+        regressions = list(compare(before, after, threshold=0.10))
+
+        self.assertEqual(
+            [(name, metric) for name, metric, _, _ in regressions],
+            [('health', 'p95_ms'), ('health', 'throughput_rps')],
+        )
+
+
+class SeedDataTests(TestCase):
+    def seed(self, *args):
+        call_command('seed_data', '--until', '2026-06-30', '--days', '90', *args, stdout=StringIO())
+
+    def test_same_seed_gives_same_rows(self):
+        self.seed('--tickets', '50', '--batch-size', '16')
+        first = list(SupportTicket.objects.order_by('pk').values_list('email', 'priority', 'status', 'created_at'))
+
+        self.seed('--tickets', '50', '--clear')
+        second = list(SupportTicket.objects.order_by('pk').values_list('email', 'priority', 'status', 'created_at'))
+
+        self.assertEqual(len(first), 50)
+        self.assertEqual(first, second)
+
+    def test_rows_keep_generated_history(self):
+        self.seed('--contacts', '40', '--consultations', '40', '--tickets', '200')
+
+        self.assertEqual((Contact.objects.count(), Consultation.objects.count()), (40, 40))
+        for model in (Contact, Consultation, SupportTicket):
+            dates = [value.date() for value in model.objects.values_list('created_at', flat=True)]
+            self.assertGreaterEqual(min(dates), date(2026, 3, 31))
+            self.assertLessEqual(max(dates), date(2026, 6, 30))
+        statuses = set(SupportTicket.objects.values_list('status', flat=True))
+        self.assertLessEqual(statuses, {'open', 'in_progress', 'resolved', 'closed'})
+        self.assertIn('closed', statuses)
+        for ticket in SupportTicket.objects.all():
+            self.assertGreaterEqual(ticket.updated_at, ticket.created_at)
+
+    def test_reseeding_never_double_books_a_slot(self):
+        self.seed('--consultations', '200')
+        self.seed('--consultations', '200')
+
+        active = list(
+            Consultation.objects.filter(status__in=Consultation.ACTIVE_STATUSES)
+            .values_list('preferred_date', 'preferred_time')
+        )
+        self.assertEqual(Consultation.objects.count(), 400)
+        self.assertGreater(len(active), 0)
+        self.assertEqual(len(active), len(set(active)))
+
+    def test_requires_a_count(self):
+        with self.assertRaises(CommandError):
+            self.seed()
+
+
+@tag('benchmark')
+class ContactBenchmarks(BenchmarkMixin, TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_submit(self):
+        counter = iter(range(10_000))
+        response = self.benchmark(
+            lambda: self.client.post('/api/contact/submit/', contact_payload(next(counter)), format='json')
+        )
+
+        self.assertEqual(response.status_code, 201)
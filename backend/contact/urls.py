@@ -1,6 +1,12 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 
+# Native async view when served over ASGI, DRF view otherwise
+submit_view = views.asubmit_contact if settings.ASYNC_SUBMIT_VIEWS else views.submit_contact
+
 urlpatterns = [
-    path('submit/', views.submit_contact, name='submit_contact'),
-] 
\ No newline at end of file
+    path('submit/', submit_view, name='submit_contact'),
+    path('bulk/', views.bulk_submit_contacts, name='bulk_submit_contacts'),
+    path('export/', views.export_contacts, name='export_contacts'),
+]
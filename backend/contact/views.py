@@ -1,27 +1,32 @@
-from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import AllowAny
-from rest_framework.response import Response
-from django.core.mail import send_mail
+from rest_framework.decorators import api_view, parser_classes, permission_classes, renderer_classes
+from rest_framework.parsers import JSONParser
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from django.conf import settings
+from jevelon_backend.bulk import bulk_submit
+from jevelon_backend.exports import EXPORT_RENDERERS, export_response
+from jevelon_backend.filters import filter_queryset
+from jevelon_backend.parsers import NDJSONParser
+from jevelon_backend.serializers import requested_fields
+from jevelon_backend.submissions import AsyncSubmissionView, SubmissionView
+from notifications import outbox
 from .models import Contact
 from .serializers import ContactSerializer
-import json
 
-@api_view(['POST'])
-@permission_classes([AllowAny])
-def submit_contact(request):
+
+def digest_line(contact):
+    return f'- {contact.name} <{contact.email}> ({contact.service}): {contact.message[:200]}'
+
+
+class ContactSubmissionView(SubmissionView):
     """Handle contact form submissions"""
-    try:
-        # Create contact record
-        serializer = ContactSerializer(data=request.data)
-        if serializer.is_valid():
-            contact = serializer.save()
-            
-            # Send email notification to admin
-            email_sent = False
-            try:
-                admin_message = f"""
+
+    serializer_class = ContactSerializer
+    success_message = 'Contact form submitted successfully'
+    dedup_fields = ('email', 'message')
+    event_type = 'contact'
+
+    def get_messages(self, contact):
+        admin_message = f"""
                 New contact form submission:
                 
                 Name: {contact.name}
@@ -31,38 +36,51 @@ def submit_contact(request):
                 
                 Please respond within 24 hours.
                 """
-                
-                send_mail(
-                    subject='New Contact Form Submission - Jevelon Technologies',
-                    message=admin_message,
-                    from_email=settings.DEFAULT_FROM_EMAIL,
-                    recipient_list=[settings.ADMIN_EMAIL],
-                    fail_silently=False,
-                )
-                
-                email_sent = True
-                print(f"✅ Email sent successfully to {settings.ADMIN_EMAIL}")
-                
-            except Exception as e:
-                print(f"❌ Error sending email: {e}")
-                email_sent = False
-            
-            # Update email_sent status
-            contact.email_sent = email_sent
-            contact.save()
-            
-            return Response({
-                'success': True,
-                'message': 'Contact form submitted successfully'
-            }, status=status.HTTP_201_CREATED)
-        else:
-            return Response({
-                'success': False,
-                'errors': serializer.errors
-            }, status=status.HTTP_400_BAD_REQUEST)
-            
-    except Exception as e:
-        return Response({
-            'success': False,
-            'error': str(e)
-        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        return [
+            outbox.email(
+                subject='New Contact Form Submission - Jevelon Technologies',
+                body=admin_message,
+                recipients=[settings.ADMIN_EMAIL],
+            ),
+        ]
+
+    def get_digest(self, contact):
+        return outbox.digest('contact', 'Contact form submissions', digest_line(contact))
+
+
+submit_contact = ContactSubmissionView.as_view()
+asubmit_contact = AsyncSubmissionView.as_view(pipeline_class=ContactSubmissionView)
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+@renderer_classes(EXPORT_RENDERERS)
+def export_contacts(request):
+    """Stream contact submissions as CSV or NDJSON (staff only).
+
+    Accepts the same filters as the admin (``service``, ``email_sent``,
+    ``created_after``, ``created_before``) and an optional ``?fields=``
+    column list.
+    """
+    contacts = filter_queryset(
+        Contact.objects.all(),
+        request.query_params,
+        fields=['service'],
+        boolean_fields=['email_sent'],
+    )
+    columns = requested_fields(request, ContactSerializer) or ContactSerializer.Meta.fields
+    return export_response(request, contacts, columns, 'contacts')
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+@parser_classes([JSONParser, NDJSONParser])
+def bulk_submit_contacts(request):
+    """Ingest a batch of contact submissions (JSON array or NDJSON body)"""
+    return bulk_submit(
+        request,
+        ContactSerializer,
+        digest_subject=lambda count: f'{count} New Contact Form Submissions - Jevelon Technologies',
+        digest_line=digest_line,
+        event_type=ContactSubmissionView.event_type,
+    )
@@ -0,0 +1,168 @@
+"""
+Where published events go and how they reach the stream in each process.
+
+``EVENTS_BACKEND`` names the class; it is built with the process's broker
+and must provide:
+
+- ``publish(event_type, data)``: called inside the submission's transaction;
+  the event must only reach subscribers if that commits.
+- ``publish_many(event_type, items)``: the same for one event per item of
+  ``items``, e.g. the records of a bulk ingest.
+- ``start()``: called (from a worker thread) before each subscription, to
+  set up whatever feeds ``broker.dispatch`` in this process.
+- ``replay(last_event_id)``: the events after ``last_event_id``, oldest
+  first, or ``None`` when some of them may be gone from the history.
+"""
+
+import logging
+import secrets
+import threading
+import time
+from collections import deque
+from datetime import timedelta
+from itertools import count
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Max, Q
+from django.utils import timezone
+
+from .broker import Event
+from .models import StreamEvent
+
+logger = logging.getLogger(__name__)
+
+
+class LocalBackend:
+    """Events reach the subscribers of the publishing process only.
+
+    Enough for a single server process. Ids carry a per-process token, so an
+    id from before a restart, or from another process, is never mistaken
+    for one of ours.
+    """
+
+    def __init__(self, broker):
+        self.broker = broker
+        self.token = secrets.token_hex(4)
+        self._sequence = count(1)
+        self._history = deque(maxlen=settings.EVENTS_HISTORY_SIZE)
+        self._lock = threading.Lock()
+
+    def publish(self, event_type, data):
+        transaction.on_commit(lambda: self._commit(event_type, data))
+
+    def publish_many(self, event_type, items):
+        def commit():
+            for data in items:
+                self._commit(event_type, data)
+        transaction.on_commit(commit)
+
+    def _commit(self, event_type, data):
+        with self._lock:
+            sequence = next(self._sequence)
+            event = Event(f'{self.token}-{sequence}', event_type, data)
+            self._history.append((sequence, event))
+        self.broker.dispatch(event)
+
+    def start(self):
+        pass
+
+    def replay(self, last_event_id):
+        token, _, sequence = last_event_id.rpartition('-')
+        if token != self.token or not sequence.isdigit():
+            return None
+        sequence = int(sequence)
+        with self._lock:
+            history = list(self._history)
+        if history and history[0][0] > sequence + 1:
+            return None
+        return [event for position, event in history if position > sequence]
+
+
+class DatabaseBackend:
+    """Events are ``StreamEvent`` rows, so every process's stream sees them.
+
+    Each process serving subscribers runs one poller thread, reading the rows
+    past the last id it saw every ``EVENTS_POLL_INTERVAL`` seconds - one
+    indexed query per process, however many clients are connected. Ids are
+    allocated at INSERT but become visible at COMMIT, so a skipped id is
+    looked for again for ``GAP_TIMEOUT`` seconds in case its transaction
+    commits late.
+    """
+
+    GAP_TIMEOUT = 10
+    MAX_GAPS = 500
+    PRUNE_INTERVAL = 60
+
+    def __init__(self, broker):
+        self.broker = broker
+        self.last_id = None
+        self.gaps = {}
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def publish(self, event_type, data):
+        StreamEvent.objects.create(type=event_type, data=data)
+
+    def publish_many(self, event_type, items):
+        StreamEvent.objects.bulk_create([StreamEvent(type=event_type, data=data) for data in items])
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self.last_id = StreamEvent.objects.aggregate(last=Max('pk'))['last'] or 0
+            self._thread = threading.Thread(target=self._run, name='events-poller', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        next_prune = 0
+        while True:
+            time.sleep(settings.EVENTS_POLL_INTERVAL)
+            try:
+                self.poll()
+                if time.monotonic() >= next_prune:
+                    self.prune()
+                    next_prune = time.monotonic() + self.PRUNE_INTERVAL
+            except Exception:
+                logger.exception('Event poll failed')
+            finally:
+                close_old_connections()
+
+    def poll(self):
+        """Dispatch the events committed since the last poll; returns how many."""
+        now = time.monotonic()
+        self.gaps = {pk: seen for pk, seen in self.gaps.items() if now - seen < self.GAP_TIMEOUT}
+        rows = (
+            StreamEvent.objects.filter(Q(pk__gt=self.last_id) | Q(pk__in=list(self.gaps)))
+            .order_by('pk')[:settings.EVENTS_HISTORY_SIZE]
+        )
+        dispatched = 0
+        for row in rows:
+            if row.pk > self.last_id:
+                if row.pk - self.last_id - 1 <= self.MAX_GAPS:
+                    self.gaps.update(dict.fromkeys(range(self.last_id + 1, row.pk), now))
+                self.last_id = row.pk
+            else:
+                del self.gaps[row.pk]
+            self.broker.dispatch(Event(str(row.pk), row.type, row.data))
+            dispatched += 1
+        return dispatched
+
+    def prune(self):
+        cutoff = timezone.now() - timedelta(seconds=settings.EVENTS_RETENTION_SECONDS)
+        StreamEvent.objects.filter(created_at__lt=cutoff).delete()
+
+    def replay(self, last_event_id):
+        if not last_event_id.isdigit():
+            return None
+        last = int(last_event_id)
+        # The client's last event still being stored means nothing after it was pruned.
+        if not StreamEvent.objects.filter(pk=last).exists():
+            return None
+        rows = list(
+            StreamEvent.objects.filter(pk__gt=last).order_by('pk')[:settings.EVENTS_HISTORY_SIZE + 1]
+        )
+        if len(rows) > settings.EVENTS_HISTORY_SIZE:
+            return None
+        return [Event(str(row.pk), row.type, row.data) for row in rows]
@@ -0,0 +1,165 @@
+"""
+In-process fan-out of live events to Server-Sent Events subscribers.
+
+The submit views ``publish`` an event for every new record. The configured
+backend (``EVENTS_BACKEND``) assigns it an id and hands it to ``dispatch``
+in every process serving the stream - only this one for ``LocalBackend``,
+all of them for ``DatabaseBackend`` - and the broker copies it to each
+subscriber of the process.
+
+A subscriber is a bounded ``asyncio.Queue`` on the event loop, not a thread,
+so an idle connection costs a queue and a suspended coroutine. A subscriber
+that falls ``EVENTS_QUEUE_SIZE`` events behind - a stalled client whose
+socket has stopped draining - is closed rather than buffered for: its stream
+ends after the queued events and the client reconnects with
+``Last-Event-ID``, which the backend replays from its history.
+"""
+
+import asyncio
+import threading
+from collections import namedtuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils.module_loading import import_string
+
+from jevelon_backend.metrics import event_overflows, event_subscribers
+
+Event = namedtuple('Event', ['id', 'type', 'data'])
+
+
+async def run_sync(func, *args):
+    """Run blocking ``func`` on the loop's shared executor.
+
+    Not Django's thread-sensitive executor: under ASGI that is one thread per
+    request, which a stream would then keep for as long as it is open.
+    """
+    def call():
+        try:
+            return func(*args)
+        finally:
+            close_old_connections()
+
+    return await sync_to_async(call, thread_sensitive=False)()
+
+
+class Full(Exception):
+    """Raised by ``Broker.subscribe`` at ``EVENTS_MAX_SUBSCRIBERS``."""
+
+
+class Subscription:
+    """One stream's queue of events, owned by the event loop it was created on."""
+
+    def __init__(self, broker, types, skip=()):
+        self.broker = broker
+        self.types = types
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(settings.EVENTS_QUEUE_SIZE)
+        # Replayed ids, so an event that is also dispatched live is sent once.
+        self.skip = set(skip)
+        self.closed = False
+
+    def offer(self, event):
+        """Queue ``event``; runs on ``self.loop``."""
+        if self.closed or (self.types and event.type not in self.types):
+            return
+        if event.id in self.skip:
+            self.skip.discard(event.id)
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            event_overflows().inc()
+            self.close()
+
+    async def get(self):
+        """The next event, or ``None`` once closed and drained."""
+        if self.closed and self.queue.empty():
+            return None
+        return await self.queue.get()
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.broker.unsubscribe(self)
+
+
+class Broker:
+    """Fans events out to this process's subscribers."""
+
+    def __init__(self, backend=None):
+        self._backend = backend
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            self._backend = import_string(settings.EVENTS_BACKEND)(self)
+        return self._backend
+
+    def publish(self, event_type, data):
+        """Publish an event once the current transaction commits."""
+        self.backend.publish(event_type, data)
+
+    def publish_many(self, event_type, items):
+        """Publish one event per item of ``items`` once the current transaction commits."""
+        self.backend.publish_many(event_type, items)
+
+    def dispatch(self, event):
+        """Deliver ``event`` to every subscriber; safe to call from any thread."""
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.offer, event)
+            except RuntimeError:
+                # Its event loop has shut down.
+                self.unsubscribe(subscription)
+
+    async def subscribe(self, types=(), last_event_id=None):
+        """Return a new ``Subscription`` and the events to replay first.
+
+        The replay is ``None`` when ``last_event_id`` is no longer in the
+        backend's history; the client has to reload instead.
+        """
+        await run_sync(self.backend.start)
+        with self._lock:
+            if len(self._subscribers) >= settings.EVENTS_MAX_SUBSCRIBERS:
+                raise Full()
+            subscription = Subscription(self, set(types))
+            self._subscribers.add(subscription)
+        event_subscribers().inc()
+        # Subscribed before reading the history, so nothing falls in between.
+        replay = []
+        if last_event_id:
+            replay = await run_sync(self.backend.replay, last_event_id)
+        if replay:
+            replay = [event for event in replay if not types or event.type in types]
+            subscription.skip.update(event.id for event in replay)
+        return subscription, replay
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            if subscription not in self._subscribers:
+                return
+            self._subscribers.discard(subscription)
+        subscription.closed = True
+        event_subscribers().dec()
+
+    def __len__(self):
+        return len(self._subscribers)
+
+
+broker = Broker()
+
+
+def publish(event_type, data):
+    """Announce ``data`` as an ``event_type`` event to live subscribers after commit."""
+    broker.publish(event_type, data)
+
+
+def publish_many(event_type, items):
+    """Announce each of ``items`` as an ``event_type`` event after commit."""
+    broker.publish_many(event_type, items)
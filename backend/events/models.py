@@ -0,0 +1,18 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+
+class StreamEvent(models.Model):
+    """An event published through ``events.backends.DatabaseBackend``.
+
+    Written in the transaction of the submission it announces; every process
+    serving the stream picks it up by primary key, and reconnecting clients
+    resume from it. Rows older than ``EVENTS_RETENTION_SECONDS`` are pruned.
+    """
+
+    type = models.CharField(max_length=50)
+    data = models.JSONField(encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f"{self.type} #{self.pk}"
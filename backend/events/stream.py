@@ -0,0 +1,133 @@
+"""
+The Server-Sent Events endpoint, as a plain ASGI application.
+
+``jevelon_backend.asgi`` routes ``/api/events/`` here instead of through
+Django's handler. Django runs each request's thread-sensitive work on a
+thread of its own until the response is finished, so an open stream served
+by a view would hold a thread for as long as the dashboard stays connected.
+Here the only blocking work - authenticating the request, reading the
+resume history - runs on the loop's shared executor, and an idle stream is
+just a coroutine waiting on its queue.
+
+Writes go through the server's ``send``, which waits while the client's
+socket is not draining; the subscriber's queue then fills up and the broker
+closes the stream (see ``events.broker``).
+"""
+
+import asyncio
+import io
+import json
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework.exceptions import AuthenticationFailed, NotAuthenticated, PermissionDenied
+from rest_framework.permissions import IsAdminUser
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from .broker import Event, Full, broker, run_sync
+
+PATH = '/api/events/'
+RESET = Event(None, 'reset', {})
+
+
+def _check_staff(request):
+    """``None`` if the request is from a staff member, else the error to answer with."""
+    request = Request(request, authenticators=[auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES])
+    try:
+        if IsAdminUser().has_permission(request, None):
+            return None
+    except AuthenticationFailed as e:
+        return e
+    return PermissionDenied() if request.user.is_authenticated else NotAuthenticated()
+
+
+def _cors_headers(request):
+    origin = request.headers.get('Origin')
+    if origin not in settings.CORS_ALLOWED_ORIGINS:
+        return []
+    headers = [(b'access-control-allow-origin', origin.encode()), (b'vary', b'Origin')]
+    if settings.CORS_ALLOW_CREDENTIALS:
+        headers.append((b'access-control-allow-credentials', b'true'))
+    return headers
+
+
+def format_event(event):
+    lines = [f'id: {event.id}'] if event.id else []
+    lines += [f'event: {event.type}', f'data: {json.dumps(event.data, cls=DjangoJSONEncoder)}']
+    return ('\n'.join(lines) + '\n\n').encode()
+
+
+async def _respond(send, status, data, headers=()):
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', b'application/json'), *headers],
+    })
+    await send({'type': 'http.response.body', 'body': json.dumps(data).encode()})
+
+
+async def _disconnected(receive):
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+
+
+async def application(scope, receive, send):
+    request = ASGIRequest(scope, io.BytesIO())
+    cors = _cors_headers(request)
+    if request.method != 'GET':
+        return await _respond(send, 405, {'detail': f'Method "{request.method}" not allowed.'}, cors)
+    error = await run_sync(_check_staff, request)
+    if error:
+        return await _respond(send, 403, {'detail': error.detail}, cors)
+
+    types = [value for value in request.GET.get('types', '').split(',') if value]
+    last_event_id = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id')
+    try:
+        subscription, replay = await broker.subscribe(types, last_event_id)
+    except Full:
+        return await _respond(send, 503, {
+            'success': False,
+            'error': 'Too many open event streams, try again shortly.'
+        }, [(b'retry-after', b'5'), *cors])
+
+    disconnected = asyncio.ensure_future(_disconnected(receive))
+    try:
+        await send({
+            'type': 'http.response.start',
+            'status': 200,
+            'headers': [
+                (b'content-type', b'text/event-stream'),
+                (b'cache-control', b'no-cache'),
+                # Stop nginx-style proxies from buffering the stream.
+                (b'x-accel-buffering', b'no'),
+                *cors,
+            ],
+        })
+        chunks = [f'retry: {settings.EVENTS_RETRY_MS}\n\n'.encode()]
+        chunks += [format_event(event) for event in (replay if replay is not None else [RESET])]
+        await send({'type': 'http.response.body', 'body': b''.join(chunks), 'more_body': True})
+        while True:
+            next_event = asyncio.ensure_future(subscription.get())
+            done, _ = await asyncio.wait(
+                {next_event, disconnected}, timeout=settings.EVENTS_HEARTBEAT_SECONDS,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if disconnected in done:
+                next_event.cancel()
+                return
+            if not done:
+                # Keeps proxies from timing the connection out and notices dead clients.
+                next_event.cancel()
+                await send({'type': 'http.response.body', 'body': b': keepalive\n\n', 'more_body': True})
+                continue
+            event = next_event.result()
+            if event is None:
+                # Fell too far behind; the client reconnects and resumes from its last id.
+                break
+            await send({'type': 'http.response.body', 'body': format_event(event), 'more_body': True})
+        await send({'type': 'http.response.body', 'body': b''})
+    finally:
+        disconnected.cancel()
+        subscription.close()
@@ -0,0 +1,343 @@
+import asyncio
+import base64
+import json
+import threading
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.db import transaction
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from jevelon_backend import asgi
+from jevelon_backend.testing import sample
+from . import stream
+from .backends import DatabaseBackend, LocalBackend
+from .broker import Broker, broker
+from .models import StreamEvent
+
+
+def use_local_backend(test):
+    """Give the process broker a fresh ``LocalBackend`` for the duration of ``test``."""
+    test.addCleanup(setattr, broker, '_backend', broker._backend)
+    broker._backend = LocalBackend(broker)
+    return broker._backend
+
+
+def committed(local, event_type, data):
+    """What ``LocalBackend`` does for an event once its transaction commits."""
+    local.backend._commit(event_type, data)
+
+
+class Recorder:
+    """Stands in for the broker a backend dispatches to."""
+
+    def __init__(self):
+        self.events = []
+
+    def dispatch(self, event):
+        self.events.append(event)
+
+
+class BrokerTests(SimpleTestCase):
+    """The broker with events as ``LocalBackend`` commits them."""
+
+    async def test_fans_out_to_many_subscribers_without_threads(self):
+        local = Broker()
+        local._backend = LocalBackend(local)
+        threads = threading.active_count()
+        subscriptions = [(await local.subscribe())[0] for _ in range(2000)]
+
+        committed(local, 'ticket', {'id': 1})
+        received = await asyncio.gather(*(subscription.get() for subscription in subscriptions))
+
+        self.assertEqual({event.data['id'] for event in received}, {1})
+        self.assertEqual(len(local), 2000)
+        # At most the loop's default executor, bounded whatever the number of streams.
+        self.assertLessEqual(threading.active_count() - threads, 32)
+
+    async def test_filters_by_type(self):
+        local = Broker()
+        local._backend = LocalBackend(local)
+        subscription, _ = await local.subscribe(['contact'])
+
+        committed(local, 'ticket', {'id': 1})
+        committed(local, 'contact', {'id': 2})
+
+        self.assertEqual((await subscription.get()).data, {'id': 2})
+
+    @override_settings(EVENTS_QUEUE_SIZE=3)
+    async def test_subscriber_that_falls_behind_is_closed_after_draining(self):
+        local = Broker()
+        local._backend = LocalBackend(local)
+        slow, _ = await local.subscribe()
+        before = sample('jevelon_event_stream_overflows_total')
+
+        for i in range(5):
+            committed(local, 'ticket', {'id': i})
+        await asyncio.sleep(0)
+
+        self.assertEqual(len(local), 0)
+        self.assertEqual([(await slow.get()).data['id'] for _ in range(3)], [0, 1, 2])
+        self.assertIsNone(await slow.get())
+        self.assertEqual(sample('jevelon_event_stream_overflows_total'), before + 1)
+
+    async def test_resume_replays_missed_events_once(self):
+        local = Broker()
+        backend = local._backend = LocalBackend(local)
+        for i in range(3):
+            committed(local, 'ticket', {'id': i})
+        first = backend._history[0][1]
+
+        subscription, replay = await local.subscribe(last_event_id=first.id)
+        # Dispatched again (e.g. by a poller catching up): not queued twice.
+        local.dispatch(replay[0])
+        committed(local, 'ticket', {'id': 3})
+
+        self.assertEqual([event.data['id'] for event in replay], [1, 2])
+        self.assertEqual((await subscription.get()).data['id'], 3)
+
+    @override_settings(EVENTS_HISTORY_SIZE=2)
+    async def test_resume_beyond_history_asks_for_reset(self):
+        local = Broker()
+        backend = local._backend = LocalBackend(local)
+        for i in range(4):
+            committed(local, 'ticket', {'id': i})
+
+        self.assertIsNone(backend.replay(f'{backend.token}-1'))
+        self.assertEqual(len(backend.replay(f'{backend.token}-2')), 2)
+        self.assertIsNone(backend.replay('another-process-2'))
+        self.assertIsNone(backend.replay('garbage'))
+
+
+class PublishingTests(TestCase):
+    def setUp(self):
+        caches['idempotency'].clear()
+        self.backend = use_local_backend(self)
+
+    def test_submissions_are_published_after_commit(self):
+        payload = {
+            'name': 'Asha Verma', 'email': 'asha@example.com', 'priority': 'critical',
+            'subject': 'Site down', 'message': 'Nothing loads.',
+        }
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = APIClient().post('/api/support/submit/', payload, format='json')
+            self.assertEqual(len(self.backend._history), 0)
+        for callback in callbacks:
+            callback()
+
+        [(_, event)] = self.backend._history
+        self.assertEqual(event.type, 'ticket')
+        self.assertEqual(event.data['id'], response.json()['ticket_id'])
+        self.assertEqual(event.data['priority'], 'critical')
+
+    def test_bulk_ingest_publishes_each_created_record(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user('ingest'))
+        items = [
+            {'name': 'Ravi Rao', 'email': f'ravi{i}@example.com', 'service': 'consulting', 'message': 'Hi'}
+            for i in range(3)
+        ] + [{'name': '', 'email': 'bad'}]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client.post('/api/contact/bulk/', items, format='json')
+
+        created = [result['id'] for result in response.json()['results'] if result['success']]
+        events = [event for _, event in self.backend._history]
+        self.assertEqual([event.type for event in events], ['contact'] * 3)
+        self.assertEqual([event.data['id'] for event in events], created)
+
+    def test_rolled_back_submissions_are_not_published(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    broker.publish('contact', {'id': 1})
+                    raise ValueError
+            except ValueError:
+                pass
+
+        self.assertEqual(len(self.backend._history), 0)
+
+
+class DatabaseBackendTests(TestCase):
+    def setUp(self):
+        self.recorder = Recorder()
+        self.backend = DatabaseBackend(self.recorder)
+        self.backend.last_id = 0
+
+    def publish(self, n):
+        self.backend.publish('ticket', {'n': n})
+        return StreamEvent.objects.latest('pk')
+
+    def test_poll_dispatches_new_rows_once(self):
+        first = self.publish(1)
+        self.assertEqual(self.backend.poll(), 1)
+        self.publish(2)
+
+        self.assertEqual(self.backend.poll(), 1)
+        self.assertEqual(self.backend.poll(), 0)
+        self.assertEqual([event.data['n'] for event in self.recorder.events], [1, 2])
+        self.assertEqual(self.recorder.events[0].id, str(first.pk))
+
+    def test_publish_many_writes_one_row_per_item(self):
+        with self.assertNumQueries(1):
+            self.backend.publish_many('contact', [{'n': 1}, {'n': 2}])
+
+        self.assertEqual(self.backend.poll(), 2)
+        self.assertEqual([event.data['n'] for event in self.recorder.events], [1, 2])
+
+    def test_ids_that_commit_late_are_still_delivered(self):
+        self.publish(1)
+        late = self.publish(2)
+        self.publish(3)
+        # As if the transaction inserting #2 had not committed yet.
+        late.delete()
+
+        self.backend.poll()
+        StreamEvent.objects.create(pk=late.pk, type='ticket', data={'n': 2})
+        self.backend.poll()
+
+        self.assertEqual([event.data['n'] for event in self.recorder.events], [1, 3, 2])
+        self.assertNotIn(late.pk, self.backend.gaps)
+
+    def test_replay_from_last_event_id(self):
+        first = self.publish(1)
+        self.publish(2)
+        self.publish(3)
+
+        self.assertEqual([event.data['n'] for event in self.backend.replay(str(first.pk))], [2, 3])
+        self.assertEqual(self.backend.replay(str(first.pk + 2)), [])
+
+    def test_replay_after_pruning_asks_for_reset(self):
+        old = self.publish(1)
+        self.publish(2)
+        StreamEvent.objects.filter(pk=old.pk).update(created_at=timezone.now() - timedelta(days=1))
+
+        self.backend.prune()
+
+        self.assertIsNone(self.backend.replay(str(old.pk)))
+        self.assertIsNone(self.backend.replay('x'))
+        self.assertEqual(StreamEvent.objects.count(), 1)
+
+
+class StreamTests(TransactionTestCase):
+    """``events.stream`` driven as the ASGI server would."""
+
+    def setUp(self):
+        self.backend = use_local_backend(self)
+        staff = User.objects.create_user('staff', is_staff=True)
+        client = APIClient()
+        client.force_login(staff)
+        self.cookie = f'sessionid={client.cookies["sessionid"].value}'
+
+    def connect(self, headers=(), query=''):
+        """Start a request; returns the task, the sent messages and a disconnect function."""
+        sent, inbox = [], asyncio.Queue()
+        scope = {
+            'type': 'http', 'method': 'GET', 'path': stream.PATH, 'query_string': query.encode(),
+            'headers': [(name.lower().encode(), value.encode()) for name, value in headers],
+        }
+
+        async def send(message):
+            sent.append(message)
+
+        task = asyncio.ensure_future(asgi.application(scope, inbox.get, send))
+        return task, sent, lambda: inbox.put_nowait({'type': 'http.disconnect'})
+
+    @staticmethod
+    def body(sent):
+        return b''.join(message.get('body', b'') for message in sent).decode()
+
+    async def wait_for(self, condition):
+        for _ in range(200):
+            if condition():
+                return
+            await asyncio.sleep(0.01)
+        self.fail('timed out')
+
+    async def test_requires_staff(self):
+        task, sent, _ = self.connect()
+        await task
+
+        self.assertEqual(sent[0]['status'], 403)
+        self.assertIn('credentials', json.loads(sent[1]['body'])['detail'])
+
+        credentials = base64.b64encode(b'someone:wrong').decode()
+        task, sent, _ = self.connect([('Authorization', f'Basic {credentials}')])
+        await task
+        self.assertEqual(sent[0]['status'], 403)
+
+    @override_settings(EVENTS_HEARTBEAT_SECONDS=0.05)
+    async def test_streams_events_until_the_client_leaves(self):
+        task, sent, disconnect = self.connect([('Cookie', self.cookie), ('Origin', 'https://jevelon.com')])
+        await self.wait_for(lambda: len(broker) == 1 and len(sent) == 2)
+
+        await sync_to_async(broker.publish)('ticket', {'id': 7, 'subject': 'Line break'})
+        await self.wait_for(lambda: 'id: ' in self.body(sent))
+        await self.wait_for(lambda: ': keepalive' in self.body(sent))
+        disconnect()
+        await task
+
+        headers = dict(sent[0]['headers'])
+        self.assertEqual(sent[0]['status'], 200)
+        self.assertEqual(headers[b'content-type'], b'text/event-stream')
+        self.assertEqual(headers[b'access-control-allow-origin'], b'https://jevelon.com')
+        self.assertTrue(self.body(sent).startswith('retry: 3000\n\n'))
+        self.assertIn(f'id: {self.backend.token}-1\nevent: ticket\ndata: {{"id": 7, "subject": "Line\\u2028break"}}\n\n',
+                      self.body(sent))
+        self.assertEqual(len(broker), 0)
+
+    async def test_resumes_from_last_event_id(self):
+        for i in range(3):
+            await sync_to_async(broker.publish)('ticket', {'id': i})
+
+        task, sent, disconnect = self.connect([('Cookie', self.cookie), ('Last-Event-ID', f'{self.backend.token}-1')])
+        await self.wait_for(lambda: len(sent) == 2)
+        disconnect()
+        await task
+        self.assertNotIn('"id": 0', self.body(sent))
+        self.assertIn('"id": 1', self.body(sent))
+        self.assertIn('"id": 2', self.body(sent))
+
+        task, sent, disconnect = self.connect([('Cookie', self.cookie)], query='last_event_id=unknown-9')
+        await self.wait_for(lambda: len(sent) == 2)
+        disconnect()
+        await task
+        self.assertIn('event: reset\ndata: {}', self.body(sent))
+
+    @override_settings(EVENTS_QUEUE_SIZE=2)
+    async def test_stalled_client_is_disconnected(self):
+        unblock = asyncio.Event()
+        sent, inbox = [], asyncio.Queue()
+
+        async def send(message):
+            if message.get('more_body') and len(sent) >= 2:
+                await unblock.wait()  # the client's socket is full
+            sent.append(message)
+
+        scope = {'type': 'http', 'method': 'GET', 'path': stream.PATH, 'query_string': b'',
+                 'headers': [(b'cookie', self.cookie.encode())]}
+        task = asyncio.ensure_future(stream.application(scope, inbox.get, send))
+        await self.wait_for(lambda: len(sent) == 2)
+
+        for i in range(5):
+            await sync_to_async(broker.publish)('ticket', {'id': i})
+        await self.wait_for(lambda: len(broker) == 0)
+        unblock.set()
+        await task
+
+        self.assertEqual(self.body(sent).count('event: ticket'), 3)  # one being written, two queued
+        self.assertFalse(sent[-1].get('more_body'))
+
+    @override_settings(EVENTS_MAX_SUBSCRIBERS=0)
+    async def test_rejects_streams_over_the_limit(self):
+        task, sent, _ = self.connect([('Cookie', self.cookie)])
+        await task
+
+        self.assertEqual(sent[0]['status'], 503)
+
+    def test_not_served_under_wsgi(self):
+        self.assertEqual(self.client.get('/api/events/').status_code, 501)
@@ -0,0 +1,13 @@
+from django.http import JsonResponse
+
+
+def stream_events(request):
+    """Reached only when ``/api/events/`` isn't served by ``events.stream``.
+
+    The stream is part of the ASGI application (``jevelon_backend.asgi``);
+    under WSGI each open stream would hold a worker.
+    """
+    return JsonResponse({
+        'success': False,
+        'error': 'The event stream is only served by the ASGI application.'
+    }, status=501)
@@ -1,3 +1,6 @@
+import os
+import shutil
+
 bind = "0.0.0.0:8000"
 workers = 4
 worker_class = "sync"
@@ -6,4 +9,23 @@ timeout = 30
 keepalive = 2
 max_requests = 1000
 max_requests_jitter = 100
-preload_app = True 
\ No newline at end of file
+preload_app = True 
+
+
+# Each worker writes its metrics to mmap-ed files here and /metrics sums
+# them; set before the app is imported so prometheus_client picks it up.
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/jevelon-metrics")
+# Cleared here, not in on_starting: with preload_app the app (and any metric
+# it creates at import) is loaded before that hook runs. Samples left by a
+# previous run would otherwise be summed into this one.
+shutil.rmtree(os.environ["PROMETHEUS_MULTIPROC_DIR"], ignore_errors=True)
+os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+# Idempotency keys live in files here so a retry is recognised by any worker.
+os.environ.setdefault("IDEMPOTENCY_CACHE_DIR", "/tmp/jevelon-idempotency")
+# One cache for all workers, kept across max_requests recycling.
+os.environ.setdefault("CACHE_URL", "file:///tmp/jevelon-cache")
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
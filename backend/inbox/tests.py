@@ -0,0 +1,130 @@
+import itertools
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from consultation.models import Consultation
+from contact.models import Contact
+from jevelon_backend.pagination import after_merged_position
+from jevelon_backend.testing import QueryPlanMixin
+from support.models import SupportTicket
+
+# Consultations each need a free slot.
+days = itertools.count()
+
+
+def make(model, created_at, **fields):
+    defaults = {
+        Contact: {'name': 'Ravi Rao', 'email': 'ravi@example.com', 'service': 'consulting', 'message': 'Hi'},
+        Consultation: {
+            'name': 'Ravi Kumar', 'email': 'ravi@example.com', 'project_type': 'mobile-app',
+            'preferred_date': date(2026, 11, 2) + timedelta(days=next(days)), 'preferred_time': '10:00 AM',
+        },
+        SupportTicket: {'name': 'Asha Verma', 'email': 'asha@example.com', 'subject': 'Login fails', 'message': 'No.'},
+    }[model]
+    row = model.objects.create(**{**defaults, **fields})
+    model.objects.filter(pk=row.pk).update(created_at=created_at)
+    return row
+
+
+class InboxTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user('staff', is_staff=True))
+        self.now = timezone.now()
+
+    def pages(self, **params):
+        items, cursor = [], None
+        while True:
+            data = self.client.get('/api/inbox/', {**params, **({'cursor': cursor} if cursor else {})}).json()
+            items += [(item['type'], item['id']) for item in data['items']]
+            cursor = data['next_cursor']
+            if not cursor:
+                return items
+
+    def test_requires_staff(self):
+        self.assertIn(APIClient().get('/api/inbox/').status_code, (401, 403))
+
+    def test_merges_all_types_newest_first(self):
+        ticket = make(SupportTicket, self.now - timedelta(minutes=1), priority='high')
+        contact = make(Contact, self.now - timedelta(minutes=2))
+        consultation = make(Consultation, self.now - timedelta(minutes=3))
+
+        data = self.client.get('/api/inbox/').json()
+
+        self.assertEqual([(item['type'], item['id']) for item in data['items']],
+                         [('ticket', ticket.pk), ('contact', contact.pk), ('consultation', consultation.pk)])
+        self.assertEqual(data['items'][0]['priority'], 'high')
+        self.assertEqual(data['items'][1]['service'], 'consulting')
+        self.assertIsNone(data['next_cursor'])
+
+    def test_pages_cover_every_row_once_across_timestamp_ties(self):
+        expected = []
+        for minute in range(4):
+            created_at = self.now - timedelta(minutes=minute)
+            for model, name in ((SupportTicket, 'ticket'), (Contact, 'contact'), (Consultation, 'consultation')):
+                for _ in range(2):
+                    expected.append((name, make(model, created_at).pk))
+
+        items = self.pages(page_size=5)
+
+        self.assertEqual(len(items), 24)
+        self.assertEqual(sorted(items), sorted(expected))
+        # Newest first; ties by type, then id, descending.
+        self.assertEqual(items[:6], sorted(expected[:6], key=lambda item: (item[0], item[1]), reverse=True))
+
+    def test_type_and_per_type_filters(self):
+        make(SupportTicket, self.now, priority='high')
+        low = make(SupportTicket, self.now, priority='low')
+        contact = make(Contact, self.now)
+        make(Consultation, self.now)
+
+        items = self.pages(type='ticket,contact', ticket_priority='low')
+
+        self.assertEqual(sorted(items), [('contact', contact.pk), ('ticket', low.pk)])
+
+    def test_invalid_parameters_are_rejected(self):
+        response = self.client.get('/api/inbox/', {'type': 'ticket,note', 'cursor': 'x'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('type', response.json()['errors'])
+
+        response = self.client.get('/api/inbox/', {'ticket_priority': 'urgent', 'created_after': 'soon'})
+        self.assertEqual(set(response.json()['errors']), {'ticket_priority', 'created_after'})
+
+        response = self.client.get('/api/inbox/', {'cursor': 'garbage'})
+        self.assertEqual(response.json()['errors'], {'cursor': ['Invalid cursor.']})
+
+    def test_impossible_shared_date_is_rejected(self):
+        response = self.client.get('/api/inbox/', {'type': 'ticket,contact', 'created_after': '2026-02-30'})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['errors'], {'created_after': ['Enter a valid date or datetime.']})
+
+    def test_queries_do_not_grow_with_depth_or_rows(self):
+        for minute in range(30):
+            make([SupportTicket, Contact, Consultation][minute % 3], self.now - timedelta(minutes=minute))
+
+        with self.assertNumQueries(6):  # keys, then rows, for each type
+            data = self.client.get('/api/inbox/', {'page_size': 5}).json()
+        with self.assertNumQueries(6):
+            self.client.get('/api/inbox/', {'page_size': 5, 'cursor': data['next_cursor']})
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/inbox/', {'page_size': 5})
+        self.assertEqual(response['X-Cache'], 'HIT')
+
+
+class InboxQueryPlanTests(QueryPlanMixin, TestCase):
+    def test_each_type_is_read_as_an_index_range(self):
+        position = (timezone.now(), 'contact', 10)
+        for model, name, index in (
+            (SupportTicket, 'ticket', 'ticket_recent_idx'),
+            (Contact, 'contact', 'contact_recent_idx'),
+            (Consultation, 'consultation', 'consult_recent_idx'),
+        ):
+            keys = model.objects.filter(after_merged_position(name, position)).order_by('-created_at', '-pk')
+            self.assertUsesIndex(keys.values_list('created_at', 'pk')[:51], index)
@@ -0,0 +1,95 @@
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+from consultation.models import Consultation
+from consultation.serializers import ConsultationSerializer
+from contact.models import Contact
+from contact.serializers import ContactSerializer
+from jevelon_backend import caching
+from jevelon_backend.filters import filter_queryset
+from jevelon_backend.pagination import MergedPagination
+from support.models import SupportTicket
+from support.serializers import SupportTicketSerializer
+
+# Each item type: its model, serializer and the choice fields it can be
+# filtered on as ``?<type>_<field>=``.
+SOURCES = {
+    'consultation': (Consultation, ConsultationSerializer, ['status', 'project_type']),
+    'contact': (Contact, ContactSerializer, ['service']),
+    'ticket': (SupportTicket, SupportTicketSerializer, ['status', 'priority', 'category']),
+}
+# Filters that apply to every type.
+SHARED_FILTERS = ('email_sent', 'created_after', 'created_before')
+
+
+def _requested_types(params):
+    raw = params.get('type')
+    if not raw:
+        return list(SOURCES)
+    types = [name for name in raw.split(',') if name]
+    invalid = [name for name in types if name not in SOURCES]
+    if invalid:
+        raise ValidationError({'type': [f'"{name}" is not a valid choice.' for name in invalid]})
+    return [name for name in SOURCES if name in types]
+
+
+def _sources(params):
+    """The filtered queryset of each requested type."""
+    sources = {}
+    errors = {}
+    for name in _requested_types(params):
+        model, _, fields = SOURCES[name]
+        own = {field: params.get(f'{name}_{field}') for field in fields}
+        own.update((param, params.get(param)) for param in SHARED_FILTERS)
+        try:
+            sources[name] = filter_queryset(
+                model.objects.all(), own, fields=fields, boolean_fields=['email_sent'],
+            )
+        except ValidationError as e:
+            errors.update((f'{name}_{key}' if key in fields else key, value) for key, value in e.detail.items())
+    if errors:
+        raise ValidationError(errors)
+    return sources
+
+
+def _inbox_page(request):
+    paginator = MergedPagination()
+    page = paginator.paginate_sources(_sources(request.query_params), request)
+    items = [{'type': name, **SOURCES[name][1](row).data} for name, row in page]
+    return paginator.get_paginated_data(items, key='items')
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def get_inbox(request):
+    """Contacts, consultations and support tickets in one stream, newest first (staff only).
+
+    Each item carries its ``type`` (``contact``, ``consultation`` or
+    ``ticket``) and that type's fields. ``?type=`` picks some of the types
+    (comma-separated); ``ticket_status``, ``ticket_priority``,
+    ``ticket_category``, ``consultation_status``,
+    ``consultation_project_type`` and ``contact_service`` filter one type
+    each, while ``email_sent``, ``created_after`` and ``created_before``
+    apply to all. Paged with ``cursor``/``page_size`` like the listings.
+    """
+    try:
+        data, hit = caching.cached(
+            'inbox', [Contact, Consultation, SupportTicket], caching.request_key(request),
+            lambda: _inbox_page(request),
+        )
+        response = Response(data, status=status.HTTP_200_OK)
+        response['X-Cache'] = 'HIT' if hit else 'MISS'
+        return response
+    except ValidationError as e:
+        return Response({
+            'success': False,
+            'errors': e.detail
+        }, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -0,0 +1,96 @@
+"""
+Admin changelists that stay fast on large submission tables.
+
+The stock changelist counts every matching row (twice, with
+``show_full_result_count``), and every page load re-runs the aggregates
+behind the ``list_filter`` facet counts and the ``date_hierarchy``
+drill-down, each a pass over all matching rows. ``LargeTableAdminMixin``
+counts exactly only up to ``ADMIN_EXACT_COUNT_LIMIT`` rows and takes the
+planner's estimate beyond that, and serves those aggregates from the cache
+for ``ADMIN_FACET_CACHE_TIMEOUT`` seconds.
+"""
+
+import hashlib
+import json
+
+from django.conf import settings
+from django.contrib.admin.views.main import ChangeList
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+
+
+def estimate_count(queryset):
+    """The planner's row estimate for ``queryset``, or ``None`` where there is none.
+
+    PostgreSQL derives it from the statistics ANALYZE/autovacuum keep, so it
+    costs one EXPLAIN instead of a scan.
+    """
+    if connections[queryset.db].vendor != 'postgresql':
+        return None
+    plan = json.loads(queryset.order_by().explain(format='json'))
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class EstimatedCountPaginator(Paginator):
+    """Exact counts for small results, planner estimates for large ones."""
+
+    @cached_property
+    def count(self):
+        limit = settings.ADMIN_EXACT_COUNT_LIMIT
+        # COUNT over a LIMITed subquery stops reading after limit + 1 rows.
+        exact = self.object_list[:limit + 1].count()
+        if exact <= limit:
+            return exact
+        estimate = estimate_count(self.object_list)
+        if estimate is None:
+            return self.object_list.count()
+        return max(estimate, exact)
+
+
+class CachedAggregatesQuerySet(QuerySet):
+    """Caches ``aggregate()``, ``dates()`` and ``datetimes()`` results by their SQL.
+
+    The changelist only uses these for facet counts and the date
+    drill-down, where a few minutes of staleness is fine.
+    """
+
+    def _cached(self, compute, *args):
+        sql, params = self.query.sql_with_params()
+        digest = hashlib.sha256(f'{sql}|{params}|{args}'.encode()).hexdigest()
+        key = f'admin-aggregates:{self.model._meta.label_lower}:{digest}'
+        result = cache.get(key)
+        if result is None:
+            result = compute()
+            cache.set(key, result, settings.ADMIN_FACET_CACHE_TIMEOUT)
+        return result
+
+    def aggregate(self, *args, **kwargs):
+        compute = super().aggregate
+        return self._cached(lambda: compute(*args, **kwargs), 'aggregate', args, sorted(kwargs.items()))
+
+    def dates(self, field_name, kind, order='ASC'):
+        compute = super().dates
+        return self._cached(lambda: list(compute(field_name, kind, order)), 'dates', field_name, kind, order)
+
+    def datetimes(self, field_name, kind, order='ASC', tzinfo=None):
+        compute = super().datetimes
+        return self._cached(
+            lambda: list(compute(field_name, kind, order, tzinfo)), 'datetimes', field_name, kind, order, tzinfo,
+        )
+
+
+class CachedAggregatesChangeList(ChangeList):
+    def get_queryset(self, request, exclude_parameters=None):
+        queryset = super().get_queryset(request, exclude_parameters)
+        return CachedAggregatesQuerySet(queryset.model, queryset.query, queryset.db, queryset._hints)
+
+
+class LargeTableAdminMixin:
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_changelist(self, request, **kwargs):
+        return CachedAggregatesChangeList
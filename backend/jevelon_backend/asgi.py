@@ -2,6 +2,8 @@
 ASGI config for jevelon_backend project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+The Server-Sent Events stream (``/api/events/``) is served by
+``events.stream`` directly; every other request goes to Django.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
@@ -13,4 +15,12 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'jevelon_backend.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from events import stream  # noqa: E402 (needs the app registry loaded)
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'http' and scope['path'] == stream.PATH:
+        return await stream.application(scope, receive, send)
+    return await django_application(scope, receive, send)
@@ -0,0 +1,29 @@
+"""
+DRF session authentication for paths served without the session middleware.
+"""
+
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.auth import get_user
+from django.utils.functional import SimpleLazyObject
+from rest_framework import authentication
+
+
+class SessionAuthentication(authentication.SessionAuthentication):
+    """``SessionAuthentication`` that loads the session itself when no middleware did.
+
+    Requests without a session cookie - every public submission - cost a
+    cookie lookup; a staff member's admin session still authenticates
+    ``/api/`` requests, with DRF's CSRF check for unsafe methods.
+    """
+
+    def authenticate(self, request):
+        raw = request._request
+        if not hasattr(raw, 'user'):
+            session_key = raw.COOKIES.get(settings.SESSION_COOKIE_NAME)
+            if not session_key:
+                return None
+            raw.session = import_module(settings.SESSION_ENGINE).SessionStore(session_key)
+            raw.user = SimpleLazyObject(lambda: get_user(raw))
+        return super().authenticate(request)
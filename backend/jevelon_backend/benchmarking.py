@@ -0,0 +1,264 @@
+"""
+Latency statistics and endpoint scenarios shared by the benchmark and
+load-test commands.
+
+``run_scenario`` drives the Django test client from a pool of threads, so a
+run exercises the full middleware/view/ORM stack in-process, with no server
+and no network, and can be compared between commits.
+"""
+
+import itertools
+import statistics
+import threading
+import time
+from datetime import timedelta
+
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import Client
+from django.utils import timezone
+
+from consultation.models import TIME_SLOTS
+from jevelon_backend.health import readiness
+
+# One realistic body per public submit endpoint; ``{n}`` keeps emails unique
+# and ``{date}``/``{slot}`` walk through free consultation slots.
+SUBMIT_PAYLOADS = {
+    '/api/contact/submit/': {
+        'name': 'Load Test {n}',
+        'email': 'load{n}@example.com',
+        'service': 'web-development',
+        'message': 'We are looking to rebuild our storefront and need an estimate.',
+    },
+    '/api/support/submit/': {
+        'name': 'Load Test {n}',
+        'email': 'load{n}@example.com',
+        'priority': 'medium',
+        'category': 'bug',
+        'subject': 'Checkout page times out',
+        'message': 'Submitting an order spins for a minute and then shows a gateway error.',
+    },
+    '/api/consultation/schedule/': {
+        'name': 'Load Test {n}',
+        'email': 'load{n}@example.com',
+        'phone': '+91 98765 43210',
+        'company': 'Acme Retail',
+        'project_type': 'mobile-app',
+        'preferred_date': '{date}',
+        'preferred_time': '{slot}',
+        'additional_notes': 'Exploring an iOS and Android app for our loyalty programme.',
+    },
+}
+
+_counter = itertools.count()
+
+
+def submit_payload(path):
+    """A fresh copy of the sample body for ``path`` with unique identifiers."""
+    n = next(_counter)
+    date = timezone.localdate() + timedelta(days=1 + n // len(TIME_SLOTS))
+    slot = TIME_SLOTS[n % len(TIME_SLOTS)]
+    return {key: value.format(n=n, date=date, slot=slot) for key, value in SUBMIT_PAYLOADS[path].items()}
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class LatencyStats:
+    """Summary of one measured run: request latencies plus wall-clock time."""
+
+    def __init__(self, name, latencies, elapsed, errors=0, concurrency=1):
+        self.name = name
+        self.latencies = sorted(latencies)
+        self.elapsed = elapsed
+        self.errors = errors
+        self.concurrency = concurrency
+
+    @property
+    def throughput(self):
+        return len(self.latencies) / self.elapsed if self.elapsed else 0.0
+
+    def to_dict(self):
+        ms = [value * 1000 for value in self.latencies]
+        return {
+            'name': self.name,
+            'concurrency': self.concurrency,
+            'requests': len(ms),
+            'errors': self.errors,
+            'throughput_rps': round(self.throughput, 2),
+            'mean_ms': round(statistics.fmean(ms), 3) if ms else 0.0,
+            'p50_ms': round(percentile(ms, 0.50), 3),
+            'p95_ms': round(percentile(ms, 0.95), 3),
+            'p99_ms': round(percentile(ms, 0.99), 3),
+            'max_ms': round(ms[-1], 3) if ms else 0.0,
+        }
+
+    HEADER = f"{'scenario':<34} {'conc':>5} {'req':>7} {'err':>5} {'rps':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+
+    def row(self):
+        d = self.to_dict()
+        return (
+            f"{d['name']:<34} {d['concurrency']:>5} {d['requests']:>7} {d['errors']:>5} "
+            f"{d['throughput_rps']:>9.1f} {d['p50_ms']:>8.2f} {d['p95_ms']:>8.2f} {d['p99_ms']:>8.2f}"
+        )
+
+
+class Scenario:
+    """One endpoint to drive: a request template plus the statuses that count as success.
+
+    ``body`` is a dict/list, or a callable returning one per request.
+    ``user`` is ``None``, ``'user'`` or ``'staff'``. ``setup`` runs once
+    before the warmup requests.
+    """
+
+    def __init__(self, name, method, path, body=None, params=None, user=None, expected=(200,), setup=None):
+        self.name = name
+        self.method = method
+        self.path = path
+        self.body = body
+        self.params = params or {}
+        self.user = user
+        self.expected = expected
+        self.setup = setup
+
+    def request(self, client):
+        if self.method == 'get':
+            response = client.get(self.path, self.params)
+        else:
+            body = self.body() if callable(self.body) else self.body
+            response = client.post(self.path, body, content_type='application/json')
+        if response.streaming:
+            # Exports are only done once the last chunk has been produced.
+            for _ in response.streaming_content:
+                pass
+        return response.status_code
+
+
+def _bulk(path, size):
+    return lambda: [submit_payload(path) for _ in range(size)]
+
+
+SCENARIOS = [
+    Scenario('health', 'get', '/'),
+    Scenario('livez', 'get', '/livez'),
+    # Run the first check up front so the probe answers 200 instead of 'starting'.
+    Scenario('readyz', 'get', '/readyz', setup=readiness.refresh),
+    Scenario('metrics', 'get', '/metrics'),
+    Scenario('contact.submit', 'post', '/api/contact/submit/',
+             lambda: submit_payload('/api/contact/submit/'), expected=(201,)),
+    Scenario('contact.bulk', 'post', '/api/contact/bulk/',
+             _bulk('/api/contact/submit/', 50), user='user', expected=(201,)),
+    Scenario('contact.export', 'get', '/api/contact/export/', params={'format': 'csv'}, user='staff'),
+    Scenario('consultation.schedule', 'post', '/api/consultation/schedule/',
+             lambda: submit_payload('/api/consultation/schedule/'), expected=(201,)),
+    Scenario('consultation.export', 'get', '/api/consultation/export/', params={'format': 'ndjson'}, user='staff'),
+    Scenario('consultation.availability', 'get', '/api/consultation/availability/'),
+    Scenario('support.submit', 'post', '/api/support/submit/',
+             lambda: submit_payload('/api/support/submit/'), expected=(201,)),
+    Scenario('support.tickets', 'get', '/api/support/tickets/'),
+    Scenario('support.tickets.filtered', 'get', '/api/support/tickets/',
+             params={'priority': 'high,critical', 'status': 'open', 'fields': 'id,subject,priority,created_at'}),
+    Scenario('support.tickets.search', 'get', '/api/support/tickets/', params={'q': 'checkout gateway'}),
+    Scenario('support.tickets.sync', 'get', '/api/support/tickets/sync/'),
+    Scenario('support.bulk', 'post', '/api/support/bulk/',
+             _bulk('/api/support/submit/', 50), user='user', expected=(201,)),
+    Scenario('support.export', 'get', '/api/support/export/', params={'format': 'csv'}, user='staff'),
+    Scenario('stats', 'get', '/api/stats/', user='staff'),
+    Scenario('inbox', 'get', '/api/inbox/', params={'type': 'ticket,contact'}, user='staff'),
+    Scenario('admin.tickets', 'get', '/admin/support/supportticket/', user='staff'),
+]
+
+
+# Model behind each submit endpoint, for seeding the read scenarios.
+SUBMIT_MODELS = {
+    '/api/contact/submit/': 'contact.Contact',
+    '/api/support/submit/': 'support.SupportTicket',
+    '/api/consultation/schedule/': 'consultation.Consultation',
+}
+
+
+def seed_rows(count, batch_size=1000):
+    """Insert ``count`` rows per submission table from the sample payloads."""
+    for path, label in SUBMIT_MODELS.items():
+        model = apps.get_model(label)
+        model.objects.bulk_create(
+            (model(**submit_payload(path)) for _ in range(count)), batch_size=batch_size
+        )
+
+
+def benchmark_users():
+    """The ``'user'`` and ``'staff'`` accounts scenarios log in as."""
+    user, _ = User.objects.get_or_create(username='benchmark-user')
+    staff, _ = User.objects.get_or_create(
+        username='benchmark-staff', defaults={'is_staff': True, 'is_superuser': True}
+    )
+    return {'user': user, 'staff': staff}
+
+
+def run_scenario(scenario, requests, concurrency=1, warmup=5, users=None):
+    """Issue ``requests`` requests for ``scenario`` from ``concurrency`` threads."""
+    users = users or {}
+    latencies, errors = [], [0]
+    remaining = itertools.count()
+    lock = threading.Lock()
+    ready = threading.Barrier(concurrency + 1)
+
+    def worker():
+        client = Client()
+        if scenario.user:
+            client.force_login(users[scenario.user])
+        try:
+            ready.wait()
+            while next(remaining) < requests:
+                started = time.perf_counter()
+                try:
+                    ok = scenario.request(client) in scenario.expected
+                except Exception:
+                    ok = False
+                elapsed = time.perf_counter() - started
+                with lock:
+                    latencies.append(elapsed)
+                    errors[0] += not ok
+        finally:
+            connection.close()
+
+    if scenario.setup:
+        scenario.setup()
+    warm = Client()
+    if scenario.user:
+        warm.force_login(users[scenario.user])
+    for _ in range(warmup):
+        scenario.request(warm)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    ready.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return LatencyStats(scenario.name, latencies, time.perf_counter() - started, errors[0], concurrency)
+
+
+def compare(baseline, current, threshold=0.10):
+    """Yield ``(name, metric, before, after)`` for results that got worse than ``threshold``.
+
+    Both arguments are lists of ``LatencyStats.to_dict()`` payloads, e.g. the
+    ``--json`` output of two benchmark runs.
+    """
+    before = {(result['name'], result['concurrency']): result for result in baseline}
+    for result in current:
+        old = before.get((result['name'], result['concurrency']))
+        if old is None:
+            continue
+        for metric in ('p50_ms', 'p95_ms', 'p99_ms'):
+            if old[metric] and result[metric] > old[metric] * (1 + threshold):
+                yield result['name'], metric, old[metric], result[metric]
+        if old['throughput_rps'] and result['throughput_rps'] < old['throughput_rps'] * (1 - threshold):
+            yield result['name'], 'throughput_rps', old['throughput_rps'], result['throughput_rps']
@@ -0,0 +1,86 @@
+"""
+Bulk ingestion shared by the ``/bulk/`` submission endpoints.
+
+A batch is validated with ``many=True``, every valid item is inserted with a
+single ``bulk_create`` and one digest notification is queued for the whole
+batch, all in one transaction. Once it commits, every new record is
+announced on the live event stream like a single submission. Invalid items are reported per index and do
+not block the rest of the batch.
+"""
+
+from django.conf import settings
+from django.db import transaction
+from rest_framework import status
+from rest_framework.response import Response
+
+from events import broker as events
+from jevelon_backend import caching
+from notifications import outbox
+from stats import rollups
+
+
+def bulk_submit(request, serializer_class, digest_subject, digest_line, event_type):
+    """Validate and insert a list of submissions from ``request.data``.
+
+    ``digest_subject(count)`` and ``digest_line(instance)`` build the single
+    admin email sent for the batch; each record is published as an
+    ``event_type`` event.
+    """
+    items = request.data
+    if not isinstance(items, list):
+        return Response({
+            'success': False,
+            'error': 'Expected a JSON array or an NDJSON body'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    if len(items) > settings.BULK_SUBMIT_MAX_ITEMS:
+        return Response({
+            'success': False,
+            'error': f'At most {settings.BULK_SUBMIT_MAX_ITEMS} items per request'
+        }, status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+    serializer = serializer_class(data=items, many=True)
+    if serializer.is_valid():
+        validated = list(enumerate(serializer.validated_data))
+        errors = {}
+    else:
+        # Keep the valid items; only re-run validation for them.
+        errors = {index: error for index, error in enumerate(serializer.errors) if error}
+        child = serializer.child
+        validated = [(index, child.run_validation(item)) for index, item in enumerate(items) if index not in errors]
+
+    model = serializer_class.Meta.model
+    instances = []
+    if validated:
+        with transaction.atomic():
+            instances = model.objects.bulk_create([model(**data) for _, data in validated])
+            # bulk_create sends no post_save.
+            rollups.record(model, instances)
+            caching.invalidate(model)
+            body = '\n'.join(digest_line(instance) for instance in instances)
+            outbox.enqueue(instances, [
+                outbox.email(
+                    subject=digest_subject(len(instances)),
+                    body=body,
+                    recipients=[settings.ADMIN_EMAIL],
+                ),
+            ])
+            events.publish_many(event_type, serializer_class(instances, many=True).data)
+
+    created = {index: instance.pk for (index, _), instance in zip(validated, instances)}
+    results = [
+        {'index': index, 'success': True, 'id': created[index]} if index in created
+        else {'index': index, 'success': False, 'errors': errors[index]}
+        for index in range(len(items))
+    ]
+    if not errors:
+        response_status = status.HTTP_201_CREATED
+    elif created:
+        response_status = status.HTTP_207_MULTI_STATUS
+    else:
+        response_status = status.HTTP_400_BAD_REQUEST
+    return Response({
+        'success': not errors,
+        'created': len(created),
+        'failed': len(errors),
+        'results': results
+    }, status=response_status)
@@ -0,0 +1,91 @@
+"""
+Cached reads that writes invalidate.
+
+Every watched model has a version token in the default cache, and a cached
+read stores its result under the versions of the models it depends on.
+Any save or delete of one of those models - the submit views, the admin,
+``bulk_create`` through ``invalidate`` - replaces the token once the
+transaction commits, so the next read misses and recomputes; entries
+under old tokens are never read again and simply expire. Nothing has to
+enumerate or delete stale keys, which a shared store could not do cheaply.
+
+The default cache is set by ``CACHE_URL``; the gunicorn configs point it at
+a directory all workers share, so a read cached by one worker serves them
+all and survives ``max_requests`` recycling. ``API_CACHE_TIMEOUT`` bounds
+staleness after writes that skip signals (``QuerySet.update``, raw SQL).
+"""
+
+import hashlib
+import secrets
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from .metrics import CACHE_LOOKUPS
+
+
+def _version_key(model):
+    return f'cache-version:{model._meta.label_lower}'
+
+
+def _token():
+    # A fresh random token rather than incr(): an evicted counter restarting
+    # at 1 could revive old entries, and incr() is not atomic on every backend.
+    return secrets.token_hex(8)
+
+
+def versions(models):
+    """The current version token of each of ``models``."""
+    keys = [_version_key(model) for model in models]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            cache.add(key, _token(), None)
+            found[key] = cache.get(key)
+    return [found[key] for key in keys]
+
+
+def invalidate(model):
+    """Retire every cached read of ``model`` once the current transaction commits."""
+    transaction.on_commit(lambda: cache.set(_version_key(model), _token(), None))
+
+
+def _invalidate_instance(sender, raw=False, **kwargs):
+    if not raw:
+        invalidate(sender)
+
+
+def watch(*models):
+    """Invalidate cached reads of ``models`` on every save and delete."""
+    for model in models:
+        post_save.connect(_invalidate_instance, sender=model, dispatch_uid=f'caching:{model._meta.label_lower}:save')
+        post_delete.connect(_invalidate_instance, sender=model, dispatch_uid=f'caching:{model._meta.label_lower}:delete')
+
+
+def cached(namespace, models, key, compute, timeout=None):
+    """``compute()``'s result for ``key``, reused until one of ``models`` changes.
+
+    Returns ``(value, hit)``. Exceptions from ``compute`` propagate and
+    nothing is cached.
+    """
+    # Versions are read before computing: a write committing meanwhile
+    # bumps them again, so a result that missed it is never served.
+    tokens = versions(models)
+    digest = hashlib.sha256(repr((key, tokens)).encode()).hexdigest()
+    cache_key = f'cached:{namespace}:{digest}'
+    value = cache.get(cache_key)
+    if value is not None:
+        CACHE_LOOKUPS.labels(namespace, 'hit').inc()
+        return value, True
+    CACHE_LOOKUPS.labels(namespace, 'miss').inc()
+    value = compute()
+    cache.set(cache_key, value, settings.API_CACHE_TIMEOUT if timeout is None else timeout)
+    return value, False
+
+
+def request_key(request):
+    """Everything about a GET request that can change its response."""
+    # Paginated responses embed absolute next links, hence the host.
+    return request.get_host(), request.path, sorted(request.query_params.lists())
@@ -0,0 +1,129 @@
+"""
+Streaming CSV / NDJSON exports of the submission tables.
+
+Rows are read with ``values_list().iterator(chunk_size=...)`` and written to
+a ``StreamingHttpResponse`` as they arrive, so memory use stays flat no
+matter how many rows match. The format is picked by DRF content negotiation
+(``?format=csv``/``?format=ndjson`` or the ``Accept`` header) and the body
+is gzip-compressed when the client sends ``Accept-Encoding: gzip``. Error
+responses (bad filters, missing permissions) are rendered in the negotiated
+format too.
+"""
+
+import csv
+import io
+import zlib
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.cache import patch_vary_headers
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+# Rows are grouped into roughly this many bytes per chunk written to the socket.
+FLUSH_BYTES = 64 * 1024
+
+
+def _error_rows(data, field=''):
+    if isinstance(data, dict):
+        for key, value in data.items():
+            yield from _error_rows(value, f'{field}.{key}' if field else key)
+    elif isinstance(data, list):
+        for item in data:
+            yield from _error_rows(item, field)
+    else:
+        yield field, str(data)
+
+
+class CSVRenderer(BaseRenderer):
+    """Renders error payloads as ``field,error`` rows; exports bypass it."""
+
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(['field', 'error'])
+        writer.writerows(_error_rows(data))
+        return buffer.getvalue().encode(self.charset)
+
+
+class NDJSONRenderer(BaseRenderer):
+    """Renders error payloads as a single JSON line; exports bypass it."""
+
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return JSONRenderer().render(data) + b'\n'
+
+
+EXPORT_RENDERERS = [CSVRenderer, NDJSONRenderer]
+
+
+class _Echo:
+    """File-like object whose ``write`` hands the written line back."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_lines(columns, rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow([value.isoformat() if hasattr(value, 'isoformat') else value for value in row])
+
+
+def _ndjson_lines(columns, rows):
+    encoder = DjangoJSONEncoder(ensure_ascii=False, separators=(',', ':'))
+    for row in rows:
+        yield encoder.encode(dict(zip(columns, row))) + '\n'
+
+
+def _chunked(lines):
+    buffer, size = [], 0
+    for line in lines:
+        encoded = line.encode('utf-8')
+        buffer.append(encoded)
+        size += len(encoded)
+        if size >= FLUSH_BYTES:
+            yield b''.join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield b''.join(buffer)
+
+
+def _gzipped(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 -> gzip container
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def export_response(request, queryset, columns, name):
+    """Stream ``columns`` of every row in ``queryset``, newest first."""
+    renderer = request.accepted_renderer
+    rows = queryset.order_by('-created_at', '-id').values_list(*columns).iterator(
+        chunk_size=settings.EXPORT_CHUNK_SIZE
+    )
+    lines = _csv_lines(columns, rows) if renderer.format == 'csv' else _ndjson_lines(columns, rows)
+    body = _chunked(lines)
+
+    gzip = 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', '')
+    if gzip:
+        body = _gzipped(body)
+
+    response = StreamingHttpResponse(body, content_type=f'{renderer.media_type}; charset=utf-8')
+    filename = f'{name}-{timezone.localdate():%Y%m%d}.{renderer.format}'
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    if gzip:
+        response['Content-Encoding'] = 'gzip'
+    patch_vary_headers(response, ['Accept', 'Accept-Encoding'])
+    return response
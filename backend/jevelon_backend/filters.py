@@ -0,0 +1,79 @@
+"""
+Query-string filtering shared by the listing and export endpoints.
+
+Filters mirror the admin ``list_filter`` options: exact (or comma-separated)
+values for choice fields, ``true``/``false`` for boolean fields and a
+``created_after`` / ``created_before`` date range.
+"""
+
+from datetime import datetime, time
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+
+BOOLEAN_VALUES = {'true': True, '1': True, 'false': False, '0': False}
+
+
+def parse_bound(value, end_of_day=False):
+    """Parse an ISO date or datetime into an aware datetime, ``None`` if invalid."""
+    try:
+        parsed = parse_datetime(value)
+        if parsed is None:
+            day = parse_date(value)
+            if day is None:
+                return None
+            parsed = datetime.combine(day, time.max if end_of_day else time.min)
+    except ValueError:  # well formed but impossible, e.g. 2026-02-30
+        return None
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def filter_queryset(queryset, params, fields=(), boolean_fields=(), date_field='created_at'):
+    """Apply the supported query-string filters in ``params`` to ``queryset``.
+
+    Raises ``ValidationError`` for unknown choice values or unparsable dates so
+    callers can answer with a 400 instead of silently returning everything.
+    """
+    model = queryset.model
+    errors = {}
+
+    for name in fields:
+        raw = params.get(name)
+        if not raw:
+            continue
+        values = [value for value in raw.split(',') if value]
+        choices = {key for key, _ in model._meta.get_field(name).flatchoices}
+        invalid = [value for value in values if choices and value not in choices]
+        if invalid:
+            errors[name] = [f'"{value}" is not a valid choice.' for value in invalid]
+            continue
+        queryset = queryset.filter(**{f'{name}__in': values})
+
+    for name in boolean_fields:
+        raw = params.get(name)
+        if raw is None:
+            continue
+        if raw.lower() not in BOOLEAN_VALUES:
+            errors[name] = ['Must be true or false.']
+            continue
+        queryset = queryset.filter(**{name: BOOLEAN_VALUES[raw.lower()]})
+
+    for param, lookup, end_of_day in (
+        ('created_after', 'gte', False),
+        ('created_before', 'lte', True),
+    ):
+        raw = params.get(param)
+        if not raw:
+            continue
+        bound = parse_bound(raw, end_of_day=end_of_day)
+        if bound is None:
+            errors[param] = ['Enter a valid date or datetime.']
+            continue
+        queryset = queryset.filter(**{f'{date_field}__{lookup}': bound})
+
+    if errors:
+        raise ValidationError(errors)
+    return queryset
@@ -0,0 +1,149 @@
+"""
+Liveness and readiness probes.
+
+``/livez`` answers from a constant and never touches the database, so it
+stays cheap and truthful even when the database is slow. ``/readyz`` serves
+the last result of a database/email probe that a background thread per
+worker process refreshes every ``HEALTH_CHECK_INTERVAL`` seconds; request
+threads only ever return pre-rendered bytes, so health traffic cannot pile
+up behind a slow dependency.
+"""
+
+import json
+import logging
+import os
+import socket
+import threading
+import time
+
+from django.conf import settings
+from django.core.mail.backends.smtp import EmailBackend as SMTPEmailBackend
+from django.db import connection
+from django.http import HttpResponse
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from django.views.decorators.http import require_safe
+
+logger = logging.getLogger(__name__)
+
+LIVE_BODY = b'{"status":"ok"}'
+INDEX_BODY = json.dumps({
+    'status': 'ok',
+    'message': 'Jevelon Backend is running',
+    'endpoints': {
+        'admin': '/admin/',
+        'contact': '/api/contact/submit/',
+        'support': '/api/support/submit/',
+        'consultation': '/api/consultation/schedule/',
+        'liveness': '/livez',
+        'readiness': '/readyz',
+    },
+}).encode()
+
+
+def _json_response(body, status=200):
+    response = HttpResponse(body, status=status, content_type='application/json')
+    response['Cache-Control'] = 'no-store'
+    return response
+
+
+def check_database():
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        return 'ok'
+    except Exception as e:
+        return f'error: {e}'
+    finally:
+        # The probe thread should not hold a connection between runs.
+        connection.close()
+
+
+def email_endpoint():
+    """``(host, port)`` the configured email backend delivers to, if it uses the network."""
+    backend = import_string(settings.EMAIL_BACKEND)
+    if issubclass(backend, SMTPEmailBackend):
+        return settings.EMAIL_HOST, settings.EMAIL_PORT
+    if getattr(backend, 'host', None):
+        return backend.host, 443
+    return None
+
+
+def check_email():
+    endpoint = email_endpoint()
+    if endpoint is None:
+        return 'skipped'
+    try:
+        socket.create_connection(endpoint, timeout=settings.HEALTH_CHECK_TIMEOUT).close()
+        return 'ok'
+    except OSError as e:
+        return f'error: {e}'
+
+
+class ReadinessProbe:
+    """Runs the dependency checks off the request path and caches the response.
+
+    Only the database gates readiness: notifications wait in the outbox
+    while the email provider is unreachable, so an email failure is
+    reported but does not take the instance out of rotation.
+    """
+
+    def __init__(self, interval=None):
+        self.interval = interval
+        self.result = 503, json.dumps({'status': 'starting'}).encode()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+
+    def refresh(self):
+        checks = {'database': check_database(), 'email': check_email()}
+        ready = checks['database'] == 'ok'
+        body = json.dumps({
+            'status': 'ready' if ready else 'unavailable',
+            'checks': checks,
+            'checked_at': timezone.now().isoformat(),
+        }).encode()
+        # One attribute, so readers never see a status paired with another run's body.
+        self.result = (200 if ready else 503), body
+
+    def ensure_running(self):
+        """Start the refresh thread in this process (again after a fork)."""
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='readiness-probe', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception('Readiness probe failed')
+            time.sleep(self.interval or settings.HEALTH_CHECK_INTERVAL)
+
+    def response(self):
+        self.ensure_running()
+        status, body = self.result
+        return _json_response(body, status)
+
+
+readiness = ReadinessProbe()
+
+
+@require_safe
+def livez(request):
+    return _json_response(LIVE_BODY)
+
+
+@require_safe
+def readyz(request):
+    return readiness.response()
+
+
+@require_safe
+def index(request):
+    return _json_response(INDEX_BODY)
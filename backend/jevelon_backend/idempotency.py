@@ -0,0 +1,102 @@
+"""
+Duplicate suppression for the submit endpoints.
+
+A submission is identified by its ``Idempotency-Key`` header or, without
+one, by a hash of the fields that make it a duplicate (``dedup_fields`` on
+the view: the email plus subject/message or booked slot). The first
+request claims the key in the ``idempotency`` cache; once it has been
+answered with 201 that response is stored under the key, and every replay -
+a double click, a client retry - gets the stored response back without
+touching the database or queuing another email. Header keys are kept for
+``IDEMPOTENCY_KEY_TTL`` seconds, content hashes for ``IDEMPOTENCY_WINDOW``.
+
+The cache alias is bounded (``MAX_ENTRIES``) and expiring; the gunicorn
+configs point it at a directory shared by all workers.
+"""
+
+import hashlib
+import json
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.cache import caches
+
+HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+PENDING = 'pending'
+
+Outcome = namedtuple('Outcome', ['status', 'body', 'replayed'])
+
+IN_PROGRESS = Outcome(409, {
+    'success': False,
+    'error': 'An identical request is already being processed.',
+}, False)
+KEY_REUSED = Outcome(422, {
+    'success': False,
+    'error': f'{HEADER} was already used for a different request.',
+}, False)
+
+
+class InvalidKey(ValueError):
+    pass
+
+
+def _digest(value):
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _normalize(value):
+    return ' '.join(str(value).split()).lower()
+
+
+class Claim:
+    """One request's hold on its idempotency key."""
+
+    def __init__(self, key, fingerprint, ttl):
+        self.key = key
+        self.fingerprint = fingerprint
+        self.ttl = ttl
+        self.store = caches['idempotency']
+
+    def begin(self):
+        """Claim the key; return the ``Outcome`` to answer with if it is already taken."""
+        pending = {'state': PENDING, 'fingerprint': self.fingerprint}
+        for _ in range(2):
+            if self.store.add(self.key, pending, settings.IDEMPOTENCY_LOCK_TIMEOUT):
+                return None
+            entry = self.store.get(self.key)
+            if entry is None:
+                # Expired between add() and get(); try once more.
+                continue
+            if entry['fingerprint'] != self.fingerprint:
+                return KEY_REUSED
+            if entry['state'] == PENDING:
+                return IN_PROGRESS
+            return Outcome(entry['status'], entry['body'], True)
+        return IN_PROGRESS
+
+    def finish(self, status, body):
+        """Keep a successful response for replays; release the key otherwise."""
+        if status == 201:
+            entry = {'state': 'done', 'fingerprint': self.fingerprint, 'status': status, 'body': body}
+            self.store.set(self.key, entry, self.ttl)
+        else:
+            self.store.delete(self.key)
+
+
+def claim(request, data, path, fields):
+    """The ``Claim`` for a submission, or ``None`` when nothing identifies it.
+
+    Raises ``InvalidKey`` for an unusable ``Idempotency-Key`` header.
+    """
+    header = request.headers.get(HEADER)
+    if header is not None:
+        if not header or len(header) > MAX_KEY_LENGTH:
+            raise InvalidKey(f'{HEADER} must be 1 to {MAX_KEY_LENGTH} characters.')
+        return Claim(f'idempotency:{path}:key:{_digest(header)}', _digest(data), settings.IDEMPOTENCY_KEY_TTL)
+
+    if not fields or not hasattr(data, 'get') or not data.get('email'):
+        return None
+    content = [_normalize(data.get(field, '')) for field in fields]
+    fingerprint = _digest(content)
+    return Claim(f'idempotency:{path}:content:{fingerprint}', fingerprint, settings.IDEMPOTENCY_WINDOW)
@@ -0,0 +1,200 @@
+"""
+Structured, non-blocking logging.
+
+Request threads only format a record as one JSON line and drop it on an
+in-memory queue (``AsyncLogHandler``); a listener thread per process does
+the console and file I/O, with size- or time-based rotation. Every record
+carries the ``request_id`` of the request that caused it - including the
+outbox worker's delivery logs, which restore the id stored on the entry -
+so one grep follows a submission from the POST to the email.
+"""
+
+import contextlib
+import json
+import logging
+import os
+import queue
+import random
+import re
+import sys
+import time
+import traceback
+import uuid
+import zlib
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, TimedRotatingFileHandler
+
+from asgiref.sync import iscoroutinefunction
+from django.utils.decorators import sync_and_async_middleware
+
+access_logger = logging.getLogger('jevelon_backend.access')
+
+_request_id = ContextVar('request_id', default='')
+
+# Accept a caller's X-Request-ID only if it is a short, log-safe token.
+REQUEST_ID_PATTERN = re.compile(r'^[A-Za-z0-9._-]{1,64}$')
+
+# Attributes every LogRecord has; anything else came in through ``extra=``.
+_RECORD_FIELDS = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime', 'request_id'}
+
+
+def get_request_id():
+    return _request_id.get()
+
+
+@contextlib.contextmanager
+def bind_request_id(request_id):
+    """Attribute log records emitted inside the block to ``request_id``."""
+    token = _request_id.set(request_id or '')
+    try:
+        yield
+    finally:
+        _request_id.reset(token)
+
+
+@sync_and_async_middleware
+def RequestIDMiddleware(get_response):
+    """Tag the request (and its response) with an id and log one access line.
+
+    A well-formed incoming ``X-Request-ID`` (e.g. from the load balancer or
+    frontend) is kept so logs line up across services.
+    """
+
+    def start(request):
+        incoming = request.headers.get('X-Request-ID', '')
+        request.request_id = incoming if REQUEST_ID_PATTERN.match(incoming) else uuid.uuid4().hex
+        return _request_id.set(request.request_id), time.perf_counter()
+
+    def finish(request, response, token, started):
+        response['X-Request-ID'] = request.request_id
+        access_logger.info('%s %s %s', request.method, request.path, response.status_code, extra={
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'duration_ms': round((time.perf_counter() - started) * 1000, 2),
+        })
+        _request_id.reset(token)
+        return response
+
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            token, started = start(request)
+            return finish(request, await get_response(request), token, started)
+    else:
+        def middleware(request):
+            token, started = start(request)
+            return finish(request, get_response(request), token, started)
+    return middleware
+
+
+class RequestIDFilter(logging.Filter):
+    def filter(self, record):
+        record.request_id = _request_id.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keep ``rate`` of INFO-and-below records; warnings and errors always pass.
+
+    The decision is made per request id, so a sampled request keeps all of
+    its lines instead of a random subset.
+    """
+
+    def __init__(self, rate=1.0):
+        super().__init__()
+        self.rate = float(rate)
+
+    def filter(self, record):
+        if self.rate >= 1 or record.levelno > logging.INFO:
+            return True
+        request_id = _request_id.get()
+        if request_id:
+            return zlib.crc32(request_id.encode()) % 10_000 < self.rate * 10_000
+        return random.random() < self.rate
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line: timestamp, level, logger, message, context."""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'request_id': getattr(record, 'request_id', '') or _request_id.get(),
+            'process': record.process,
+        }
+        entry.update({key: value for key, value in vars(record).items() if key not in _RECORD_FIELDS})
+        if record.exc_info:
+            entry['exc_info'] = ''.join(traceback.format_exception(*record.exc_info))
+        return json.dumps(entry, default=str)
+
+
+class AsyncLogHandler(QueueHandler):
+    """Formats in the caller's thread, writes from a background listener.
+
+    Writes to stdout if ``console`` is set and, if ``filename`` is set, to a file rotated at
+    ``max_bytes`` or, when ``when`` is given, on that schedule (see
+    ``TimedRotatingFileHandler``). ``{pid}`` in ``filename`` gives every
+    worker process its own file, so processes never rotate each other's.
+    The queue is bounded; when it is full new records are dropped and
+    counted rather than blocking the request.
+    """
+
+    def __init__(self, filename='', max_bytes=10 * 1024 * 1024, backup_count=5, when='', console=False,
+                 queue_size=10_000):
+        super().__init__(queue.Queue(queue_size))
+        self.filename = filename
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.when = when
+        self.console = console
+        self.queue_size = queue_size
+        self.dropped = 0
+        self._listener = None
+        self._pid = None
+
+    def _targets(self):
+        targets = []
+        if self.console:
+            targets.append(logging.StreamHandler(sys.stdout))
+        if self.filename:
+            path = self.filename.format(pid=os.getpid())
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            if self.when:
+                targets.append(TimedRotatingFileHandler(path, when=self.when, backupCount=self.backup_count))
+            else:
+                targets.append(RotatingFileHandler(path, maxBytes=self.max_bytes, backupCount=self.backup_count))
+        for target in targets:
+            # Records arrive already rendered by this handler's formatter.
+            target.setFormatter(logging.Formatter('%(message)s'))
+        return targets
+
+    def _ensure_listener(self):
+        # Listener threads do not survive fork (gunicorn preload), so every
+        # process starts its own on first use.
+        if self._pid == os.getpid():
+            return
+        with self.lock:
+            if self._pid == os.getpid():
+                return
+            self.queue = queue.Queue(self.queue_size)
+            self._listener = QueueListener(self.queue, *self._targets())
+            self._listener.start()
+            self._pid = os.getpid()
+
+    def enqueue(self, record):
+        self._ensure_listener()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        # Called by logging.shutdown() at exit: flush what is still queued.
+        if self._listener is not None and self._pid == os.getpid():
+            self._listener.stop()
+            self._pid = None
+        super().close()
@@ -0,0 +1,180 @@
+"""
+Prometheus metrics for requests, database work and email delivery.
+
+Under gunicorn every worker is a separate process, so the metrics are kept
+in ``prometheus_client``'s multiprocess mode: each process writes its
+samples to mmap-ed files in ``PROMETHEUS_MULTIPROC_DIR`` (set up by
+``gunicorn.conf.py``) and ``/metrics`` sums them, whichever worker answers
+the scrape. Without that variable, e.g. under ``runserver``, the in-process
+registry is served instead.
+"""
+
+import functools
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import connection
+from django.http import HttpResponse
+from django.utils.crypto import constant_time_compare
+from django.utils.decorators import sync_and_async_middleware
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+from prometheus_client import multiprocess
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+REQUESTS = Counter(
+    'jevelon_http_requests_total', 'HTTP requests served', ['route', 'method', 'status'],
+)
+REQUEST_LATENCY = Histogram(
+    'jevelon_http_request_duration_seconds', 'Time to produce a response', ['route', 'method'],
+    buckets=LATENCY_BUCKETS,
+)
+DB_QUERIES = Histogram(
+    'jevelon_db_queries_per_request', 'Database queries issued per request', ['route'],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+DB_TIME = Histogram(
+    'jevelon_db_time_per_request_seconds', 'Time spent in database queries per request', ['route'],
+    buckets=LATENCY_BUCKETS,
+)
+EMAIL_LATENCY = Histogram(
+    'jevelon_email_send_duration_seconds', 'Time to hand one message to the email backend', ['backend'],
+    buckets=LATENCY_BUCKETS,
+)
+EMAIL_FAILURES = Counter(
+    'jevelon_email_send_failures_total', 'Messages the email backend failed to send', ['backend'],
+)
+CACHE_LOOKUPS = Counter(
+    'jevelon_cache_lookups_total', 'Cached read lookups by outcome (hit or miss)', ['namespace', 'result'],
+)
+
+
+# Metrics without labels open their multiprocess files as soon as they are
+# created, so these are created on first use rather than at import, which
+# may happen before PROMETHEUS_MULTIPROC_DIR exists.
+@functools.cache
+def event_subscribers():
+    return Gauge(
+        'jevelon_event_stream_subscribers', 'Open event stream connections', multiprocess_mode='livesum',
+    )
+
+
+@functools.cache
+def event_overflows():
+    return Counter(
+        'jevelon_event_stream_overflows_total', 'Event streams closed for falling too far behind',
+    )
+
+
+class QueryTimer:
+    """``connection.execute_wrapper`` that counts and times every query."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - started
+
+
+# The running async request's QueryTimer. ``execute_wrapper`` only wraps the
+# connection of the thread that installs it, and sync_to_async work runs on
+# another thread, so that work attaches the timer itself (``counting_queries``).
+_current_queries = ContextVar('current_queries', default=None)
+
+
+def counting_queries(func):
+    """Wrap ``func`` for ``sync_to_async`` so its queries count toward the request's metrics."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        queries = _current_queries.get()
+        if queries is None:
+            return func(*args, **kwargs)
+        with connection.execute_wrapper(queries):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def _route(request):
+    match = getattr(request, 'resolver_match', None)
+    # The URL pattern, never the raw path, so label cardinality stays bounded.
+    return (match.route or match.view_name) if match else '<unmatched>'
+
+
+def _record(request, status, started, queries):
+    route = _route(request)
+    REQUESTS.labels(route, request.method, str(status)).inc()
+    REQUEST_LATENCY.labels(route, request.method).observe(time.perf_counter() - started)
+    DB_QUERIES.labels(route).observe(queries.count)
+    DB_TIME.labels(route).observe(queries.duration)
+
+
+@sync_and_async_middleware
+def MetricsMiddleware(get_response):
+    """Record count, latency and database work for every request.
+
+    Sync- and async-capable so the async submit views stay async under ASGI.
+    """
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            queries, started = QueryTimer(), time.perf_counter()
+            status = 500
+            token = _current_queries.set(queries)
+            try:
+                with connection.execute_wrapper(queries):
+                    response = await get_response(request)
+                status = response.status_code
+                return response
+            finally:
+                _current_queries.reset(token)
+                _record(request, status, started, queries)
+    else:
+        def middleware(request):
+            queries, started = QueryTimer(), time.perf_counter()
+            status = 500
+            try:
+                with connection.execute_wrapper(queries):
+                    response = get_response(request)
+                status = response.status_code
+                return response
+            finally:
+                _record(request, status, started, queries)
+    return middleware
+
+
+@contextmanager
+def timed_email_send(backend):
+    """Time one send through ``backend`` and count it if it raises."""
+    label = f'{type(backend).__module__}.{type(backend).__name__}'
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        EMAIL_FAILURES.labels(label).inc()
+        raise
+    finally:
+        EMAIL_LATENCY.labels(label).observe(time.perf_counter() - started)
+
+
+def registry():
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        collector = CollectorRegistry()
+        multiprocess.MultiProcessCollector(collector)
+        return collector
+    return REGISTRY
+
+
+def metrics(request):
+    token = settings.METRICS_TOKEN
+    if token and not constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return HttpResponse(status=401)
+    return HttpResponse(generate_latest(registry()), content_type=CONTENT_TYPE_LATEST)
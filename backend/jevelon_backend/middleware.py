@@ -0,0 +1,51 @@
+"""
+Site-only variants of the middleware the API does not need.
+
+The JSON API (and the health/metrics probes) never uses a session, a
+message, a template or Django's CSRF middleware - DRF views are
+CSRF-exempt and do their own check for session-authenticated requests.
+Each class here is the stock middleware, except that requests under one
+of ``SLIM_MIDDLEWARE_PREFIXES`` go straight to the next layer, so an API
+request skips the session/cookie bookkeeping, the lazy user, the message
+storage and the extra response headers. ``/admin/`` and everything else
+keep the full stack. Staff can still use their admin session on the API
+through ``jevelon_backend.authentication.SessionAuthentication``.
+"""
+
+from django.conf import settings
+from django.contrib.auth.middleware import AuthenticationMiddleware as StockAuthenticationMiddleware
+from django.contrib.messages.middleware import MessageMiddleware as StockMessageMiddleware
+from django.contrib.sessions.middleware import SessionMiddleware as StockSessionMiddleware
+from django.middleware.clickjacking import XFrameOptionsMiddleware as StockXFrameOptionsMiddleware
+from django.middleware.csrf import CsrfViewMiddleware as StockCsrfViewMiddleware
+
+
+def is_slim(request):
+    return request.path_info.startswith(tuple(settings.SLIM_MIDDLEWARE_PREFIXES))
+
+
+def site_only(middleware_class):
+    """Subclass ``middleware_class`` to step aside for ``SLIM_MIDDLEWARE_PREFIXES`` paths."""
+
+    def __call__(self, request):
+        # Works in async mode too: get_response() then returns the awaitable.
+        if is_slim(request):
+            return self.get_response(request)
+        return middleware_class.__call__(self, request)
+
+    attrs = {'__call__': __call__, '__module__': __name__, '__qualname__': middleware_class.__name__}
+    if hasattr(middleware_class, 'process_view'):
+        def process_view(self, request, view_func, view_args, view_kwargs):
+            if is_slim(request):
+                return None
+            return middleware_class.process_view(self, request, view_func, view_args, view_kwargs)
+
+        attrs['process_view'] = process_view
+    return type(middleware_class.__name__, (middleware_class,), attrs)
+
+
+SessionMiddleware = site_only(StockSessionMiddleware)
+CsrfViewMiddleware = site_only(StockCsrfViewMiddleware)
+AuthenticationMiddleware = site_only(StockAuthenticationMiddleware)
+MessageMiddleware = site_only(StockMessageMiddleware)
+XFrameOptionsMiddleware = site_only(StockXFrameOptionsMiddleware)
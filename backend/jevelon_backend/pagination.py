@@ -0,0 +1,252 @@
+"""
+Keyset (cursor) pagination for the submission listing endpoints.
+
+Pages are ordered by ``(created_at, id)`` descending and each page starts
+strictly after the last row of the previous one, so fetching page N costs the
+same as fetching page 1 instead of scanning and discarding N * page_size rows
+the way ``OFFSET`` does. Search results page the same way on
+``(search_rank, id)``, delta sync ascending on ``(updated_at, id)`` and the
+inbox across several tables on ``(created_at, source, id)``.
+"""
+
+import base64
+import binascii
+import heapq
+import itertools
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.utils.urls import replace_query_param
+
+
+def _pack(key, pk):
+    return base64.urlsafe_b64encode(f'{key}|{pk}'.encode()).decode().rstrip('=')
+
+
+def _unpack(cursor, parse_key, param='cursor'):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        key, pk = base64.urlsafe_b64decode(padded).decode().split('|')
+        position = parse_key(key), int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        position = None, None
+    if position[0] is None:
+        raise ValidationError({param: ['Invalid cursor.']})
+    return position
+
+
+def encode_cursor(created_at, pk):
+    return _pack(created_at.isoformat(), pk)
+
+
+def decode_cursor(cursor):
+    """Return the ``(created_at, id)`` position encoded in ``cursor``."""
+    return _unpack(cursor, parse_datetime)
+
+
+def after_position(created_at, pk):
+    """Rows that sort after ``(created_at, pk)`` in newest-first order.
+
+    Written as a range on ``created_at`` plus a tie-breaker exclusion rather
+    than ``created_at < x OR (created_at = x AND id < y)``, because planners
+    can only turn the former into an index range scan.
+    """
+    return Q(created_at__lte=created_at) & ~Q(created_at=created_at, pk__gte=pk)
+
+
+def after_merged_position(source, position):
+    """Rows of ``source`` that sort after ``position`` in a newest-first merged stream.
+
+    ``position`` is ``(created_at, source name, pk)``; rows of different
+    sources with equal timestamps are ordered by source name, descending.
+    """
+    created_at, last_source, pk = position
+    if source == last_source:
+        return after_position(created_at, pk)
+    if source < last_source:
+        return Q(created_at__lte=created_at)
+    return Q(created_at__lt=created_at)
+
+
+def _parse_merged_key(key):
+    created_at, _, source = key.partition(' ')
+    created_at = parse_datetime(created_at)
+    return (created_at, source) if created_at and source else None
+
+
+def changed_since(updated_at, pk):
+    """Rows that sort after ``(updated_at, pk)`` in oldest-change-first order."""
+    return Q(updated_at__gte=updated_at) & ~Q(updated_at=updated_at, pk__lte=pk)
+
+
+class KeysetPagination(BasePagination):
+    """Paginate newest first on ``(created_at, id)`` with a bounded page size."""
+
+    page_size = 50
+    max_page_size = 200
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+
+    def get_page_size(self, request):
+        value = request.query_params.get(self.page_size_query_param)
+        if value is None:
+            return self.page_size
+        try:
+            size = int(value)
+        except ValueError:
+            raise ValidationError({self.page_size_query_param: ['A valid integer is required.']})
+        if size < 1:
+            raise ValidationError({self.page_size_query_param: ['Must be at least 1.']})
+        return min(size, self.max_page_size)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        size = self.get_page_size(request)
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            created_at, pk = decode_cursor(cursor)
+            queryset = queryset.filter(after_position(created_at, pk))
+
+        # Fetch one extra row to learn whether another page exists.
+        rows = list(queryset.order_by('-created_at', '-pk')[:size + 1])
+        self.has_next = len(rows) > size
+        rows = rows[:size]
+        self.next_cursor = encode_cursor(rows[-1].created_at, rows[-1].pk) if self.has_next else None
+        return rows
+
+    def get_next_link(self):
+        if self.next_cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_data(self, data, key='results'):
+        return {
+            'success': True,
+            key: data,
+            'next_cursor': self.next_cursor,
+            'next': self.get_next_link(),
+        }
+
+
+class RankedPagination(KeysetPagination):
+    """Paginate full-text matches best first on ``(search_rank, id)``.
+
+    The queryset must be annotated with ``search_rank`` (see
+    ``FullTextIndex.search``). ``repr`` keeps the float exact, so the next
+    page starts precisely after the last row even when ranks tie.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        size = self.get_page_size(request)
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            rank, pk = _unpack(cursor, float)
+            queryset = queryset.filter(Q(search_rank__lt=rank) | Q(search_rank=rank, pk__lt=pk))
+
+        rows = list(queryset.order_by('-search_rank', '-pk')[:size + 1])
+        self.has_next = len(rows) > size
+        rows = rows[:size]
+        self.next_cursor = _pack(repr(rows[-1].search_rank), rows[-1].pk) if self.has_next else None
+        return rows
+
+
+class WatermarkPagination(KeysetPagination):
+    """Page through the rows created or changed since a watermark, oldest change first.
+
+    The watermark is the ``(updated_at, id)`` position of the last row sent,
+    so rows sharing a timestamp are never skipped or repeated across pages.
+    ``updated_at`` comes from the saving worker's clock and a row only
+    becomes visible when its transaction commits, so a row can appear behind
+    a watermark that was already handed out. The last page therefore never
+    moves the watermark past ``SYNC_SETTLE_SECONDS`` ago: recent changes are
+    sent again on the next poll, and clients apply rows by ``id``.
+    """
+
+    page_size = 200
+    max_page_size = 1000
+    cursor_query_param = 'since'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        size = self.get_page_size(request)
+        since = request.query_params.get(self.cursor_query_param)
+        position = None
+        if since:
+            position = _unpack(since, parse_datetime, self.cursor_query_param)
+            queryset = queryset.filter(changed_since(*position))
+        # Taken before the query, so anything saved later is past it.
+        horizon = (timezone.now() - timedelta(seconds=settings.SYNC_SETTLE_SECONDS), 0)
+
+        rows = list(queryset.order_by('updated_at', 'pk')[:size + 1])
+        self.has_next = len(rows) > size
+        rows = rows[:size]
+        if rows:
+            position = rows[-1].updated_at, rows[-1].pk
+        if not self.has_next:
+            position = min(position, horizon) if position else horizon
+        self.next_cursor = _pack(position[0].isoformat(), position[1])
+        return rows
+
+    def get_paginated_data(self, data, key='results'):
+        return {
+            'success': True,
+            key: data,
+            'watermark': self.next_cursor,
+            'has_more': self.has_next,
+            'next': self.get_next_link(),
+        }
+
+
+class MergedPagination(KeysetPagination):
+    """Paginate several querysets newest first as one stream.
+
+    ``paginate_sources`` takes ``{name: queryset}`` and returns the page as
+    ``(name, row)`` pairs ordered on ``(created_at, name, id)`` descending.
+    Each source contributes at most ``page_size + 1`` ``(created_at, id)``
+    keys after the cursor, read from its ``(-created_at, -id)`` index; the
+    sorted key lists are merged and only the rows that made the page are
+    then loaded, one query per source. No table is read beyond a page's
+    worth of keys, however deep the cursor.
+    """
+
+    def paginate_sources(self, sources, request):
+        self.request = request
+        size = self.get_page_size(request)
+        cursor = request.query_params.get(self.cursor_query_param)
+        position = None
+        if cursor:
+            (created_at, source), pk = _unpack(cursor, _parse_merged_key)
+            position = created_at, source, pk
+
+        streams = []
+        for name, queryset in sources.items():
+            if position:
+                queryset = queryset.filter(after_merged_position(name, position))
+            keys = queryset.order_by('-created_at', '-pk').values_list('created_at', 'pk')[:size + 1]
+            streams.append([(created_at, name, pk) for created_at, pk in keys])
+        keys = list(itertools.islice(heapq.merge(*streams, reverse=True), size + 1))
+        self.has_next = len(keys) > size
+        keys = keys[:size]
+        if self.has_next:
+            created_at, name, pk = keys[-1]
+            self.next_cursor = _pack(f'{created_at.isoformat()} {name}', pk)
+        else:
+            self.next_cursor = None
+
+        wanted = {}
+        for _, name, pk in keys:
+            wanted.setdefault(name, []).append(pk)
+        rows = {
+            (name, row.pk): row
+            for name, pks in wanted.items()
+            for row in sources[name].filter(pk__in=pks)
+        }
+        # A row deleted since its key was read is left out.
+        return [(name, rows[name, pk]) for _, name, pk in keys if (name, pk) in rows]
@@ -0,0 +1,53 @@
+"""
+Request parsers used alongside (or instead of) DRF's ``JSONParser``.
+"""
+
+import codecs
+import io
+import json
+
+import orjson
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+
+UTF8 = {'utf-8', 'utf8'}
+
+
+class NDJSONParser(BaseParser):
+    """Parses newline-delimited JSON into a list, one object per line."""
+
+    media_type = 'application/x-ndjson'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        items = []
+        for number, line in enumerate(codecs.getreader(encoding)(stream), start=1):
+            if not line.strip():
+                continue
+            try:
+                items.append(json.loads(line))
+            except ValueError as exc:
+                raise ParseError(f'NDJSON parse error on line {number} - {exc}')
+        return items
+
+
+class ORJSONParser(JSONParser):
+    """``JSONParser`` on orjson, for the opt-in ``FAST_PATH``.
+
+    Anything orjson rejects - malformed JSON, NaN, integers beyond 64 bits -
+    is re-parsed by the stock parser, so such bodies get exactly the
+    result or ``ParseError`` message they always did.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        body = stream.read()
+        if encoding.lower() in UTF8:
+            try:
+                return orjson.loads(body)
+            except orjson.JSONDecodeError:
+                pass
+        return super().parse(io.BytesIO(body), media_type, parser_context)
@@ -0,0 +1,31 @@
+"""
+orjson-backed ``JSONRenderer`` for the opt-in ``FAST_PATH``.
+
+Produces the same bytes as DRF's renderer for everything the API returns:
+compact separators, raw UTF-8, ``\\u2028``/``\\u2029`` escaped, non-string
+keys stringified. Dates, times, decimals and lazy strings are handed to
+DRF's own encoder so they keep its formatting; anything orjson refuses
+(integers beyond 64 bits) and indented output go through the stock
+renderer. Floats are the one difference - orjson spells ``1e16`` where
+``json`` writes ``1e+16`` - and no response carries one.
+"""
+
+import orjson
+from rest_framework.renderers import JSONRenderer
+
+OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+class ORJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=OPTIONS)
+        except (TypeError, orjson.JSONEncodeError):
+            return super().render(data, accepted_media_type, renderer_context)
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
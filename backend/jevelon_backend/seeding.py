@@ -0,0 +1,277 @@
+"""
+Synthetic submission rows for performance testing.
+
+Each generator yields unsaved model instances whose field distributions
+follow real traffic: most tickets are low/medium, recent tickets are still
+open while old ones are resolved or closed, submissions cluster in
+business hours and grow towards the present, and message lengths are
+log-normal. Output depends only on the seed and the ``until`` date, so two
+runs with the same arguments produce the same rows.
+"""
+
+import random
+from contextlib import contextmanager
+from datetime import datetime, time, timedelta
+from itertools import islice
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from consultation import availability
+from consultation.models import TIME_SLOTS, Consultation
+from contact.models import Contact
+from jevelon_backend import caching
+from stats import rollups
+from support.models import SupportTicket
+
+FIRST_NAMES = [
+    'Aarav', 'Aditi', 'Ananya', 'Arjun', 'Asha', 'Deepak', 'Divya', 'Emma', 'Farhan', 'Gaurav',
+    'Isha', 'James', 'Kavya', 'Liam', 'Meera', 'Mohit', 'Neha', 'Nikhil', 'Olivia', 'Pooja',
+    'Priya', 'Rahul', 'Ravi', 'Rohan', 'Sara', 'Sneha', 'Tanvi', 'Varun', 'Vikram', 'Zoya',
+]
+LAST_NAMES = [
+    'Agarwal', 'Bose', 'Chopra', 'Das', 'Fernandes', 'Gupta', 'Iyer', 'Jain', 'Kapoor', 'Khan',
+    'Kumar', 'Mehta', 'Menon', 'Nair', 'Patel', 'Rao', 'Reddy', 'Saini', 'Shah', 'Sharma',
+    'Singh', 'Smith', 'Thomas', 'Verma', 'Williams',
+]
+EMAIL_DOMAINS = ['gmail.com', 'outlook.com', 'yahoo.com', 'company.in', 'startup.io', 'example.org']
+COMPANIES = ['', '', '', 'Acme Retail', 'Bluefin Labs', 'Northwind', 'Pixel Forge', 'Quantum Foods', 'Zenith Health']
+
+CONTACT_SERVICES = (
+    ['web-development', 'mobile-app-development', 'frontend-development', 'backend-development',
+     'digital-marketing', 'consulting', 'other'],
+    [30, 22, 10, 10, 12, 8, 8],
+)
+PROJECT_TYPES = (
+    ['web-development', 'mobile-app', 'ecommerce', 'saas-platform', 'digital-marketing', 'consulting', 'other'],
+    [28, 24, 16, 12, 8, 7, 5],
+)
+TICKET_PRIORITIES = (['low', 'medium', 'high', 'critical'], [35, 40, 18, 7])
+TICKET_CATEGORIES = (['bug', 'feature', 'performance', 'security', 'other'], [40, 20, 15, 5, 20])
+TICKET_SUBJECTS = {
+    'bug': ['Login fails', 'Checkout page crashes', 'Images not loading', 'Form does not submit', 'Wrong totals'],
+    'feature': ['Add dark mode', 'Export to Excel', 'Bulk upload', 'Multi-language support', 'SSO login'],
+    'performance': ['Dashboard is slow', 'Search takes too long', 'App freezes on launch', 'Timeouts at peak'],
+    'security': ['Suspicious login attempts', 'Password reset issue', 'Vulnerability report'],
+    'other': ['Billing question', 'Account deletion', 'General enquiry', 'Invoice request'],
+}
+# Ticket status mix by age: fresh tickets are open, old ones are done.
+TICKET_STATUSES = ['open', 'in_progress', 'resolved', 'closed']
+TICKET_STATUS_BY_AGE = [(2, [70, 25, 5, 0]), (14, [30, 30, 30, 10]), (None, [5, 5, 40, 50])]
+
+# Share of traffic per hour of day (IST business hours peak).
+HOUR_WEIGHTS = [1, 1, 1, 1, 1, 2, 3, 5, 8, 12, 14, 14, 12, 12, 13, 13, 12, 10, 8, 6, 5, 4, 2, 1]
+WEEKDAY_WEIGHTS = [16, 17, 17, 16, 15, 10, 9]
+
+WORDS = (
+    'we need help with our website and mobile app the page loads slowly when many users sign in '
+    'please advise on pricing timeline and next steps our team would like a demo of the dashboard '
+    'customers report errors during checkout after the latest release the issue happens on chrome '
+    'and safari we expect traffic to grow this quarter and want to plan capacity accordingly'
+).split()
+# Messages are slices of one fixed pseudo-random text, so building a row
+# costs one random offset instead of a random draw per word.
+CORPUS = ' '.join(random.Random(0).choices(WORDS, k=40000))
+
+
+@contextmanager
+def historical_timestamps(model):
+    """Let ``bulk_create`` store the ``created_at``/``updated_at`` values given."""
+    fields = [field for field in model._meta.concrete_fields if getattr(field, 'auto_now_add', False)
+              or getattr(field, 'auto_now', False)]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class Generator:
+    """Shared distributions; subclasses build one model's rows."""
+
+    model = None
+
+    def __init__(self, seed=42, days=730, until=None):
+        # A per-model stream, so adding one model's rows never shifts another's.
+        self.rng = random.Random(f'{seed}:{self.model._meta.label}')
+        self.days = days
+        until = until or timezone.localdate()
+        self.until = timezone.make_aware(datetime.combine(until + timedelta(days=1), time.min))
+        self.sequence = 0
+
+    def __iter__(self):
+        while True:
+            self.sequence += 1
+            yield self.build()
+
+    def pick(self, choices):
+        values, weights = choices
+        return self.rng.choices(values, weights)[0]
+
+    def created_at(self):
+        """Recent days are busier (growth), weekdays and office hours more so."""
+        rng = self.rng
+        while True:
+            day = self.until - timedelta(days=1 + int(self.days * rng.betavariate(1, 1.6)))
+            if rng.random() * 17 < WEEKDAY_WEIGHTS[day.weekday()]:
+                break
+        hour = rng.choices(range(24), HOUR_WEIGHTS)[0]
+        return day + timedelta(hours=hour, seconds=rng.randrange(3600), microseconds=rng.randrange(10 ** 6))
+
+    def person(self):
+        first, last = self.rng.choice(FIRST_NAMES), self.rng.choice(LAST_NAMES)
+        email = f'{first}.{last}{self.sequence}@{self.rng.choice(EMAIL_DOMAINS)}'.lower()
+        return f'{first} {last}', email
+
+    def text(self, median, low=20, high=5000):
+        """Log-normally distributed prose around ``median`` characters."""
+        length = max(low, min(high, int(self.rng.lognormvariate(0, 0.8) * median)))
+        start = CORPUS.find(' ', self.rng.randrange(len(CORPUS) - high - 100)) + 1
+        return CORPUS[start:start + length].capitalize()
+
+    def email_sent(self, created_at):
+        # Nearly everything older than a few minutes has been notified.
+        return created_at < self.until - timedelta(minutes=5) and self.rng.random() > 0.005
+
+    def build(self):
+        raise NotImplementedError
+
+    def clear(self):
+        """Delete every existing row in one statement.
+
+        ``QuerySet.delete()`` would load each row to send its delete signals.
+        """
+        table = connection.ops.quote_name(self.model._meta.db_table)
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(f'DELETE FROM {table}')
+            rollups.rebuild(self.model)
+
+    def finish(self):
+        """Bring derived data up to date after the rows were bulk-inserted.
+
+        Daily counts are recorded batch by batch, in the inserting transaction.
+        """
+        caching.invalidate(self.model)
+
+
+class ContactGenerator(Generator):
+    model = Contact
+
+    def build(self):
+        name, email = self.person()
+        created_at = self.created_at()
+        return self.model(
+            name=name,
+            email=email,
+            service=self.pick(CONTACT_SERVICES),
+            message=self.text(300),
+            created_at=created_at,
+            email_sent=self.email_sent(created_at),
+        )
+
+
+class ConsultationGenerator(Generator):
+    model = Consultation
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Slots already held by an active booking, including those from earlier
+        # runs; a clash is recorded as cancelled.
+        self.held = set(
+            Consultation.objects.filter(status__in=Consultation.ACTIVE_STATUSES)
+            .values_list('preferred_date', 'preferred_time')
+        )
+
+    def build(self):
+        name, email = self.person()
+        created_at = self.created_at()
+        preferred_date = created_at.date() + timedelta(days=self.rng.randint(1, 21))
+        if preferred_date.weekday() >= 5:
+            preferred_date += timedelta(days=7 - preferred_date.weekday())
+        if preferred_date < self.until.date():
+            status = self.rng.choices(['completed', 'cancelled', 'pending'], [80, 15, 5])[0]
+        else:
+            status = self.rng.choices(['pending', 'confirmed', 'cancelled'], [60, 35, 5])[0]
+        preferred_time = self.rng.choice(TIME_SLOTS)
+        if status in Consultation.ACTIVE_STATUSES:
+            if (preferred_date, preferred_time) in self.held:
+                status = 'cancelled'
+            else:
+                self.held.add((preferred_date, preferred_time))
+        return self.model(
+            name=name,
+            email=email,
+            phone=f'+91 9{self.rng.randrange(10 ** 9):09d}' if self.rng.random() < 0.7 else '',
+            company=self.rng.choice(COMPANIES),
+            project_type=self.pick(PROJECT_TYPES),
+            preferred_date=preferred_date,
+            preferred_time=preferred_time,
+            additional_notes=self.text(200) if self.rng.random() < 0.6 else '',
+            status=status,
+            created_at=created_at,
+            email_sent=self.email_sent(created_at),
+        )
+
+    def clear(self):
+        super().clear()
+        self.held.clear()
+
+    def finish(self):
+        # bulk_create skips the signals that maintain the availability index.
+        super().finish()
+        availability.rebuild()
+
+
+class SupportTicketGenerator(Generator):
+    model = SupportTicket
+
+    def build(self):
+        name, email = self.person()
+        created_at = self.created_at()
+        category = self.pick(TICKET_CATEGORIES)
+        age = (self.until - created_at).days
+        weights = next(weights for limit, weights in TICKET_STATUS_BY_AGE if limit is None or age < limit)
+        status = self.rng.choices(TICKET_STATUSES, weights)[0]
+        updated_at = created_at
+        if status != 'open':
+            updated_at = min(created_at + timedelta(hours=self.rng.expovariate(1 / 30)), self.until)
+        return self.model(
+            name=name,
+            email=email,
+            priority=self.pick(TICKET_PRIORITIES),
+            category=category,
+            subject=self.rng.choice(TICKET_SUBJECTS[category]),
+            message=self.text(400),
+            status=status,
+            created_at=created_at,
+            updated_at=updated_at,
+            email_sent=self.email_sent(created_at),
+        )
+
+
+GENERATORS = {
+    'contacts': ContactGenerator,
+    'consultations': ConsultationGenerator,
+    'tickets': SupportTicketGenerator,
+}
+
+
+def seed(generator, count, batch_size=5000):
+    """Insert ``count`` rows from ``generator`` in ``batch_size`` chunks; yield running totals."""
+    model = generator.model
+    rows = iter(generator)
+    inserted = 0
+    with historical_timestamps(model):
+        while inserted < count:
+            batch = list(islice(rows, min(batch_size, count - inserted)))
+            with transaction.atomic():
+                model.objects.bulk_create(batch, batch_size=batch_size)
+                rollups.record(model, batch)
+            inserted += len(batch)
+            if inserted == count:
+                generator.finish()
+            yield inserted
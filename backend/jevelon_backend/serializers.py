@@ -0,0 +1,93 @@
+"""
+Serializer helpers shared by the submission apps.
+"""
+
+from django.conf import settings
+from rest_framework.exceptions import ValidationError
+from rest_framework.serializers import BaseSerializer
+
+
+class ProjectableSerializerMixin:
+    """Restrict a serializer's output to the field names passed as ``fields=``."""
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class PrecompiledFieldsMixin:
+    """Validate submissions with fields built once per class, under ``FAST_PATH``.
+
+    A ``ModelSerializer`` introspects its model and instantiates every field
+    the first time each instance touches ``.fields`` - most of the cost of
+    validating a small form. With the mixin, new-record validation runs
+    DRF's own ``to_internal_value`` over the writable fields of one shared
+    prototype instead, so the accepted input, ``validated_data`` and error
+    payloads are exactly the stock ones. Serializers with validators,
+    read-only defaults, context-dependent defaults or nested/many-to-many
+    fields keep the stock path, as do updates and partial validation.
+    """
+
+    @classmethod
+    def compiled_fields(cls):
+        """The prototype's writable fields, or ``None`` if the class cannot share them."""
+        if '_compiled_fields' not in cls.__dict__:
+            # The prototype itself validates the stock way.
+            cls._compiled_fields = None
+            prototype = cls()
+            fields = [field for field in prototype.fields.values() if not field.read_only]
+            shareable = (
+                not prototype.get_validators()
+                and not prototype._read_only_defaults()
+                and not any(isinstance(field, BaseSerializer) for field in fields)
+                and not any(getattr(field.default, 'requires_context', False) for field in fields)
+                and not cls.Meta.model._meta.many_to_many
+            )
+            cls._compiled_fields = fields if shareable else None
+        return cls._compiled_fields
+
+    @property
+    def _precompiled(self):
+        if not settings.FAST_PATH or self.instance is not None or self.partial:
+            return None
+        return self.compiled_fields()
+
+    @property
+    def _writable_fields(self):
+        compiled = self._precompiled
+        return compiled if compiled is not None else super()._writable_fields
+
+    def run_validators(self, value):
+        # Shareable serializers have no validators to run.
+        if self._precompiled is None:
+            super().run_validators(value)
+
+    def create(self, validated_data):
+        if self._precompiled is None:
+            return super().create(validated_data)
+        # ModelSerializer.create minus the nested-write check, which would build the fields.
+        return self.Meta.model._default_manager.create(**validated_data)
+
+
+def requested_fields(request, serializer_class, param='fields'):
+    """Return the validated ``?fields=a,b`` projection, or None for all fields."""
+    raw = request.query_params.get(param)
+    if not raw:
+        return None
+    fields = [name for name in raw.split(',') if name]
+    allowed = serializer_class.Meta.fields
+    unknown = [name for name in fields if name not in allowed]
+    if unknown:
+        raise ValidationError({param: [f'Unknown field "{name}".' for name in unknown]})
+    return fields
+
+
+def only_columns(queryset, fields, always=('id', 'created_at')):
+    """Defer every column not needed for ``fields`` (plus the cursor columns)."""
+    if fields is None:
+        return queryset
+    concrete = {field.name for field in queryset.model._meta.concrete_fields}
+    return queryset.only(*{name for name in (*always, *fields) if name in concrete})
@@ -12,6 +12,8 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 
 from pathlib import Path
 import os
+import sys
+import tempfile
 import dj_database_url
 from decouple import config
 
@@ -45,19 +47,30 @@ INSTALLED_APPS = [
     'contact',
     'consultation',
     'support',
+    'notifications',
+    'stats',
+    'events',
+    'inbox',
 ]
 
 MIDDLEWARE = [
+    'jevelon_backend.metrics.MetricsMiddleware',
+    'jevelon_backend.logs.RequestIDMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
+    # The stock session, CSRF, auth, messages and clickjacking middleware, skipped
+    # for SLIM_MIDDLEWARE_PREFIXES (see jevelon_backend/middleware.py).
+    'jevelon_backend.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
-    'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'django.contrib.messages.middleware.MessageMiddleware',
-    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'jevelon_backend.middleware.CsrfViewMiddleware',
+    'jevelon_backend.middleware.AuthenticationMiddleware',
+    'jevelon_backend.middleware.MessageMiddleware',
+    'jevelon_backend.middleware.XFrameOptionsMiddleware',
 ]
 
+# Paths served without the session/CSRF/auth/messages/clickjacking middleware.
+SLIM_MIDDLEWARE_PREFIXES = ['/api/', '/livez', '/readyz', '/metrics']
+
 ROOT_URLCONF = 'jevelon_backend.urls'
 
 TEMPLATES = [
@@ -78,6 +91,10 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'jevelon_backend.wsgi.application'
 
+# Route the submit endpoints to their native async views; set by the ASGI
+# (uvicorn worker) gunicorn profile in gunicorn_asgi.conf.py.
+ASYNC_SUBMIT_VIEWS = config('ASYNC_SUBMIT_VIEWS', default=False, cast=bool)
+
 
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
@@ -92,6 +109,14 @@ DATABASES = {
         conn_health_checks=True,
     )
 }
+if DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3':
+    # Writers wait for each other instead of failing with "database is locked"
+    # (see jevelon_backend/sqlite3/base.py).
+    DATABASES['default']['ENGINE'] = 'jevelon_backend.sqlite3'
+    DATABASES['default'].setdefault('OPTIONS', {})['timeout'] = config('SQLITE_BUSY_TIMEOUT', default=20, cast=int)
+    # A file, not the shared in-memory database, so tests can write from
+    # several threads the way concurrent requests do.
+    DATABASES['default']['TEST'] = {'NAME': os.path.join(tempfile.gettempdir(), f'jevelon-test-{os.getpid()}.sqlite3')}
 
 
 # Password validation
@@ -165,40 +190,109 @@ CORS_ALLOW_HEADERS = [
     'user-agent',
     'x-csrftoken',
     'x-requested-with',
+    'idempotency-key',
 ]
 
 # Additional security headers
 CORS_EXPOSE_HEADERS = [
     'content-type',
     'content-length',
+    'idempotent-replayed',
 ]
 
 # CORS preflight cache time (in seconds)
 CORS_PREFLIGHT_MAX_AGE = 86400  # 24 hours
 
 # REST Framework settings
+# Opt-in fast path for the JSON API: orjson parsing and rendering, and submission
+# serializers that reuse fields built once per class. Responses and error payloads are unchanged.
+FAST_PATH = config('FAST_PATH', default=False, cast=bool)
+
 REST_FRAMEWORK = {
+    'DEFAULT_AUTHENTICATION_CLASSES': [
+        'jevelon_backend.authentication.SessionAuthentication',
+        'rest_framework.authentication.BasicAuthentication',
+    ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
     ],
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'jevelon_backend.renderers.ORJSONRenderer' if FAST_PATH else 'rest_framework.renderers.JSONRenderer',
     ],
     'DEFAULT_PARSER_CLASSES': [
-        'rest_framework.parsers.JSONParser',
+        'jevelon_backend.parsers.ORJSONParser' if FAST_PATH else 'rest_framework.parsers.JSONParser',
     ],
 }
 
+# Largest batch accepted by the /bulk/ submission endpoints
+BULK_SUBMIT_MAX_ITEMS = config('BULK_SUBMIT_MAX_ITEMS', default=500, cast=int)
+
+# Delta sync: changes younger than this many seconds are sent again on the next poll,
+# covering clock skew between workers and transactions that commit late
+SYNC_SETTLE_SECONDS = config('SYNC_SETTLE_SECONDS', default=5.0, cast=float)
+
+# Live event stream (/api/events/, ASGI only). LocalBackend reaches the subscribers of
+# the publishing process only; with several workers use events.backends.DatabaseBackend.
+EVENTS_BACKEND = config('EVENTS_BACKEND', default='events.backends.LocalBackend')
+# Events kept for clients resuming with Last-Event-ID, and how long the database keeps them
+EVENTS_HISTORY_SIZE = config('EVENTS_HISTORY_SIZE', default=1000, cast=int)
+EVENTS_RETENTION_SECONDS = config('EVENTS_RETENTION_SECONDS', default=3600, cast=int)
+# Events a subscriber may fall behind before its stream is closed (it then resumes)
+EVENTS_QUEUE_SIZE = config('EVENTS_QUEUE_SIZE', default=100, cast=int)
+EVENTS_MAX_SUBSCRIBERS = config('EVENTS_MAX_SUBSCRIBERS', default=5000, cast=int)
+EVENTS_HEARTBEAT_SECONDS = config('EVENTS_HEARTBEAT_SECONDS', default=15.0, cast=float)
+EVENTS_POLL_INTERVAL = config('EVENTS_POLL_INTERVAL', default=0.5, cast=float)
+EVENTS_RETRY_MS = 3000
+
+# Readiness probe: seconds between background dependency checks, and per-check timeout
+HEALTH_CHECK_INTERVAL = config('HEALTH_CHECK_INTERVAL', default=15, cast=int)
+HEALTH_CHECK_TIMEOUT = 2
+
+# Bearer token required to scrape /metrics (open when empty)
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+
+# Longest date range one /api/consultation/availability/ request may cover
+CONSULTATION_AVAILABILITY_MAX_DAYS = 92
+
+# Admin changelists count exactly up to this many rows, then use the planner's estimate
+ADMIN_EXACT_COUNT_LIMIT = config('ADMIN_EXACT_COUNT_LIMIT', default=10000, cast=int)
+# Seconds admin filter facet counts are served from the cache
+ADMIN_FACET_CACHE_TIMEOUT = config('ADMIN_FACET_CACHE_TIMEOUT', default=300, cast=int)
+
+# Rows fetched per database round trip by the streaming export endpoints
+EXPORT_CHUNK_SIZE = 2000
+
 # Email settings (for SendGrid)
-EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+# Use 'notifications.backends.SendGridAPIEmailBackend' to send over the HTTP API.
+EMAIL_BACKEND = config('EMAIL_BACKEND', default='notifications.backends.PooledSMTPEmailBackend')
 EMAIL_HOST = 'smtp.sendgrid.net'
 EMAIL_PORT = 587
 EMAIL_USE_TLS = True
+EMAIL_TIMEOUT = 10
+SENDGRID_API_KEY = config('SENDGRID_API_KEY', default='')
 EMAIL_HOST_USER = 'apikey'
-EMAIL_HOST_PASSWORD = config('SENDGRID_API_KEY', default='')
+EMAIL_HOST_PASSWORD = SENDGRID_API_KEY
+EMAIL_POOL_MAX_AGE = 300  # seconds before a pooled connection is recycled
+EMAIL_POOL_IDLE_CHECK = 30  # idle seconds after which a NOOP probe precedes reuse
 DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='hello@jevelon.com')
 ADMIN_EMAIL = config('ADMIN_EMAIL', default='admin@jevelon.com')
 
+# Email outbox (drained by `python manage.py process_outbox`)
+EMAIL_OUTBOX_BATCH_SIZE = config('EMAIL_OUTBOX_BATCH_SIZE', default=50, cast=int)
+EMAIL_OUTBOX_POLL_INTERVAL = config('EMAIL_OUTBOX_POLL_INTERVAL', default=5.0, cast=float)
+EMAIL_OUTBOX_MAX_ATTEMPTS = config('EMAIL_OUTBOX_MAX_ATTEMPTS', default=8, cast=int)
+EMAIL_OUTBOX_BACKOFF_BASE = 30  # seconds, doubled on every failed attempt
+EMAIL_OUTBOX_BACKOFF_MAX = 3600  # 1 hour
+EMAIL_OUTBOX_LEASE_SECONDS = 300  # claimed entries become due again after this
+# Seconds admin notifications of each kind wait to go out as one digest per
+# admin; kinds not listed (critical and high tickets, consultations) are sent at once.
+EMAIL_DIGEST_WINDOWS = {
+    'medium': config('EMAIL_DIGEST_WINDOW_MEDIUM', default=300, cast=int),
+    'low': config('EMAIL_DIGEST_WINDOW_LOW', default=1800, cast=int),
+    'contact': config('EMAIL_DIGEST_WINDOW_CONTACT', default=900, cast=int),
+}
+EMAIL_DIGEST_MAX_ITEMS = config('EMAIL_DIGEST_MAX_ITEMS', default=50, cast=int)  # a fuller digest goes out early
+
 # Security settings for production
 if not DEBUG:
     SECURE_BROWSER_XSS_FILTER = True
@@ -216,34 +310,96 @@ else:
     SECURE_CONTENT_TYPE_NOSNIFF = True
     X_FRAME_OPTIONS = 'DENY'
 
-# Cache settings (for production)
-CACHES = {
-    'default': {
+# Idempotent submits: a repeated Idempotency-Key within IDEMPOTENCY_KEY_TTL seconds, or
+# the same content without one within IDEMPOTENCY_WINDOW, gets the first response back.
+# IDEMPOTENCY_CACHE_DIR (set by the gunicorn configs) shares the keys between workers.
+IDEMPOTENCY_KEY_TTL = config('IDEMPOTENCY_KEY_TTL', default=86400, cast=int)
+IDEMPOTENCY_WINDOW = config('IDEMPOTENCY_WINDOW', default=120, cast=int)
+IDEMPOTENCY_LOCK_TIMEOUT = 30  # seconds a claimed key waits for its first response
+IDEMPOTENCY_CACHE_DIR = config('IDEMPOTENCY_CACHE_DIR', default='')
+
+# Default cache, shared by all gunicorn workers (see jevelon_backend/caching.py).
+# CACHE_URL is file:///some/dir for a directory on local disk or redis://host:port/db for any
+# Redis-protocol server (needs the redis package); empty keeps a per-process LocMemCache.
+CACHE_URL = config('CACHE_URL', default='')
+# Seconds a cached API read is kept; writes invalidate it sooner
+API_CACHE_TIMEOUT = config('API_CACHE_TIMEOUT', default=300, cast=int)
+
+if CACHE_URL.startswith(('redis://', 'rediss://', 'unix://')):
+    DEFAULT_CACHE = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': CACHE_URL,
+    }
+elif CACHE_URL.startswith('file://'):
+    DEFAULT_CACHE = {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': CACHE_URL[len('file://'):],
+        'OPTIONS': {'MAX_ENTRIES': 20000, 'CULL_FREQUENCY': 4},
+    }
+else:
+    DEFAULT_CACHE = {
         'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
         'LOCATION': 'unique-snowflake',
     }
+
+# Cache settings (for production)
+CACHES = {
+    'default': DEFAULT_CACHE,
+    'idempotency': {
+        'BACKEND': (
+            'django.core.cache.backends.filebased.FileBasedCache' if IDEMPOTENCY_CACHE_DIR
+            else 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': IDEMPOTENCY_CACHE_DIR or 'idempotency',
+        'TIMEOUT': IDEMPOTENCY_KEY_TTL,
+        'OPTIONS': {'MAX_ENTRIES': 20000, 'CULL_FREQUENCY': 4},
+    },
 }
 
-# Logging configuration
+# Logging: JSON lines written off the request thread (see jevelon_backend/logs.py).
+# By default they go to stdout. LOG_FILE writes them to a file instead; give it a
+# {pid} (e.g. /var/log/jevelon/django-{pid}.log) so gunicorn workers never rotate
+# each other's file, and keep it outside the source tree. LOG_CONSOLE=True writes to
+# stdout as well. LOG_ROTATE_WHEN (e.g. "midnight") switches from size- to
+# time-based rotation. LOG_SAMPLE_RATE keeps that share of INFO-level requests.
+# Test runs log nowhere; tests that check log output attach their own handlers.
+TESTING = sys.argv[1:2] == ['test']
+LOG_LEVEL = config('LOG_LEVEL', default='INFO')
+LOG_FILE = '' if TESTING else config('LOG_FILE', default='')
+LOG_CONSOLE = not TESTING and config('LOG_CONSOLE', default=not LOG_FILE, cast=bool)
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
     'formatters': {
-        'verbose': {
-            'format': '{levelname} {asctime} {module} {process:d} {thread:d} {message}',
-            'style': '{',
+        'json': {
+            '()': 'jevelon_backend.logs.JSONFormatter',
+        },
+    },
+    'filters': {
+        'request_id': {
+            '()': 'jevelon_backend.logs.RequestIDFilter',
+        },
+        'sampling': {
+            '()': 'jevelon_backend.logs.SamplingFilter',
+            'rate': config('LOG_SAMPLE_RATE', default=1.0, cast=float),
         },
     },
     'handlers': {
-        'file': {
-            'level': 'INFO',
-            'class': 'logging.FileHandler',
-            'filename': 'django.log',
-            'formatter': 'verbose',
+        'async': {
+            'level': LOG_LEVEL,
+            'class': 'jevelon_backend.logs.AsyncLogHandler',
+            'filename': LOG_FILE,
+            'max_bytes': config('LOG_MAX_BYTES', default=10 * 1024 * 1024, cast=int),
+            'backup_count': config('LOG_BACKUP_COUNT', default=5, cast=int),
+            'when': config('LOG_ROTATE_WHEN', default=''),
+            'console': LOG_CONSOLE,
+            'formatter': 'json',
+            'filters': ['request_id', 'sampling'],
         },
     },
     'root': {
-        'handlers': ['file'],
-        'level': 'INFO',
+        'handlers': ['async'],
+        'level': LOG_LEVEL,
     },
 }
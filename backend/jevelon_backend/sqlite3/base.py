@@ -0,0 +1,23 @@
+"""
+SQLite backend whose transactions take the write lock when they begin.
+
+Django starts transactions with a plain (DEFERRED) ``BEGIN``: a submission
+reads under a shared lock - the idempotency and availability checks, the
+rollup's stored key - and only asks for the write lock at its first write.
+When two requests do that at once, each holds a lock the other needs, so
+SQLite fails one of them straight away with "database is locked" instead
+of letting it wait out the busy timeout. The more a submission writes (the
+record, its full-text index rows, the stats rollup, the outbox entry), the
+more often that happens. ``BEGIN IMMEDIATE`` takes the write lock up front,
+so concurrent writers queue on the busy timeout (``OPTIONS['timeout']``)
+and readers are not affected.
+
+Django 5.1 offers the same as ``OPTIONS['transaction_mode']``.
+"""
+
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def _start_transaction_under_autocommit(self):
+        self.cursor().execute('BEGIN IMMEDIATE')
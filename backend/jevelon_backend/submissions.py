@@ -0,0 +1,228 @@
+"""
+The validate -> persist -> notify pipeline behind every public submit endpoint.
+
+Subclasses set ``serializer_class`` and implement ``get_messages`` (the
+notification emails for a saved record), optionally ``get_digest`` to let
+them wait for an admin digest; everything else - the single
+INSERT, queuing the notification in the same transaction, duplicate
+suppression and the response envelope - lives here once instead of in each
+app's views.
+"""
+
+import io
+import logging
+
+from asgiref.sync import sync_to_async
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.permissions import AllowAny
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from django.conf import settings
+from django.db import transaction
+from django.http import HttpResponse
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+
+from events import broker as events
+from notifications import outbox
+from . import idempotency
+from .metrics import counting_queries
+from .parsers import ORJSONParser
+from .renderers import ORJSONRenderer
+
+logger = logging.getLogger(__name__)
+
+
+class SubmissionConflict(Exception):
+    """Raised while saving when the submission clashes with existing state.
+
+    Rolls the save back and is answered with 409 and ``errors`` in the same
+    shape as validation errors.
+    """
+
+    def __init__(self, errors):
+        super().__init__(errors)
+        self.errors = errors
+
+
+class SubmissionView(APIView):
+    """Base view for ``POST`` endpoints that store a form submission.
+
+    The hot path issues exactly one INSERT for the record plus one for its
+    outbox entry; ``email_sent`` is set later by the outbox worker with a
+    single-column UPDATE, so the record row is never written twice.
+    """
+
+    permission_classes = [AllowAny]
+    serializer_class = None
+    success_message = 'Submitted successfully'
+    # Name under which the new record's primary key is returned, if at all.
+    id_field = None
+    # Fields whose values make a submission without an Idempotency-Key a
+    # duplicate of one made within IDEMPOTENCY_WINDOW seconds.
+    dedup_fields = ()
+    # Type of the live event announcing each new record (see events.broker), if any.
+    event_type = None
+
+    def post(self, request):
+        try:
+            claim = idempotency.claim(request, request.data, request.path, self.dedup_fields)
+        except idempotency.InvalidKey as e:
+            return Response({
+                'success': False,
+                'errors': {idempotency.HEADER: [str(e)]}
+            }, status=status.HTTP_400_BAD_REQUEST)
+        previous = claim.begin() if claim else None
+        if previous:
+            headers = {'Idempotent-Replayed': 'true'} if previous.replayed else None
+            return Response(previous.body, status=previous.status, headers=headers)
+
+        response = self.submit(request)
+        if claim:
+            claim.finish(response.status_code, response.data)
+        return response
+
+    def submit(self, request):
+        try:
+            serializer = self.validate(request)
+            if serializer.errors:
+                return Response({
+                    'success': False,
+                    'errors': serializer.errors
+                }, status=status.HTTP_400_BAD_REQUEST)
+
+            instance = self.save(serializer)
+            return Response(self.get_response_data(instance), status=status.HTTP_201_CREATED)
+
+        except SubmissionConflict as e:
+            return Response({
+                'success': False,
+                'errors': e.errors
+            }, status=status.HTTP_409_CONFLICT)
+        except Exception as e:
+            return Response({
+                'success': False,
+                'error': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    def validate(self, request):
+        serializer = self.serializer_class(data=request.data)
+        serializer.is_valid()
+        return serializer
+
+    def save(self, serializer):
+        """Persist the record and queue its notification atomically."""
+        with transaction.atomic():
+            instance = self.persist(serializer)
+            self.notify(instance)
+            self.announce(serializer)
+        logger.info('Submission saved', extra={'model': instance._meta.label, 'record_id': instance.pk})
+        return instance
+
+    def persist(self, serializer):
+        return serializer.save()
+
+    def notify(self, instance):
+        outbox.enqueue(instance, self.get_messages(instance), digest=self.get_digest(instance))
+
+    def announce(self, serializer):
+        if self.event_type:
+            events.publish(self.event_type, serializer.data)
+
+    def get_messages(self, instance):
+        """Return the ``outbox.email(...)`` payloads to queue for ``instance``."""
+        raise NotImplementedError
+
+    def get_digest(self, instance):
+        """Return an ``outbox.digest(...)`` spec to hold the messages for a digest, or None to send now."""
+        return None
+
+    def get_response_data(self, instance):
+        data = {'success': True, 'message': self.success_message}
+        if self.id_field:
+            data[self.id_field] = instance.pk
+        return data
+
+
+def in_thread(func):
+    """``func`` as a coroutine function run off the event loop, its queries counted."""
+    return sync_to_async(counting_queries(func))
+
+
+class AsyncSubmissionView(View):
+    """Native async front end for a ``SubmissionView`` pipeline.
+
+    Parsing, validation and rendering run on the event loop; the
+    transactional INSERTs and the idempotency cache calls (files under
+    ``IDEMPOTENCY_CACHE_DIR`` with the gunicorn configs, else a per-process
+    ``LocMemCache``) are handed to Django's thread-sensitive executor
+    (the same one the async ORM methods use, since Django has no async
+    transactions), with their queries counted in the request's metrics.
+    Responses are byte-for-byte those of the sync view.
+    Routed instead of the DRF views when ``ASYNC_SUBMIT_VIEWS`` is set.
+    """
+
+    pipeline_class = None
+    http_method_names = ['post', 'options']
+
+    async def post(self, request):
+        pipeline = self.pipeline_class()
+        parser = ORJSONParser() if settings.FAST_PATH else JSONParser()
+        try:
+            data = parser.parse(io.BytesIO(request.body or b'{}'))
+        except ParseError as exc:
+            return self.respond({'detail': exc.detail}, status.HTTP_400_BAD_REQUEST)
+        try:
+            claim = await in_thread(idempotency.claim)(request, data, request.path, pipeline.dedup_fields)
+        except idempotency.InvalidKey as e:
+            return self.respond({
+                'success': False,
+                'errors': {idempotency.HEADER: [str(e)]}
+            }, status.HTTP_400_BAD_REQUEST)
+        previous = await in_thread(claim.begin)() if claim else None
+        if previous:
+            response = self.respond(previous.body, previous.status)
+            if previous.replayed:
+                response['Idempotent-Replayed'] = 'true'
+            return response
+
+        body, status_code = await self.submit(pipeline, data)
+        if claim:
+            await in_thread(claim.finish)(status_code, body)
+        return self.respond(body, status_code)
+
+    async def submit(self, pipeline, data):
+        try:
+            serializer = pipeline.serializer_class(data=data)
+            if not serializer.is_valid():
+                return {
+                    'success': False,
+                    'errors': serializer.errors
+                }, status.HTTP_400_BAD_REQUEST
+
+            instance = await in_thread(pipeline.save)(serializer)
+            return pipeline.get_response_data(instance), status.HTTP_201_CREATED
+
+        except SubmissionConflict as e:
+            return {
+                'success': False,
+                'errors': e.errors
+            }, status.HTTP_409_CONFLICT
+        except Exception as e:
+            return {
+                'success': False,
+                'error': str(e)
+            }, status.HTTP_500_INTERNAL_SERVER_ERROR
+
+    @staticmethod
+    def respond(data, status_code):
+        renderer = ORJSONRenderer() if settings.FAST_PATH else JSONRenderer()
+        return HttpResponse(renderer.render(data), status=status_code, content_type='application/json')
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        # Public JSON endpoint, exempt from CSRF like the DRF views.
+        return csrf_exempt(super().as_view(**initkwargs))
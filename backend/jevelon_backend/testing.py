@@ -0,0 +1,149 @@
+"""
+Test helpers shared by the app test suites.
+"""
+
+import json
+import os
+import time
+
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache, caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from prometheus_client import REGISTRY
+
+from jevelon_backend.benchmarking import LatencyStats
+from notifications.models import OutboxEntry
+from notifications.outbox import deliver_pending
+
+
+def sample(name, **labels):
+    """The current value of a Prometheus sample in this process, 0 if never recorded."""
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class QueryPlanMixin:
+    """Assertions about how the database executes a queryset.
+
+    On PostgreSQL sequential scans are disabled for the test transaction so
+    the planner picks an index whenever one is usable, independent of the
+    (tiny) table sizes in tests; SQLite has no statistics and always does.
+    """
+
+    def explain(self, queryset):
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+        return queryset.explain()
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = self.explain(queryset)
+        self.assertIn(index_name, plan, f'{index_name} not used:\n{plan}')
+        table = queryset.model._meta.db_table
+        if connection.vendor == 'postgresql':
+            self.assertNotIn('Seq Scan', plan)
+        else:
+            full_scans = [line for line in plan.splitlines() if f'SCAN {table}' in line and 'INDEX' not in line]
+            self.assertEqual(full_scans, [], plan)
+        self.assertNotIn('TEMP B-TREE', plan, f'sort not served by {index_name}:\n{plan}')
+
+
+class SubmissionWritesMixin:
+    """Assert the exact writes a submission makes to its table.
+
+    The submit request must INSERT the record once (plus its outbox entry)
+    and never UPDATE it; delivering the notification must then issue one
+    UPDATE that touches only ``email_sent``.
+    """
+
+    def writes(self, queries, verb, table):
+        return [q['sql'] for q in queries if q['sql'].startswith(verb) and f'"{table}"' in q['sql'].split(' SET ')[0]]
+
+    def assertSubmissionWrites(self, path, payload, model):
+        table = model._meta.db_table
+        ContentType.objects.get_for_model(model)  # warm the per-process cache
+        caches['idempotency'].clear()  # earlier tests may have sent the same payload
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(path, payload, format='json')
+
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(len(self.writes(queries, 'INSERT', table)), 1)
+        self.assertEqual(len(self.writes(queries, 'INSERT', OutboxEntry._meta.db_table)), 1)
+        self.assertEqual(self.writes(queries, 'UPDATE', table), [])
+
+        OutboxEntry.objects.update(next_attempt_at=timezone.now())  # don't wait for a digest window
+        with CaptureQueriesContext(connection) as queries:
+            deliver_pending()
+
+        updates = self.writes(queries, 'UPDATE', table)
+        self.assertEqual(len(updates), 1)
+        self.assertRegex(updates[0], r'SET "email_sent" = \S+ WHERE')
+        self.assertTrue(model.objects.get().email_sent)
+
+
+class ChangelistQueriesMixin:
+    """Query budgets for an admin changelist, logged in as a superuser.
+
+    Every page load costs a fixed number of queries whatever the table size;
+    facet counts and the date drill-down are cached, so only the first load
+    runs them. The cache is cleared before each test.
+    """
+
+    changelist_url = None
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'password'))
+
+    def assertChangelistQueries(self, num, **params):
+        with self.assertNumQueries(num):
+            response = self.client.get(self.changelist_url, params)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+
+class BenchmarkMixin:
+    """pytest-benchmark style timing for test cases.
+
+    ``self.benchmark(func, *args)`` calls ``func`` ``rounds`` times after a
+    short warmup, records the latencies under the test's name and returns the
+    last result so the test can still assert on it. When ``BENCHMARK_JSON``
+    names a file, every class appends its results there in the same format
+    as ``manage.py benchmark --json``.
+    """
+
+    benchmark_rounds = 20
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.benchmark_results = []
+
+    @classmethod
+    def tearDownClass(cls):
+        path = os.environ.get('BENCHMARK_JSON')
+        if path and cls.benchmark_results:
+            existing = []
+            if os.path.exists(path):
+                with open(path) as handle:
+                    existing = json.load(handle)
+            with open(path, 'w') as handle:
+                json.dump(existing + [stats.to_dict() for stats in cls.benchmark_results], handle, indent=2)
+        super().tearDownClass()
+
+    def benchmark(self, func, *args, rounds=None, warmup=2, **kwargs):
+        for _ in range(warmup):
+            func(*args, **kwargs)
+        latencies = []
+        started = time.perf_counter()
+        for _ in range(rounds or self.benchmark_rounds):
+            call_started = time.perf_counter()
+            result = func(*args, **kwargs)
+            latencies.append(time.perf_counter() - call_started)
+        stats = LatencyStats('.'.join(self.id().split('.')[-2:]), latencies, time.perf_counter() - started)
+        self.benchmark_results.append(stats)
+        return result
@@ -0,0 +1,418 @@
+import io
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+from datetime import date, datetime, timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.cache import caches
+from django.db import connection
+from django.test import Client, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ErrorDetail, ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnDict
+
+from consultation.serializers import ConsultationSerializer
+from contact.serializers import ContactSerializer
+from notifications.models import OutboxEntry
+from notifications.outbox import deliver_pending
+from support.models import SupportTicket
+from support.serializers import SupportTicketSerializer
+from . import health
+from .admin import EstimatedCountPaginator
+from .benchmarking import submit_payload
+from .logs import AsyncLogHandler, JSONFormatter, RequestIDFilter, SamplingFilter, bind_request_id
+from .parsers import ORJSONParser
+from .renderers import ORJSONRenderer
+from .testing import sample
+
+
+class EstimatedCountPaginatorTests(TestCase):
+    def setUp(self):
+        SupportTicket.objects.bulk_create(
+            SupportTicket(name='Asha', email='asha@example.com', subject='Login', message='Fails') for _ in range(5)
+        )
+
+    def test_small_results_are_counted_exactly_with_a_limit(self):
+        with CaptureQueriesContext(connection) as queries:
+            count = EstimatedCountPaginator(SupportTicket.objects.all(), 2).count
+
+        self.assertEqual(count, 5)
+        self.assertIn('LIMIT 10001', queries.captured_queries[0]['sql'])
+
+    @override_settings(ADMIN_EXACT_COUNT_LIMIT=3)
+    def test_large_results_use_the_planner_estimate(self):
+        with CaptureQueriesContext(connection) as queries:
+            count = EstimatedCountPaginator(SupportTicket.objects.all(), 2).count
+
+        if connection.vendor == 'postgresql':
+            self.assertIn('EXPLAIN', queries.captured_queries[-1]['sql'])
+            self.assertGreaterEqual(count, 4)
+        else:
+            # No planner statistics to read: fall back to an exact count.
+            self.assertEqual(count, 5)
+
+
+class LivenessTests(SimpleTestCase):
+    # SimpleTestCase refuses database queries, so these also prove none are made.
+    def test_livez_is_constant(self):
+        response = self.client.get('/livez')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, health.LIVE_BODY)
+        self.assertEqual(response['Cache-Control'], 'no-store')
+
+    def test_index_no_longer_exposes_settings(self):
+        data = self.client.get('/').json()
+
+        self.assertEqual(data['status'], 'ok')
+        self.assertNotIn('allowed_hosts', data)
+        self.assertNotIn('database_status', data)
+
+    def test_rejects_writes(self):
+        self.assertEqual(self.client.post('/livez').status_code, 405)
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+class ReadinessTests(TestCase):
+    def setUp(self):
+        self.probe = health.ReadinessProbe()
+        patcher = mock.patch.object(health, 'readiness', self.probe)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # Drive refreshes by hand instead of from the background thread.
+        patcher = mock.patch.object(health.ReadinessProbe, 'ensure_running')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_not_ready_until_first_probe(self):
+        response = self.client.get('/readyz')
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()['status'], 'starting')
+
+    def test_serves_cached_result_without_queries(self):
+        with mock.patch.object(health, 'check_database', return_value='ok'):
+            self.probe.refresh()
+
+        with self.assertNumQueries(0):
+            response = self.client.get('/readyz')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content)['checks'], {'database': 'ok', 'email': 'skipped'})
+
+    def test_database_failure_makes_instance_unready(self):
+        with mock.patch.object(health, 'check_database', return_value='error: connection refused'):
+            self.probe.refresh()
+
+        response = self.client.get('/readyz')
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()['status'], 'unavailable')
+
+    @override_settings(EMAIL_BACKEND='notifications.backends.PooledSMTPEmailBackend',
+                       EMAIL_HOST='127.0.0.1', EMAIL_PORT=1)
+    def test_email_outage_is_reported_but_not_fatal(self):
+        with mock.patch.object(health, 'check_database', return_value='ok'):
+            self.probe.refresh()
+
+        response = self.client.get('/readyz')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()['checks']['email'].startswith('error'))
+
+
+class MetricsTests(TestCase):
+    SUBMIT = {'name': 'Asha Verma', 'email': 'asha@example.com', 'service': 'consulting', 'message': 'Hello'}
+
+    def setUp(self):
+        caches['idempotency'].clear()
+
+    def test_request_count_latency_and_queries_per_route(self):
+        route = {'route': 'api/contact/submit/'}
+        before = sample('jevelon_http_requests_total', method='POST', status='201', **route)
+        queries_before = sample('jevelon_db_queries_per_request_sum', **route)
+
+        self.client.post('/api/contact/submit/', self.SUBMIT, content_type='application/json')
+
+        self.assertEqual(sample('jevelon_http_requests_total', method='POST', status='201', **route), before + 1)
+        self.assertGreater(sample('jevelon_http_request_duration_seconds_count', method='POST', **route), 0)
+        self.assertGreaterEqual(sample('jevelon_db_queries_per_request_sum', **route) - queries_before, 2)
+
+    def test_unmatched_paths_share_one_label(self):
+        before = sample('jevelon_http_requests_total', route='<unmatched>', method='GET', status='404')
+
+        self.client.get('/no/such/page-1')
+        self.client.get('/no/such/page-2')
+
+        self.assertEqual(sample('jevelon_http_requests_total', route='<unmatched>', method='GET', status='404'), before + 2)
+
+    @override_settings(EMAIL_BACKEND='notifications.tests.FailingBackend')
+    def test_email_failures_are_counted(self):
+        backend = {'backend': 'notifications.tests.FailingBackend'}
+        before = sample('jevelon_email_send_failures_total', **backend)
+        self.client.post('/api/contact/submit/', self.SUBMIT, content_type='application/json')
+        OutboxEntry.objects.update(next_attempt_at=timezone.now())  # end of the digest window
+
+        deliver_pending()
+
+        self.assertEqual(sample('jevelon_email_send_failures_total', **backend), before + 1)
+        self.assertEqual(mail.outbox, [])
+
+    def test_exposition_format(self):
+        self.client.get('/livez')
+
+        response = self.client.get('/metrics')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'jevelon_http_requests_total{', response.content)
+
+    @override_settings(METRICS_TOKEN='s3cret')
+    def test_token_required_when_configured(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 401)
+        self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer s3cret').status_code, 200)
+
+    def test_import_opens_no_multiprocess_files(self):
+        # gunicorn preloads the app in the master; nothing may touch the directory yet.
+        with tempfile.TemporaryDirectory() as directory:
+            env = {**os.environ, 'PROMETHEUS_MULTIPROC_DIR': directory, 'DJANGO_SETTINGS_MODULE': 'jevelon_backend.settings'}
+            subprocess.run(
+                [sys.executable, '-c', 'import django; django.setup(); import jevelon_backend.metrics, events.broker'],
+                env=env, check=True, capture_output=True, timeout=60,
+            )
+
+            self.assertEqual(os.listdir(directory), [])
+
+
+class CapturingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+        self.addFilter(RequestIDFilter())
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class RequestIDTests(TestCase):
+    SUBMIT = MetricsTests.SUBMIT
+
+    def setUp(self):
+        caches['idempotency'].clear()
+
+    def test_generates_and_echoes_request_id(self):
+        generated = self.client.get('/livez')['X-Request-ID']
+        echoed = self.client.get('/livez', HTTP_X_REQUEST_ID='lb-7f3a')['X-Request-ID']
+        replaced = self.client.get('/livez', HTTP_X_REQUEST_ID='bad id\n{}')['X-Request-ID']
+
+        self.assertRegex(generated, r'^[0-9a-f]{32}$')
+        self.assertEqual(echoed, 'lb-7f3a')
+        self.assertNotEqual(replaced, 'bad id\n{}')
+
+    def test_id_follows_submission_to_email_delivery(self):
+        handler = CapturingHandler()
+        outbox_logger = logging.getLogger('notifications.outbox')
+        outbox_logger.addHandler(handler)
+        self.addCleanup(outbox_logger.removeHandler, handler)
+
+        self.client.post('/api/contact/submit/', self.SUBMIT, content_type='application/json',
+                         HTTP_X_REQUEST_ID='req-42')
+        OutboxEntry.objects.update(next_attempt_at=timezone.now())
+        deliver_pending()
+
+        self.assertEqual(OutboxEntry.objects.get().request_id, 'req-42')
+        self.assertEqual(
+            [(record.getMessage(), record.request_id) for record in handler.records],
+            [('Notification queued', 'req-42'), ('Notification sent', 'req-42')],
+        )
+
+
+class StructuredLoggingTests(SimpleTestCase):
+    def record(self, level=logging.INFO, **extra):
+        record = logging.makeLogRecord({'name': 'jevelon', 'levelno': level, 'levelname': logging.getLevelName(level),
+                                        'msg': 'Saved %s', 'args': (7,), **extra})
+        RequestIDFilter().filter(record)
+        return record
+
+    def test_json_lines_carry_context_and_extra_fields(self):
+        with bind_request_id('abc'):
+            line = JSONFormatter().format(self.record(outbox_id=3))
+
+        entry = json.loads(line)
+        self.assertEqual((entry['message'], entry['request_id'], entry['outbox_id']), ('Saved 7', 'abc', 3))
+        self.assertEqual(entry['level'], 'INFO')
+
+    def test_sampling_keeps_whole_requests_and_all_warnings(self):
+        sampler = SamplingFilter(rate=0.5)
+        kept = []
+        for i in range(200):
+            with bind_request_id(f'request-{i}'):
+                decision = sampler.filter(self.record())
+                self.assertEqual(sampler.filter(self.record()), decision)
+                self.assertTrue(sampler.filter(self.record(logging.WARNING)))
+            kept.append(decision)
+
+        self.assertTrue(50 < sum(kept) < 150)
+
+    def test_handler_writes_and_rotates_off_thread(self):
+        directory = tempfile.mkdtemp()
+        handler = AsyncLogHandler(filename=os.path.join(directory, 'app-{pid}.log'), max_bytes=2000, backup_count=2)
+        handler.setFormatter(JSONFormatter())
+
+        for _ in range(50):
+            handler.handle(self.record())
+        handler.close()
+
+        files = sorted(os.listdir(directory))
+        self.assertEqual(files, [f'app-{os.getpid()}.log', f'app-{os.getpid()}.log.1', f'app-{os.getpid()}.log.2'])
+        with open(os.path.join(directory, files[0])) as log:
+            self.assertEqual(json.loads(log.readline())['message'], 'Saved 7')
+
+
+class FastPathTests(TestCase):
+    """FAST_PATH must not change what is accepted, stored or answered."""
+
+    PAYLOADS = [
+        {'name': ' Asha ', 'email': 'ASHA@example.com', 'service': 'consulting', 'message': 'Hi', 'priority': 'high',
+         'category': 'bug', 'subject': 'Login', 'project_type': 'web', 'preferred_date': '2026-11-02',
+         'preferred_time': '10:00 AM', 'status': 'closed', 'id': 7},
+        {},
+        {'name': '', 'email': 'nope', 'priority': 'urgent', 'preferred_date': '2026-02-30', 'preferred_time': '8 AM'},
+        {'name': None, 'email': 12, 'message': ['a'], 'subject': 'x' * 201, 'phone': 5, 'additional_notes': None},
+        {'name': 'Nul\x00byte', 'email': 'a@b.co', 'service': True, 'message': {'nested': 1}},
+        ['not', 'a', 'mapping'],
+        'text',
+    ]
+
+    def validate(self, serializer_class, payload, fast):
+        with override_settings(FAST_PATH=fast):
+            serializer = serializer_class(data=payload)
+            valid = serializer.is_valid()
+            return valid, dict(serializer.validated_data) if valid else None, serializer.errors
+
+    def test_serializers_validate_identically(self):
+        for serializer_class in (ContactSerializer, SupportTicketSerializer, ConsultationSerializer):
+            self.assertIsNotNone(serializer_class.compiled_fields())
+            for payload in self.PAYLOADS:
+                with self.subTest(serializer=serializer_class.__name__, payload=payload):
+                    self.assertEqual(
+                        self.validate(serializer_class, payload, fast=True),
+                        self.validate(serializer_class, payload, fast=False),
+                    )
+
+    @override_settings(FAST_PATH=True)
+    def test_fast_create_saves_the_same_row(self):
+        serializer = ContactSerializer(data={'name': 'Asha', 'email': 'asha@example.com', 'service': 'x', 'message': 'Hi'})
+        self.assertTrue(serializer.is_valid())
+
+        contact = serializer.save()
+
+        self.assertEqual(ContactSerializer(contact).data['email'], 'asha@example.com')
+
+    def test_parser_matches_stock_results_and_errors(self):
+        bodies = [b'{"a": [1, 2.5, null, true], "b": "\\u00e9\\u2028"}', b'', b'{"a": 1,}', b'{"a": NaN}',
+                  b'[18446744073709551616]', b'"\xff"', b'{"a": "b"} x']
+        for body in bodies:
+            with self.subTest(body=body):
+                self.assertEqual(self.parse(ORJSONParser(), body), self.parse(JSONParser(), body))
+
+    def test_renderer_matches_stock_bytes(self):
+        payloads = [
+            {'success': False, 'errors': ReturnDict({'email': [ErrorDetail('Enter a valid email address.', 'invalid')]},
+                                                    serializer=None)},
+            {'line': 'a\u2028b\u2029c', 'unicode': 'é✓', 'control': '\x00\x1f\t', 'quote': '"\\/'},
+            {1: 'int key', 'date': date(2026, 1, 2), 'when': datetime(2026, 1, 2, 3, 4, 5, 6, tzinfo=dt_timezone.utc),
+             'local': timezone.localtime(), 'amount': Decimal('1.10'), 'lazy': gettext_lazy('Yes'), 'tuple': (1, 2)},
+            {'big': 2 ** 70, 'nested': [[{}], []], 'none': None},
+        ]
+        for payload in payloads:
+            with self.subTest(payload=payload):
+                self.assertEqual(ORJSONRenderer().render(payload), JSONRenderer().render(payload))
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+
+    @staticmethod
+    def parse(parser, body):
+        try:
+            return parser.parse(io.BytesIO(body))
+        except ParseError as exc:
+            return 'error', str(exc.detail)
+
+
+class SlimMiddlewareTests(TestCase):
+    SUBMIT = MetricsTests.SUBMIT
+
+    def setUp(self):
+        caches['idempotency'].clear()
+        self.client = Client(enforce_csrf_checks=True)
+
+    def test_api_skips_site_middleware(self):
+        response = self.client.post('/api/contact/submit/', self.SUBMIT, content_type='application/json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertNotIn('X-Frame-Options', response)
+        self.assertNotIn('Cookie', response.get('Vary', ''))
+        self.assertEqual(response.cookies, {})
+        self.assertFalse(hasattr(response.wsgi_request, 'session'))
+
+    def test_admin_keeps_full_protection(self):
+        response = self.client.get('/admin/login/')
+
+        self.assertEqual(response['X-Frame-Options'], 'DENY')
+        self.assertIn('csrftoken', response.cookies)
+        self.assertEqual(self.client.post('/admin/login/', {'username': 'a', 'password': 'b'}).status_code, 403)
+
+    def test_admin_session_authenticates_api_requests(self):
+        self.client.force_login(User.objects.create_user('staff', is_staff=True))
+
+        self.assertEqual(self.client.get('/api/stats/').status_code, 200)
+        # Unsafe methods still need the CSRF token with session authentication.
+        response = self.client.post('/api/contact/bulk/', [self.SUBMIT], content_type='application/json')
+        self.assertEqual(response.status_code, 403)
+        self.assertIn('CSRF', response.json()['detail'])
+
+    def test_api_without_session_is_anonymous(self):
+        self.assertEqual(self.client.get('/api/stats/').status_code, 403)
+
+
+class ConcurrentSubmitTests(TransactionTestCase):
+    """Submissions arriving at once from several threads, as gunicorn's threads send them."""
+
+    def test_concurrent_submissions_all_succeed(self):
+        caches['idempotency'].clear()
+        user = User.objects.create_user('ingest')
+        statuses = []
+
+        def worker():
+            client = Client()
+            client.force_login(user)
+            try:
+                for path in ('/api/contact/submit/', '/api/support/submit/', '/api/contact/submit/',
+                             '/api/support/submit/', '/api/support/bulk/'):
+                    body = submit_payload(path) if 'bulk' not in path else [
+                        submit_payload('/api/support/submit/') for _ in range(10)
+                    ]
+                    response = client.post(path, body, content_type='application/json')
+                    statuses.append((path, response.status_code, response.content[:100]))
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([(path, status) for path, status, _ in statuses if status != 201], [], statuses)
+        self.assertEqual(len(statuses), 40)
+        self.assertEqual(SupportTicket.objects.count(), 8 * 12)
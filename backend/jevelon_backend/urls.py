@@ -21,32 +21,7 @@ from django.conf import settings
 from django.conf.urls.static import static
 import os
 
-def health_check(request):
-    try:
-        # Test database connection
-        from django.db import connection
-        with connection.cursor() as cursor:
-            cursor.execute("SELECT 1")
-            db_status = "connected"
-    except Exception as e:
-        db_status = f"error: {str(e)}"
-    
-    return JsonResponse({
-        'status': 'ok',
-        'message': 'Jevelon Backend is running',
-        'debug': settings.DEBUG,
-        'allowed_hosts': settings.ALLOWED_HOSTS,
-        'cors_origins': settings.CORS_ALLOWED_ORIGINS,
-        'database_status': db_status,
-        'static_root': str(settings.STATIC_ROOT),
-        'static_url': settings.STATIC_URL,
-        'endpoints': {
-            'admin': '/admin/',
-            'contact': '/api/contact/submit/',
-            'support': '/api/support/submit/',
-            'consultation': '/api/consultation/schedule/'
-        }
-    })
+from . import health, metrics
 
 def test_endpoint(request):
     return JsonResponse({
@@ -60,14 +35,21 @@ def favicon_handler(request):
     """Handle favicon requests to prevent 400 errors"""
     return HttpResponse(status=204)  # No content response
 
+# URLs are matched in order, so the API - nearly all traffic - is tried first.
 urlpatterns = [
-    path('', health_check, name='health_check'),
-    path('test/', test_endpoint, name='test_endpoint'),
-    path('favicon.ico', favicon_handler, name='favicon'),
-    path('admin/', admin.site.urls),
     path('api/contact/', include('contact.urls')),
     path('api/consultation/', include('consultation.urls')),
     path('api/support/', include('support.urls')),
+    path('api/stats/', include('stats.urls')),
+    path('api/events/', include('events.urls')),
+    path('api/inbox/', include('inbox.urls')),
+    path('', health.index, name='health_check'),
+    path('livez', health.livez, name='livez'),
+    path('readyz', health.readyz, name='readyz'),
+    path('metrics', metrics.metrics, name='metrics'),
+    path('test/', test_endpoint, name='test_endpoint'),
+    path('favicon.ico', favicon_handler, name='favicon'),
+    path('admin/', admin.site.urls),
 ]
 
 # Serve static files during development
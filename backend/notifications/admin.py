@@ -0,0 +1,16 @@
+from django.contrib import admin
+from django.utils import timezone
+from .models import OutboxEntry
+
+@admin.register(OutboxEntry)
+class OutboxEntryAdmin(admin.ModelAdmin):
+    list_display = ['id', 'content_type', 'status', 'digest_recipient', 'attempts', 'sent_count', 'next_attempt_at', 'created_at', 'sent_at']
+    list_filter = ['status', 'content_type', 'created_at']
+    readonly_fields = ['created_at', 'sent_at']
+    ordering = ['-created_at']
+    actions = ['retry_now']
+
+    @admin.action(description='Retry selected entries now')
+    def retry_now(self, request, queryset):
+        updated = queryset.exclude(status='sent').update(status='pending', attempts=0, next_attempt_at=timezone.now())
+        self.message_user(request, f'{updated} entries queued for retry.')
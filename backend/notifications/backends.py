@@ -0,0 +1,233 @@
+"""
+Email backends that reuse connections across sends.
+
+Django's stock SMTP backend opens (and TLS-negotiates and authenticates) a new
+connection for every ``send_mail`` call. The backends here keep one
+connection per worker thread alive between calls and transparently reconnect
+when the relay has dropped it.
+"""
+
+import http.client
+import json
+import os
+import smtplib
+import threading
+import time
+
+from django.conf import settings
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.mail.backends.smtp import EmailBackend as SMTPEmailBackend
+from sendgrid.helpers.mail import Mail
+
+# Errors that mean the pooled connection is gone rather than that the message
+# itself was rejected; they are retried once on a fresh connection.
+DISCONNECT_ERRORS = (
+    smtplib.SMTPServerDisconnected,
+    ConnectionError,
+    TimeoutError,
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+)
+
+
+class _Pooled:
+    """A live connection plus the bookkeeping needed to decide on reuse."""
+
+    def __init__(self, connection, key):
+        self.connection = connection
+        self.key = key
+        self.pid = os.getpid()
+        self.created_at = self.last_used = time.monotonic()
+
+
+class _ConnectionPool(threading.local):
+    """One pooled connection per thread, so no locking is needed."""
+
+    pooled = None
+
+    def checkout(self, key, max_age, idle_check, is_alive):
+        pooled = self.pooled
+        if pooled is None:
+            return None
+        now = time.monotonic()
+        if (
+            pooled.key != key
+            or pooled.pid != os.getpid()
+            or now - pooled.created_at > max_age
+            or (now - pooled.last_used > idle_check and not is_alive(pooled.connection))
+        ):
+            self.discard()
+            return None
+        return pooled.connection
+
+    def checkin(self, connection, key):
+        pooled = self.pooled
+        if pooled is None or pooled.connection is not connection:
+            self.discard()
+            pooled = self.pooled = _Pooled(connection, key)
+        pooled.last_used = time.monotonic()
+
+    def discard(self):
+        pooled, self.pooled = self.pooled, None
+        if pooled is not None and pooled.pid == os.getpid():
+            try:
+                pooled.connection.close()
+            except Exception:
+                pass
+
+
+class PooledSMTPEmailBackend(SMTPEmailBackend):
+    """SMTP backend that keeps its connection open across ``send_mail`` calls.
+
+    ``close()`` hands the connection back to a per-thread pool instead of
+    sending QUIT, so the next backend instance in the same worker skips the
+    TCP, STARTTLS and AUTH round trips. Connections idle for longer than
+    ``EMAIL_POOL_IDLE_CHECK`` seconds are probed with NOOP before reuse and
+    are recycled after ``EMAIL_POOL_MAX_AGE`` seconds.
+    """
+
+    _pool = _ConnectionPool()
+
+    @property
+    def pool_key(self):
+        return (self.host, self.port, self.username, self.use_tls, self.use_ssl)
+
+    @staticmethod
+    def _is_alive(connection):
+        try:
+            return connection.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def open(self):
+        if self.connection:
+            return False
+        self.connection = self._pool.checkout(
+            self.pool_key,
+            settings.EMAIL_POOL_MAX_AGE,
+            settings.EMAIL_POOL_IDLE_CHECK,
+            self._is_alive,
+        )
+        if self.connection:
+            return False
+        opened = super().open()
+        if opened is None:
+            return None
+        self._pool.checkin(self.connection, self.pool_key)
+        # Report the connection as reused so send_messages() leaves it open.
+        return False
+
+    def close(self):
+        """Release the connection to the pool; it stays open for reuse."""
+        if self.connection is None:
+            return
+        self._pool.checkin(self.connection, self.pool_key)
+        self.connection = None
+
+    def discard(self):
+        """Close the connection for good, e.g. after a protocol error."""
+        self.connection = None
+        self._pool.discard()
+
+    def send_messages(self, email_messages):
+        if not email_messages:
+            return 0
+        with self._lock:
+            num_sent = 0
+            for message in email_messages:
+                if self._send_with_reconnect(message):
+                    num_sent += 1
+        return num_sent
+
+    def _send_with_reconnect(self, message):
+        for attempt in range(2):
+            if self.open() is None or not self.connection:
+                return False
+            try:
+                return self._send(message)
+            except DISCONNECT_ERRORS:
+                self.discard()
+                if attempt:
+                    raise
+            except Exception:
+                self.discard()
+                raise
+        return False
+
+
+class SendGridAPIEmailBackend(BaseEmailBackend):
+    """Send through the SendGrid v3 HTTP API over a keep-alive connection.
+
+    Messages are built with the ``sendgrid`` helper classes and posted over a
+    persistent HTTPS connection per worker thread, avoiding the SMTP
+    conversation altogether.
+    """
+
+    host = 'api.sendgrid.com'
+    _pool = _ConnectionPool()
+
+    def __init__(self, api_key=None, timeout=None, fail_silently=False, **kwargs):
+        super().__init__(fail_silently=fail_silently)
+        self.api_key = api_key or settings.SENDGRID_API_KEY
+        self.timeout = timeout or settings.EMAIL_TIMEOUT or 10
+
+    def _connection(self):
+        connection = self._pool.checkout(self.host, settings.EMAIL_POOL_MAX_AGE, float('inf'), None)
+        if connection is None:
+            connection = http.client.HTTPSConnection(self.host, timeout=self.timeout)
+        return connection
+
+    def _post(self, payload):
+        connection = self._connection()
+        connection.request(
+            'POST',
+            '/v3/mail/send',
+            body=json.dumps(payload),
+            headers={
+                'Authorization': f'Bearer {self.api_key}',
+                'Content-Type': 'application/json',
+                'Connection': 'keep-alive',
+            },
+        )
+        response = connection.getresponse()
+        body = response.read()
+        self._pool.checkin(connection, self.host)
+        if response.status >= 300:
+            raise smtplib.SMTPException(f'SendGrid API returned {response.status}: {body[:200]!r}')
+
+    def _send(self, message):
+        if not message.recipients():
+            return False
+        mail = Mail(
+            from_email=message.from_email,
+            to_emails=message.to,
+            subject=message.subject,
+            plain_text_content=message.body,
+        )
+        for address in message.cc:
+            mail.add_cc(address)
+        for address in message.bcc:
+            mail.add_bcc(address)
+        payload = mail.get()
+        for attempt in range(2):
+            try:
+                self._post(payload)
+                return True
+            except DISCONNECT_ERRORS:
+                # The server closed an idle keep-alive connection.
+                self._pool.discard()
+                if attempt:
+                    raise
+        return False
+
+    def send_messages(self, email_messages):
+        num_sent = 0
+        for message in email_messages:
+            try:
+                if self._send(message):
+                    num_sent += 1
+            except Exception:
+                self._pool.discard()
+                if not self.fail_silently:
+                    raise
+        return num_sent
@@ -0,0 +1,78 @@
+import time
+
+from django.core.mail import EmailMessage, get_connection, send_mail
+from django.core.management.base import BaseCommand
+
+from notifications.smtp_server import FakeSMTPServer
+
+STOCK_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+POOLED_BACKEND = 'notifications.backends.PooledSMTPEmailBackend'
+
+
+class Command(BaseCommand):
+    help = 'Compares per-message email cost of the stock and pooled SMTP backends against a local fake relay'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--messages', type=int, default=100, help='Messages sent per scenario')
+        parser.add_argument(
+            '--latency',
+            type=float,
+            default=0.002,
+            help='Simulated seconds per SMTP reply (network round trip)',
+        )
+        parser.add_argument(
+            '--connect-delay',
+            type=float,
+            default=0.05,
+            help='Simulated seconds per new connection (TLS handshake + AUTH)',
+        )
+
+    def handle(self, *args, **options):
+        count = options['messages']
+        scenarios = [
+            ('stock send_mail (today)', self.send_individually, STOCK_BACKEND),
+            ('pooled send_mail', self.send_individually, POOLED_BACKEND),
+            ('pooled send_messages batch', self.send_batched, POOLED_BACKEND),
+        ]
+
+        self.stdout.write(f'Sending {count} messages per scenario\n')
+        self.stdout.write(f"{'scenario':<30} {'ms/message':>12} {'connections':>12}")
+        for label, run, backend in scenarios:
+            with FakeSMTPServer(latency=options['latency'], connect_delay=options['connect_delay']) as server:
+                params = {
+                    'backend': backend,
+                    'host': '127.0.0.1',
+                    'port': server.port,
+                    'username': '',
+                    'password': '',
+                    'use_tls': False,
+                }
+                started = time.perf_counter()
+                run(count, params)
+                elapsed = time.perf_counter() - started
+                if backend == POOLED_BACKEND:
+                    # Don't carry the pooled session over to the next server.
+                    get_connection(**params).discard()
+                self.stdout.write(
+                    f'{label:<30} {elapsed / count * 1000:>12.2f} {server.connections:>12}'
+                )
+
+    @staticmethod
+    def send_individually(count, params):
+        for i in range(count):
+            send_mail(
+                subject=f'Benchmark message {i}',
+                message='Benchmark body',
+                from_email='bench@jevelon.com',
+                recipient_list=['admin@jevelon.com'],
+                connection=get_connection(**params),
+            )
+
+    @staticmethod
+    def send_batched(count, params):
+        messages = [
+            EmailMessage(f'Benchmark message {i}', 'Benchmark body', 'bench@jevelon.com', ['admin@jevelon.com'])
+            for i in range(count)
+        ]
+        with get_connection(**params) as connection:
+            connection.send_messages(messages)
@@ -0,0 +1,49 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from notifications.outbox import deliver_pending
+
+
+class Command(BaseCommand):
+    help = 'Delivers queued notification emails from the outbox'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Drain everything that is currently due, then exit',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.EMAIL_OUTBOX_BATCH_SIZE,
+            help='Entries claimed (and sent over one connection) per batch',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=settings.EMAIL_OUTBOX_POLL_INTERVAL,
+            help='Seconds to sleep when the outbox is empty',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        self.stdout.write(self.style.SUCCESS('Outbox worker started'))
+
+        try:
+            while True:
+                close_old_connections()
+                sent, failed = deliver_pending(batch_size)
+                if sent or failed:
+                    self.stdout.write(f'Delivered {sent} entries, {failed} failed')
+                if sent + failed < batch_size:
+                    if options['once']:
+                        break
+                    time.sleep(options['poll_interval'])
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(self.style.SUCCESS('Outbox worker stopped'))
@@ -0,0 +1,22 @@
+# Generated by Django 5.0 on 2026-10-18 12:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('notifications', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='outboxentry',
+            name='outbox_status_due_idx',
+        ),
+        migrations.AddIndex(
+            model_name='outboxentry',
+            index=models.Index(condition=models.Q(('status', 'pending')), fields=['next_attempt_at'], name='outbox_pending_due_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0 on 2026-10-18 13:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0002_pending_due_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outboxentry',
+            name='request_id',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+    ]
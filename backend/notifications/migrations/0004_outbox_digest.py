@@ -0,0 +1,33 @@
+# Generated by Django 5.0 on 2026-10-18 14:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('notifications', '0003_outbox_request_id'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outboxentry',
+            name='digest_line',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='outboxentry',
+            name='digest_recipient',
+            field=models.EmailField(blank=True, max_length=254),
+        ),
+        migrations.AddField(
+            model_name='outboxentry',
+            name='digest_section',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.AddIndex(
+            model_name='outboxentry',
+            index=models.Index(condition=models.Q(('status', 'pending'), models.Q(('digest_recipient', ''), _negated=True)), fields=['digest_recipient', 'next_attempt_at'], name='outbox_digest_idx'),
+        ),
+    ]
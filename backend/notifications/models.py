@@ -0,0 +1,53 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+from django.utils import timezone
+
+# Create your models here.
+
+class OutboxEntry(models.Model):
+    """A queued notification, written in the same transaction as its record.
+
+    Each entry holds one or more email payloads that are delivered in order by
+    the ``process_outbox`` worker. Once every message is sent, the
+    ``email_sent`` flag of the records listed in ``object_ids`` is set.
+    """
+
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('dead', 'Dead'),
+    ]
+
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE, null=True, blank=True)
+    object_ids = models.JSONField(default=list, blank=True)
+    messages = models.JSONField(default=list)
+    sent_count = models.PositiveIntegerField(default=0)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    # Id of the request that queued the entry, so delivery logs can be correlated with it.
+    request_id = models.CharField(max_length=64, blank=True)
+    # Set when the entry waits for its recipient's periodic digest (see outbox.digest):
+    # the digest groups ``digest_line`` under ``digest_section``.
+    digest_recipient = models.EmailField(blank=True)
+    digest_section = models.CharField(max_length=100, blank=True)
+    digest_line = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Outbox #{self.pk} ({self.status})"
+
+    class Meta:
+        ordering = ['next_attempt_at']
+        verbose_name_plural = 'outbox entries'
+        indexes = [
+            # The worker's claim query only ever looks at pending entries.
+            models.Index(fields=['next_attempt_at'], name='outbox_pending_due_idx', condition=models.Q(status='pending')),
+            # A recipient's held digest entries, counted on every enqueue to flush a full digest early.
+            models.Index(
+                fields=['digest_recipient', 'next_attempt_at'], name='outbox_digest_idx',
+                condition=models.Q(status='pending') & ~models.Q(digest_recipient=''),
+            ),
+        ]
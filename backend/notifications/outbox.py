@@ -0,0 +1,290 @@
+"""
+Transactional email outbox.
+
+Views call ``enqueue`` inside the same ``transaction.atomic()`` block that
+saves the submission, so a notification exists if and only if its record
+does. The ``process_outbox`` management command drains due entries with
+``deliver_pending``.
+
+Notifications that can wait (``digest``) are held instead: each recipient
+gets one digest email per window listing everything queued for them in
+it, rather than one email per submission. Windows are aligned to the
+epoch, so notifications of different kinds falling due at the same
+boundary share a digest too.
+"""
+
+import contextlib
+import itertools
+import logging
+import random
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from jevelon_backend.logs import bind_request_id, get_request_id
+from jevelon_backend.metrics import timed_email_send
+from .models import OutboxEntry
+
+logger = logging.getLogger(__name__)
+
+
+def email(subject, body, recipients, from_email=None):
+    """Build a JSON-serializable email payload for an outbox entry."""
+    return {
+        'subject': subject,
+        'body': body,
+        'from_email': from_email or settings.DEFAULT_FROM_EMAIL,
+        'to': list(recipients),
+    }
+
+
+def digest(kind, section, line):
+    """Hold a notification for its recipients' next digest instead of sending it at once.
+
+    ``kind`` names its window in ``EMAIL_DIGEST_WINDOWS``; the digest lists
+    ``line`` under ``section``. Returns None (send immediately) for kinds
+    without a window. Pass the result to ``enqueue``.
+    """
+    window = settings.EMAIL_DIGEST_WINDOWS.get(kind, 0)
+    return {'window': window, 'section': section, 'line': line} if window > 0 else None
+
+
+def window_end(window, now):
+    """The end of the ``window``-second slot ``now`` falls in, counted from the epoch."""
+    end = (int(now.timestamp()) // window + 1) * window
+    return datetime.fromtimestamp(end, tz=dt_timezone.utc)
+
+
+def enqueue(instances, messages, digest=None):
+    """Queue ``messages`` for delivery on behalf of one or more records.
+
+    ``instances`` is a saved model instance or a list of saved instances of
+    the same model; their ``email_sent`` flag is set once every message in
+    the entry has been delivered.
+
+    With a ``digest`` spec, each recipient of each message gets an entry
+    held until the end of the window (or until ``EMAIL_DIGEST_MAX_ITEMS``
+    are waiting for them) and the list of those entries is returned.
+    """
+    if not isinstance(instances, (list, tuple)):
+        instances = [instances]
+    content_type = ContentType.objects.get_for_model(instances[0]) if instances else None
+    fields = {
+        'content_type': content_type,
+        'object_ids': [instance.pk for instance in instances],
+        'request_id': get_request_id(),
+    }
+    if digest is None:
+        entry = OutboxEntry.objects.create(messages=list(messages), **fields)
+        logger.info('Notification queued', extra={'outbox_id': entry.pk, 'messages': len(entry.messages)})
+        return entry
+
+    now = timezone.now()
+    entries = []
+    for message in messages:
+        for recipient in message['to']:
+            entry = OutboxEntry.objects.create(
+                messages=[{**message, 'to': [recipient]}],
+                digest_recipient=recipient,
+                digest_section=digest['section'],
+                digest_line=digest['line'],
+                next_attempt_at=window_end(digest['window'], now),
+                **fields,
+            )
+            logger.info('Notification queued', extra={'outbox_id': entry.pk, 'messages': 1, 'digest': recipient})
+            entries.append(entry)
+            held = OutboxEntry.objects.filter(status='pending', digest_recipient=recipient, next_attempt_at__gt=now)
+            if held.count() >= settings.EMAIL_DIGEST_MAX_ITEMS:
+                held.update(next_attempt_at=now)
+    return entries
+
+
+def backoff_delay(attempts):
+    """Exponential backoff with jitter, capped at ``EMAIL_OUTBOX_BACKOFF_MAX``."""
+    delay = min(settings.EMAIL_OUTBOX_BACKOFF_BASE * 2 ** (attempts - 1), settings.EMAIL_OUTBOX_BACKOFF_MAX)
+    return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+
+def claim_batch(batch_size):
+    """Lease up to ``batch_size`` due entries that are not held for a digest to this worker.
+
+    Claimed entries have ``next_attempt_at`` pushed forward by the lease so a
+    crashed worker's batch becomes due again instead of being lost. On
+    PostgreSQL, ``skip_locked`` lets several workers drain in parallel.
+    """
+    return _claim(OutboxEntry.objects.filter(digest_recipient='').order_by('next_attempt_at'), batch_size)
+
+
+def claim_digests(batch_size):
+    """Lease the due digest entries for up to ``batch_size`` digests.
+
+    Returns a list of groups, each holding one recipient's entries for a
+    single digest email of at most ``EMAIL_DIGEST_MAX_ITEMS`` lines.
+    """
+    size = settings.EMAIL_DIGEST_MAX_ITEMS
+    entries = _claim(
+        OutboxEntry.objects.exclude(digest_recipient='').order_by('digest_recipient', 'next_attempt_at', 'pk'),
+        batch_size * size,
+    )
+    groups = []
+    for _, items in itertools.groupby(entries, key=lambda entry: entry.digest_recipient):
+        items = list(items)
+        groups.extend(items[i:i + size] for i in range(0, len(items), size))
+    return groups
+
+
+def _claim(entries, limit):
+    now = timezone.now()
+    with transaction.atomic():
+        entries = list(
+            entries.select_for_update(skip_locked=True)
+            .filter(status='pending', next_attempt_at__lte=now)[:limit]
+        )
+        if entries:
+            lease_until = now + timedelta(seconds=settings.EMAIL_OUTBOX_LEASE_SECONDS)
+            OutboxEntry.objects.filter(pk__in=[entry.pk for entry in entries]).update(next_attempt_at=lease_until)
+    return entries
+
+
+def _mark_records_sent(entries):
+    ids = {}
+    for entry in entries:
+        if entry.content_type_id is not None:
+            ids.setdefault(entry.content_type_id, []).extend(entry.object_ids)
+    for content_type_id, object_ids in ids.items():
+        if object_ids:
+            model = ContentType.objects.get_for_id(content_type_id).model_class()
+            model.objects.filter(pk__in=object_ids).update(email_sent=True)
+
+
+def _send(payload, connection):
+    # Opening is a no-op once connected; the batch shares one session.
+    connection.open()
+    message = EmailMessage(
+        subject=payload['subject'],
+        body=payload['body'],
+        from_email=payload['from_email'],
+        to=payload['to'],
+        connection=connection,
+    )
+    with timed_email_send(connection):
+        connection.send_messages([message])
+
+
+def _record_failure(entry, error):
+    entry.attempts += 1
+    entry.last_error = f"{error.__class__.__name__}: {error}"
+    if entry.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+        entry.status = 'dead'
+    else:
+        entry.next_attempt_at = timezone.now() + backoff_delay(entry.attempts)
+    entry.save(update_fields=['sent_count', 'attempts', 'last_error', 'status', 'next_attempt_at'])
+    logger.warning('Notification delivery failed', extra={
+        'outbox_id': entry.pk, 'attempts': entry.attempts, 'status': entry.status, 'error': entry.last_error,
+    })
+
+
+def deliver(entry, connection):
+    """Send the remaining messages of ``entry`` over an open connection.
+
+    Progress is tracked in ``sent_count`` so a retry never re-sends messages
+    that already went out. Returns True when the entry is fully delivered.
+    """
+    try:
+        for payload in entry.messages[entry.sent_count:]:
+            _send(payload, connection)
+            entry.sent_count += 1
+    except Exception as e:
+        # Drop the (possibly broken) connection; the next send reopens it.
+        with contextlib.suppress(Exception):
+            connection.close()
+        _record_failure(entry, e)
+        return False
+
+    with transaction.atomic():
+        entry.status = 'sent'
+        entry.sent_at = timezone.now()
+        entry.save(update_fields=['sent_count', 'status', 'sent_at'])
+        _mark_records_sent([entry])
+    logger.info('Notification sent', extra={'outbox_id': entry.pk, 'messages': entry.sent_count})
+    return True
+
+
+def digest_email(entries):
+    """One recipient's digest of ``entries``, their lines grouped by section."""
+    sections = {}
+    for entry in entries:
+        sections.setdefault(entry.digest_section, []).append(entry.digest_line)
+    since = timezone.localtime(min(entry.created_at for entry in entries))
+    body = [f'{len(entries)} new notifications since {since:%Y-%m-%d %H:%M}:', '']
+    for section, lines in sections.items():
+        body += [f'{section} ({len(lines)})', *lines, '']
+    return email(
+        subject=f'{len(entries)} New Notifications - Jevelon Technologies',
+        body='\n'.join(body),
+        recipients=[entries[0].digest_recipient],
+    )
+
+
+def deliver_digest(entries, connection):
+    """Send one recipient's ``entries`` as a single email; a lone entry goes out as queued.
+
+    Returns True when the digest was delivered. On failure every entry is
+    retried (or dead-lettered) as if it had been sent on its own.
+    """
+    payload = entries[0].messages[0] if len(entries) == 1 else digest_email(entries)
+    try:
+        _send(payload, connection)
+    except Exception as e:
+        with contextlib.suppress(Exception):
+            connection.close()
+        for entry in entries:
+            with bind_request_id(entry.request_id):
+                _record_failure(entry, e)
+        return False
+
+    with transaction.atomic():
+        OutboxEntry.objects.filter(pk__in=[entry.pk for entry in entries]).update(
+            status='sent', sent_count=1, sent_at=timezone.now(),
+        )
+        _mark_records_sent(entries)
+    for entry in entries:
+        with bind_request_id(entry.request_id):
+            logger.info('Notification sent', extra={'outbox_id': entry.pk, 'messages': 1, 'digest': len(entries)})
+    return True
+
+
+def deliver_pending(batch_size=None):
+    """Deliver one batch of due entries and digests over a single SMTP connection.
+
+    Returns a ``(sent, failed)`` tuple of entry counts.
+    """
+    batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+    entries = claim_batch(batch_size)
+    digests = claim_digests(batch_size)
+    if not entries and not digests:
+        return 0, 0
+
+    sent = failed = 0
+    connection = get_connection()
+    try:
+        for entry in entries:
+            with bind_request_id(entry.request_id):
+                delivered = deliver(entry, connection)
+            if delivered:
+                sent += 1
+            else:
+                failed += 1
+        for group in digests:
+            if deliver_digest(group, connection):
+                sent += len(group)
+            else:
+                failed += len(group)
+    finally:
+        with contextlib.suppress(Exception):
+            connection.close()
+    return sent, failed
@@ -0,0 +1,106 @@
+"""
+A minimal in-process SMTP server for tests and benchmarks.
+
+It speaks just enough of RFC 5321 for ``smtplib`` (EHLO/HELO, MAIL, RCPT,
+DATA, RSET, NOOP, QUIT), records every accepted message and counts
+connections, and can add an artificial delay per reply to model the round
+trips to a remote relay such as smtp.sendgrid.net.
+"""
+
+import socketserver
+import threading
+import time
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        self.wfile.write(line.encode('ascii') + b'\r\n')
+        self.wfile.flush()
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+            generation = server.generation
+        if server.connect_delay:
+            time.sleep(server.connect_delay)
+        self.reply('220 localhost fake SMTP ready')
+        sender, recipients = None, []
+        while True:
+            line = self.rfile.readline()
+            if not line or generation != server.generation:
+                return
+            command = line.decode('ascii', 'replace').strip()
+            verb = command[:4].upper()
+            if verb == 'EHLO':
+                self.reply('250-localhost')
+                self.reply('250 8BITMIME')
+            elif verb == 'HELO':
+                self.reply('250 localhost')
+            elif verb == 'MAIL':
+                sender, recipients = command[10:].strip('<> '), []
+                self.reply('250 OK')
+            elif verb == 'RCPT':
+                recipients.append(command[8:].strip('<> '))
+                self.reply('250 OK')
+            elif verb == 'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                data = []
+                for data_line in iter(self.rfile.readline, b''):
+                    if data_line in (b'.\r\n', b'.\n'):
+                        break
+                    data.append(data_line)
+                with server.lock:
+                    server.messages.append((sender, recipients, b''.join(data)))
+                self.reply('250 OK queued')
+            elif verb == 'RSET':
+                sender, recipients = None, []
+                self.reply('250 OK')
+            elif verb == 'NOOP':
+                self.reply('250 OK')
+            elif verb == 'QUIT':
+                self.reply('221 Bye')
+                return
+            else:
+                self.reply('502 Command not implemented')
+
+
+class FakeSMTPServer(socketserver.ThreadingTCPServer):
+    """Threaded fake relay; use as a context manager.
+
+    ``latency`` is slept before every reply and ``connect_delay`` once per
+    connection (standing in for the TLS handshake and AUTH exchange).
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0, connect_delay=0.0):
+        super().__init__((host, port), _SMTPHandler)
+        self.latency = latency
+        self.connect_delay = connect_delay
+        self.messages = []
+        self.connections = 0
+        self.lock = threading.Lock()
+        self.generation = 0
+        self._thread = None
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def drop_connections(self):
+        """Make sessions that are open now hang up on their next command."""
+        with self.lock:
+            self.generation += 1
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
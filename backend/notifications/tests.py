@@ -0,0 +1,245 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core import mail
+from django.core.cache import caches
+from django.core.mail import EmailMessage, get_connection, send_mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from consultation.models import Consultation
+from contact.models import Contact
+from jevelon_backend.testing import QueryPlanMixin
+from support.models import SupportTicket
+from .models import OutboxEntry
+from .outbox import deliver_pending, window_end
+from .smtp_server import FakeSMTPServer
+
+
+def run_worker():
+    # The worker closes stale connections between batches, which would
+    # close the connection holding the test's transaction.
+    with mock.patch('notifications.management.commands.process_outbox.close_old_connections'):
+        call_command('process_outbox', '--once', stdout=StringIO())
+
+
+class FailingBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        raise ConnectionRefusedError('relay unavailable')
+
+
+CONTACT_PAYLOAD = {
+    'name': 'Asha Verma',
+    'email': 'asha@example.com',
+    'service': 'web-development',
+    'message': 'We need a new marketing site.',
+}
+
+CONSULTATION_PAYLOAD = {
+    'name': 'Ravi Kumar',
+    'email': 'ravi@example.com',
+    'project_type': 'mobile-app',
+    'preferred_date': '2026-11-02',
+    'preferred_time': '10:00 AM',
+}
+
+
+class OutboxTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        caches['idempotency'].clear()
+
+    def test_submission_queues_email_without_sending(self):
+        response = self.client.post('/api/contact/submit/', CONTACT_PAYLOAD, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(mail.outbox), 0)
+        entry = OutboxEntry.objects.get()
+        self.assertEqual(entry.status, 'pending')
+        self.assertEqual(entry.object_ids, [Contact.objects.get().pk])
+
+    def test_worker_delivers_and_marks_record(self):
+        self.client.post('/api/consultation/schedule/', CONSULTATION_PAYLOAD, format='json')
+
+        run_worker()
+
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(mail.outbox[0].to, ['ravi@example.com'])
+        self.assertEqual(OutboxEntry.objects.get().status, 'sent')
+        self.assertTrue(Consultation.objects.get().email_sent)
+
+    @override_settings(EMAIL_BACKEND='notifications.tests.FailingBackend')
+    def test_failure_backs_off_and_keeps_record_unsent(self):
+        self.client.post('/api/contact/submit/', CONTACT_PAYLOAD, format='json')
+        OutboxEntry.objects.update(next_attempt_at=timezone.now())  # end of the digest window
+
+        self.assertEqual(deliver_pending(), (0, 1))
+
+        entry = OutboxEntry.objects.get()
+        self.assertEqual(entry.status, 'pending')
+        self.assertEqual(entry.attempts, 1)
+        self.assertIn('relay unavailable', entry.last_error)
+        self.assertGreater(entry.next_attempt_at, timezone.now())
+        self.assertFalse(Contact.objects.get().email_sent)
+        # Not due again until the backoff expires.
+        self.assertEqual(deliver_pending(), (0, 0))
+
+    @override_settings(EMAIL_BACKEND='notifications.tests.FailingBackend', EMAIL_OUTBOX_MAX_ATTEMPTS=2)
+    def test_entry_is_dead_lettered_after_max_attempts(self):
+        self.client.post('/api/contact/submit/', CONTACT_PAYLOAD, format='json')
+
+        for _ in range(2):
+            OutboxEntry.objects.update(next_attempt_at=timezone.now())
+            deliver_pending()
+
+        self.assertEqual(OutboxEntry.objects.get().status, 'dead')
+
+
+def ticket_payload(i, priority):
+    return {
+        'name': 'Asha Verma', 'email': f'asha{i}@example.com', 'priority': priority,
+        'subject': f'Issue {i}', 'message': f'Details of issue {i}.',
+    }
+
+
+def end_window():
+    OutboxEntry.objects.filter(status='pending').update(next_attempt_at=timezone.now())
+
+
+@override_settings(EMAIL_DIGEST_WINDOWS={'medium': 300, 'low': 1800, 'contact': 900}, EMAIL_DIGEST_MAX_ITEMS=50)
+class DigestTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        caches['idempotency'].clear()
+
+    def test_urgent_tickets_are_sent_at_once_and_the_rest_wait(self):
+        ids = [
+            self.client.post('/api/support/submit/', ticket_payload(i, priority), format='json').json()['ticket_id']
+            for i, priority in enumerate(['critical', 'high', 'medium', 'low'])
+        ]
+        self.client.post('/api/contact/submit/', CONTACT_PAYLOAD, format='json')
+
+        self.assertEqual(deliver_pending(), (2, 0))
+        self.assertEqual([message.subject for message in mail.outbox],
+                         [f'New Support Ticket #{ids[0]} - Issue 0', f'New Support Ticket #{ids[1]} - Issue 1'])
+
+        end_window()
+        self.assertEqual(deliver_pending(), (3, 0))
+
+        [digest] = mail.outbox[2:]
+        self.assertEqual(digest.subject, '3 New Notifications - Jevelon Technologies')
+        self.assertEqual(digest.to, ['admin@jevelon.com'])
+        self.assertIn(f'Support tickets (2)\n- #{ids[2]} [Medium/Other] Issue 2', digest.body)
+        self.assertIn('Contact form submissions (1)\n- Asha Verma <asha@example.com>', digest.body)
+        self.assertEqual(SupportTicket.objects.filter(email_sent=False).count(), 0)
+        self.assertTrue(Contact.objects.get().email_sent)
+
+    def test_load_sends_an_order_of_magnitude_fewer_emails(self):
+        for i in range(300):
+            self.client.post('/api/support/submit/', ticket_payload(i, ['medium', 'low'][i % 2]), format='json')
+        end_window()
+
+        run_worker()
+
+        # One window's 300 notifications: six digests of 50 instead of 300 emails.
+        self.assertEqual(len(mail.outbox), 6)
+        self.assertEqual(OutboxEntry.objects.filter(status='sent').count(), 300)
+
+    def test_full_digest_is_sent_before_the_window_ends(self):
+        with self.settings(EMAIL_DIGEST_MAX_ITEMS=3):
+            for i in range(4):
+                self.client.post('/api/support/submit/', ticket_payload(i, 'low'), format='json')
+
+            self.assertEqual(deliver_pending(), (3, 0))
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn('Issue 2', mail.outbox[0].body)
+        self.assertEqual(OutboxEntry.objects.filter(status='pending').count(), 1)
+
+    def test_lone_notification_is_sent_as_queued(self):
+        self.client.post('/api/contact/submit/', CONTACT_PAYLOAD, format='json')
+        end_window()
+
+        deliver_pending()
+
+        self.assertEqual(mail.outbox[0].subject, 'New Contact Form Submission - Jevelon Technologies')
+
+    @override_settings(EMAIL_BACKEND='notifications.tests.FailingBackend')
+    def test_failed_digest_retries_every_entry(self):
+        for i in range(2):
+            self.client.post('/api/support/submit/', ticket_payload(i, 'low'), format='json')
+        end_window()
+
+        self.assertEqual(deliver_pending(), (0, 2))
+
+        self.assertEqual(set(OutboxEntry.objects.values_list('status', 'attempts')), {('pending', 1)})
+        self.assertFalse(SupportTicket.objects.filter(email_sent=True).exists())
+
+    def test_windows_are_aligned(self):
+        now = timezone.now()
+        end = window_end(1800, now)
+
+        # The last five-minute window of the half hour ends with it.
+        self.assertEqual(window_end(300, end - timedelta(seconds=1)), end)
+        self.assertEqual(end.timestamp() % 1800, 0)
+        self.assertGreater(window_end(300, now), now)
+
+    @override_settings(EMAIL_DIGEST_WINDOWS={})
+    def test_kinds_without_a_window_are_sent_at_once(self):
+        self.client.post('/api/contact/submit/', CONTACT_PAYLOAD, format='json')
+
+        self.assertEqual(deliver_pending(), (1, 0))
+
+
+class PooledSMTPBackendTests(TestCase):
+    def setUp(self):
+        self.server = FakeSMTPServer().__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+        self.params = {
+            'backend': 'notifications.backends.PooledSMTPEmailBackend',
+            'host': '127.0.0.1',
+            'port': self.server.port,
+            'username': '',
+            'password': '',
+            'use_tls': False,
+        }
+        self.addCleanup(lambda: get_connection(**self.params).discard())
+
+    def send(self, subject):
+        return send_mail(subject, 'Body', 'hello@jevelon.com', ['admin@jevelon.com'],
+                         connection=get_connection(**self.params))
+
+    def test_connection_is_reused_across_send_mail_calls(self):
+        for i in range(3):
+            self.assertEqual(self.send(f'Message {i}'), 1)
+
+        self.assertEqual(len(self.server.messages), 3)
+        self.assertEqual(self.server.connections, 1)
+
+    def test_batch_is_sent_over_one_connection(self):
+        messages = [EmailMessage(f'Message {i}', 'Body', 'hello@jevelon.com', ['admin@jevelon.com'])
+                    for i in range(5)]
+
+        with get_connection(**self.params) as connection:
+            self.assertEqual(connection.send_messages(messages), 5)
+
+        self.assertEqual(self.server.connections, 1)
+
+    def test_reconnects_when_relay_drops_connection(self):
+        self.send('Before drop')
+        self.server.drop_connections()
+
+        self.assertEqual(self.send('After drop'), 1)
+
+        self.assertEqual(len(self.server.messages), 2)
+        self.assertEqual(self.server.connections, 2)
+
+
+class OutboxQueryPlanTests(QueryPlanMixin, TestCase):
+    def test_claim_query_uses_partial_index(self):
+        due = OutboxEntry.objects.filter(status='pending', next_attempt_at__lte=timezone.now())
+        self.assertUsesIndex(due.order_by('next_attempt_at')[:50], 'outbox_pending_due_idx')
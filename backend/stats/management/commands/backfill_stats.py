@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from jevelon_backend import caching
+from stats.rollups import ROLLUPS
+
+
+class Command(BaseCommand):
+    help = (
+        'Recomputes the daily statistics rollups from the submission tables; run once after '
+        'migrating, or after writes that bypassed the model signals (raw SQL, QuerySet.update)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'rollups',
+            nargs='*',
+            help=f"Rollups to rebuild: {', '.join(ROLLUPS)} (default: all)",
+        )
+
+    def handle(self, *args, **options):
+        unknown = set(options['rollups']) - set(ROLLUPS)
+        if unknown:
+            raise CommandError(f"Unknown rollup(s): {', '.join(sorted(unknown))}")
+        for name in options['rollups'] or ROLLUPS:
+            rollup = ROLLUPS[name]
+            started = time.perf_counter()
+            rows = rollup.rebuild()
+            caching.invalidate(rollup.source)
+            self.stdout.write(f'{name}: {rows} daily rows in {time.perf_counter() - started:.2f}s')
+        self.stdout.write(self.style.SUCCESS('Backfill complete'))
@@ -0,0 +1,55 @@
+# Generated by Django 5.0 on 2026-10-18 14:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConsultationDailyCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('count', models.IntegerField(default=0)),
+                ('project_type', models.CharField(max_length=50)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ContactDailyCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('count', models.IntegerField(default=0)),
+                ('service', models.CharField(max_length=50)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='TicketDailyCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('count', models.IntegerField(default=0)),
+                ('priority', models.CharField(choices=[('low', 'Low'), ('medium', 'Medium'), ('high', 'High'), ('critical', 'Critical')], max_length=20)),
+                ('category', models.CharField(choices=[('bug', 'Bug Report'), ('feature', 'Feature Request'), ('performance', 'Performance Issue'), ('security', 'Security Concern'), ('other', 'Other')], max_length=20)),
+                ('status', models.CharField(choices=[('open', 'Open'), ('in_progress', 'In Progress'), ('resolved', 'Resolved'), ('closed', 'Closed')], max_length=20)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='consultationdailycount',
+            constraint=models.UniqueConstraint(fields=('day', 'project_type'), name='consultation_daily_count_key'),
+        ),
+        migrations.AddConstraint(
+            model_name='contactdailycount',
+            constraint=models.UniqueConstraint(fields=('day', 'service'), name='contact_daily_count_key'),
+        ),
+        migrations.AddConstraint(
+            model_name='ticketdailycount',
+            constraint=models.UniqueConstraint(fields=('day', 'priority', 'category', 'status'), name='ticket_daily_count_key'),
+        ),
+    ]
@@ -0,0 +1,56 @@
+from django.db import models
+
+from support.models import SupportTicket
+
+
+class DailyCount(models.Model):
+    """Rows of a submission table created on ``day``, per combination of dimensions.
+
+    Kept up to date by ``stats.rollups`` as rows are inserted, change
+    dimension or are deleted, so reports read one row per day and
+    combination instead of scanning the submissions.
+    """
+
+    day = models.DateField()
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        abstract = True
+
+
+class TicketDailyCount(DailyCount):
+    priority = models.CharField(max_length=20, choices=SupportTicket.PRIORITY_CHOICES)
+    category = models.CharField(max_length=20, choices=SupportTicket.CATEGORY_CHOICES)
+    status = models.CharField(max_length=20, choices=SupportTicket.STATUS_CHOICES)
+
+    def __str__(self):
+        return f"{self.day} {self.priority}/{self.category}/{self.status}: {self.count}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'priority', 'category', 'status'], name='ticket_daily_count_key'),
+        ]
+
+
+class ContactDailyCount(DailyCount):
+    service = models.CharField(max_length=50)
+
+    def __str__(self):
+        return f"{self.day} {self.service}: {self.count}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'service'], name='contact_daily_count_key'),
+        ]
+
+
+class ConsultationDailyCount(DailyCount):
+    project_type = models.CharField(max_length=50)
+
+    def __str__(self):
+        return f"{self.day} {self.project_type}: {self.count}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'project_type'], name='consultation_daily_count_key'),
+        ]
@@ -0,0 +1,126 @@
+"""
+Daily submission counts, maintained incrementally.
+
+Each ``Rollup`` keeps one row per day and combination of dimensions (e.g.
+a ticket's priority, category and status) holding how many source rows
+created that day currently have those values. The ``stats.signals``
+handlers adjust the counts inside the saving transaction: an insert adds
+one, a change of dimension (a ticket being resolved) moves one from the
+old combination to the new one and a delete takes one away, each a single
+indexed UPDATE. ``bulk_create`` sends no signals, so bulk ingest and
+seeding call ``record`` themselves; ``rebuild`` (``manage.py backfill_stats``)
+recomputes everything from the source tables.
+
+Reports then read O(days) rollup rows instead of aggregating O(rows).
+"""
+
+from collections import Counter
+
+from django.db import IntegrityError, connections, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from consultation.models import Consultation
+from contact.models import Contact
+from support.models import SupportTicket
+from .models import ConsultationDailyCount, ContactDailyCount, TicketDailyCount
+
+
+class Rollup:
+    """Daily counts of ``source`` rows by ``dimensions``, stored in ``table``."""
+
+    def __init__(self, source, table, dimensions):
+        self.source = source
+        self.table = table
+        self.dimensions = dimensions
+        self.fields = ('day', *dimensions)
+
+    def key(self, instance):
+        return (timezone.localdate(instance.created_at), *(getattr(instance, name) for name in self.dimensions))
+
+    def stored_key(self, pk):
+        """The key of the saved row ``pk``, locked until the transaction ends where supported."""
+        rows = self.source.objects.filter(pk=pk)
+        if connections[rows.db].in_atomic_block:
+            rows = rows.select_for_update()
+        values = rows.values_list('created_at', *self.dimensions).first()
+        return (timezone.localdate(values[0]), *values[1:]) if values else None
+
+    def add(self, key, delta):
+        """Add ``delta`` to the count for ``key``, creating its row if needed."""
+        rows = self.table.objects.filter(**dict(zip(self.fields, key)))
+        if rows.update(count=F('count') + delta):
+            return
+        try:
+            with transaction.atomic():
+                self.table.objects.create(count=delta, **dict(zip(self.fields, key)))
+            return
+        except IntegrityError:
+            # A concurrent insert just created the row.
+            pass
+        rows.update(count=F('count') + delta)
+
+    def record(self, instances, delta=1):
+        """Count ``instances`` in, with one write per distinct key."""
+        for key, count in Counter(self.key(instance) for instance in instances).items():
+            self.add(key, delta * count)
+
+    def rebuild(self):
+        """Recompute every count from the source table; returns the number of rows written."""
+        table = self.table._meta.db_table
+        with transaction.atomic():
+            connection = connections[self.table.objects.db]
+            if connection.vendor == 'postgresql':
+                # Incremental updates wait until the new counts are in place,
+                # so a submission is counted either here or by its own update.
+                with connection.cursor() as cursor:
+                    cursor.execute(f'LOCK TABLE "{table}" IN EXCLUSIVE MODE')
+            # Deleting first also takes SQLite's write lock before the counts are read.
+            self.table.objects.all().delete()
+            counts = (
+                self.source.objects.order_by()
+                .annotate(day=TruncDate('created_at'))
+                .values_list('day', *self.dimensions)
+                .annotate(count=Count('id'))
+            )
+            return len(self.table.objects.bulk_create(
+                (self.table(count=count, **dict(zip(self.fields, key))) for *key, count in counts.iterator()),
+                batch_size=1000,
+            ))
+
+    def report(self, start, end, rows=None):
+        """Totals for days ``start`` to ``end``: overall, per day and per value of each dimension."""
+        rows = (self.table.objects.all() if rows is None else rows).filter(day__range=(start, end))
+        daily = dict(rows.order_by().values_list('day').annotate(total=Sum('count')))
+        report = {
+            'total': sum(daily.values()),
+            'daily': [{'date': day, 'count': daily[day]} for day in sorted(daily)],
+        }
+        for name in self.dimensions:
+            field = self.table._meta.get_field(name)
+            totals = {value: 0 for value, _ in field.flatchoices}
+            totals.update(rows.order_by().values_list(name).annotate(total=Sum('count')))
+            report[f'by_{name}'] = totals
+        return report
+
+
+ROLLUPS = {
+    'tickets': Rollup(SupportTicket, TicketDailyCount, ('priority', 'category', 'status')),
+    'contacts': Rollup(Contact, ContactDailyCount, ('service',)),
+    'consultations': Rollup(Consultation, ConsultationDailyCount, ('project_type',)),
+}
+BY_SOURCE = {rollup.source: rollup for rollup in ROLLUPS.values()}
+
+
+def record(model, instances):
+    """Count rows of ``model`` inserted with ``bulk_create``; a no-op for models without a rollup."""
+    rollup = BY_SOURCE.get(model)
+    if rollup:
+        rollup.record(instances)
+
+
+def rebuild(model):
+    """Recompute ``model``'s counts after writes that bypassed the signals."""
+    rollup = BY_SOURCE.get(model)
+    return rollup.rebuild() if rollup else 0
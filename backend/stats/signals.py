@@ -0,0 +1,43 @@
+from django.db.models.signals import post_save, pre_delete, pre_save
+
+from .rollups import BY_SOURCE
+
+# Saves limited to other fields (e.g. update_fields=['email_sent']) cannot move a row.
+UNCHANGED = object()
+
+
+def load_stored_key(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Remember which count an existing row is in before the save changes it."""
+    rollup = BY_SOURCE[sender]
+    if raw or instance._state.adding:
+        instance._rollup_key = None
+    elif update_fields is not None and not {'created_at', *rollup.dimensions} & set(update_fields):
+        instance._rollup_key = UNCHANGED
+    else:
+        instance._rollup_key = rollup.stored_key(instance.pk)
+
+
+def count_saved(sender, instance, raw=False, **kwargs):
+    """Move the row's count from the key it was saved under to its current one."""
+    held = instance.__dict__.pop('_rollup_key', None)
+    if raw or held is UNCHANGED:
+        return
+    rollup = BY_SOURCE[sender]
+    key = rollup.key(instance)
+    if held != key:
+        if held:
+            rollup.add(held, -1)
+        rollup.add(key, 1)
+
+
+def count_deleted(sender, instance, **kwargs):
+    # Before the delete, while deferred fields can still be loaded.
+    rollup = BY_SOURCE[sender]
+    rollup.add(rollup.key(instance), -1)
+
+
+for source in BY_SOURCE:
+    label = source._meta.label_lower
+    pre_save.connect(load_stored_key, sender=source, dispatch_uid=f'stats:{label}:pre_save')
+    post_save.connect(count_saved, sender=source, dispatch_uid=f'stats:{label}:post_save')
+    pre_delete.connect(count_deleted, sender=source, dispatch_uid=f'stats:{label}:pre_delete')
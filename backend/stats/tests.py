@@ -0,0 +1,175 @@
+from datetime import date, timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.cache import cache, caches
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from contact.models import Contact
+from jevelon_backend.seeding import GENERATORS, seed
+from support.models import SupportTicket
+from .models import ContactDailyCount, TicketDailyCount
+from .rollups import ROLLUPS
+
+
+def make_ticket(**overrides):
+    fields = {
+        'name': 'Asha Verma',
+        'email': 'asha@example.com',
+        'subject': 'Login fails',
+        'message': 'The login button does nothing.',
+    }
+    fields.update(overrides)
+    return SupportTicket.objects.create(**fields)
+
+
+def counts(table, **filters):
+    return {
+        tuple(row[:-1]): row[-1]
+        for row in table.objects.filter(count__gt=0, **filters).values_list('priority', 'category', 'status', 'count')
+    }
+
+
+def snapshot():
+    return {
+        name: sorted(
+            (key, count) for *key, count in rollup.table.objects.filter(count__gt=0)
+            .values_list(*rollup.fields, 'count')
+        )
+        for name, rollup in ROLLUPS.items()
+    }
+
+
+class RollupMaintenanceTests(TestCase):
+    def setUp(self):
+        caches['idempotency'].clear()
+
+    def test_submission_is_counted_in_its_transaction(self):
+        payload = {
+            'name': 'Asha Verma', 'email': 'asha@example.com', 'priority': 'high', 'category': 'bug',
+            'subject': 'Login fails', 'message': 'The login button does nothing.',
+        }
+
+        APIClient().post('/api/support/submit/', payload, format='json')
+
+        self.assertEqual(counts(TicketDailyCount, day=timezone.localdate()), {('high', 'bug', 'open'): 1})
+
+    def test_status_change_moves_the_count(self):
+        ticket = make_ticket(priority='low')
+        make_ticket(priority='low')
+
+        ticket.status = 'resolved'
+        ticket.save()
+
+        self.assertEqual(counts(TicketDailyCount), {('low', 'other', 'open'): 1, ('low', 'other', 'resolved'): 1})
+
+    def test_delete_removes_the_count(self):
+        make_ticket().delete()
+
+        self.assertEqual(counts(TicketDailyCount), {})
+
+    def test_saves_of_other_fields_cost_no_extra_queries(self):
+        ticket = make_ticket()
+        ticket.email_sent = True
+
+        with self.assertNumQueries(1):
+            ticket.save(update_fields=['email_sent'])
+        with self.assertNumQueries(2):  # the stored key, then the UPDATE itself
+            ticket.save()
+
+    def test_bulk_ingest_is_counted(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user('ingest'))
+        items = [
+            {'name': 'Ravi Rao', 'email': f'ravi{i}@example.com', 'service': 'consulting', 'message': 'Hi'}
+            for i in range(3)
+        ]
+
+        client.post('/api/contact/bulk/', items, format='json')
+
+        self.assertEqual(list(ContactDailyCount.objects.values_list('service', 'count')), [('consulting', 3)])
+
+    def test_incremental_counts_match_a_rebuild(self):
+        until = date(2026, 6, 30)
+        for name in GENERATORS:
+            for _ in seed(GENERATORS[name](days=60, until=until), 150, batch_size=40):
+                pass
+        tickets = list(SupportTicket.objects.order_by('pk')[:20])
+        for ticket in tickets[:10]:
+            ticket.status = 'closed'
+            ticket.save()
+        for ticket in tickets[10:]:
+            ticket.delete()
+        incremental = snapshot()
+
+        call_command('backfill_stats', stdout=StringIO())
+
+        self.assertEqual(snapshot(), incremental)
+        self.assertEqual(sum(count for _, count in incremental['tickets']), 140)
+
+
+class StatsEndpointTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user('staff', is_staff=True))
+        self.today = timezone.localdate()
+
+    def test_requires_staff(self):
+        response = APIClient().get('/api/stats/')
+
+        self.assertIn(response.status_code, (401, 403))
+
+    def test_counts_by_dimension_and_day(self):
+        make_ticket(priority='high', category='bug')
+        make_ticket(priority='low', status='closed')
+        Contact.objects.create(name='Ravi Rao', email='ravi@example.com', service='consulting', message='Hi')
+        old = make_ticket(priority='critical')
+        SupportTicket.objects.filter(pk=old.pk).update(created_at=timezone.now() - timedelta(days=40))
+        call_command('backfill_stats', 'tickets', stdout=StringIO())
+
+        data = self.client.get('/api/stats/').json()
+
+        self.assertEqual(data['tickets']['total'], 2)
+        self.assertEqual(data['tickets']['by_priority'], {'low': 1, 'medium': 0, 'high': 1, 'critical': 0})
+        self.assertEqual(data['tickets']['by_status']['closed'], 1)
+        self.assertEqual(data['tickets']['daily'], [{'date': self.today.isoformat(), 'count': 2}])
+        self.assertEqual(data['contacts']['by_service'], {'consulting': 1})
+        self.assertEqual(data['consultations']['total'], 0)
+
+        wide = self.client.get('/api/stats/', {'from': (self.today - timedelta(days=60)).isoformat()}).json()
+        self.assertEqual(wide['tickets']['total'], 3)
+
+    def test_ticket_filters(self):
+        make_ticket(priority='high')
+        make_ticket(priority='low')
+
+        data = self.client.get('/api/stats/', {'priority': 'high,critical'}).json()
+
+        self.assertEqual(data['tickets']['total'], 1)
+        self.assertEqual(data['contacts']['total'], 0)
+
+    def test_queries_do_not_grow_with_rows(self):
+        make_ticket()
+        with self.assertNumQueries(8):  # user lookup excluded: 1 daily + 3 dimensions, 2 + 2 for the others
+            self.client.get('/api/stats/')
+        for i in range(30):
+            make_ticket(priority=['low', 'high'][i % 2], subject=f'Ticket {i}')
+        cache.clear()
+        with self.assertNumQueries(8):
+            self.client.get('/api/stats/')
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/stats/')
+        self.assertEqual(response['X-Cache'], 'HIT')
+
+    def test_invalid_range_is_rejected(self):
+        response = self.client.get('/api/stats/', {'from': '2026-02-30', 'to': 'soon'})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.json()['errors']), {'from', 'to'})
+
+        response = self.client.get('/api/stats/', {'from': '2026-03-02', 'to': '2026-03-01'})
+        self.assertIn('to', response.json()['errors'])
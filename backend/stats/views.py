@@ -0,0 +1,73 @@
+from datetime import timedelta
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+from jevelon_backend import caching
+from jevelon_backend.filters import filter_queryset
+from .rollups import ROLLUPS
+
+
+def _date_range(params):
+    """``(from, to)`` from ``YYYY-MM-DD`` params; the last 30 days by default."""
+    errors = {}
+    bounds = {}
+    for param in ('from', 'to'):
+        value = params.get(param)
+        try:
+            bounds[param] = parse_date(value) if value else None
+        except ValueError:  # well formed but impossible, e.g. 2026-02-30
+            bounds[param] = None
+        if value and bounds[param] is None:
+            errors[param] = ['Enter a date in YYYY-MM-DD format.']
+    if not errors:
+        end = bounds['to'] or timezone.localdate()
+        start = bounds['from'] or end - timedelta(days=29)
+        if end < start:
+            errors['to'] = ['Must not be before "from".']
+    if errors:
+        raise ValidationError(errors)
+    return start, end
+
+
+def _report(params):
+    start, end = _date_range(params)
+    tickets = ROLLUPS['tickets']
+    ticket_rows = filter_queryset(tickets.table.objects.all(), params, fields=tickets.dimensions)
+    return {
+        'success': True,
+        'from': start,
+        'to': end,
+        'tickets': tickets.report(start, end, ticket_rows),
+        'contacts': ROLLUPS['contacts'].report(start, end),
+        'consultations': ROLLUPS['consultations'].report(start, end),
+    }
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def get_stats(request):
+    """Submission counts between ``from`` and ``to`` (inclusive, by creation day).
+
+    Tickets are broken down by priority, category and status and can be
+    narrowed with the same ``priority``/``category``/``status`` filters as
+    the listing; contacts by service, consultations by project type. Read
+    from the daily rollups, so the cost grows with the days asked for, not
+    the rows submitted.
+    """
+    try:
+        models = [rollup.source for rollup in ROLLUPS.values()]
+        data, hit = caching.cached('stats', models, caching.request_key(request), lambda: _report(request.query_params))
+        response = Response(data, status=status.HTTP_200_OK)
+        response['X-Cache'] = 'HIT' if hit else 'MISS'
+        return response
+    except ValidationError as e:
+        return Response({
+            'success': False,
+            'errors': e.detail
+        }, status=status.HTTP_400_BAD_REQUEST)
@@ -1,13 +1,17 @@
 from django.contrib import admin
+
+from jevelon_backend.admin import LargeTableAdminMixin
+from jevelon_backend.search import FullTextSearchAdminMixin
 from .models import SupportTicket
 
 @admin.register(SupportTicket)
-class SupportTicketAdmin(admin.ModelAdmin):
+class SupportTicketAdmin(LargeTableAdminMixin, FullTextSearchAdminMixin, admin.ModelAdmin):
     list_display = ['id', 'name', 'email', 'priority', 'category', 'subject', 'status', 'created_at']
     list_filter = ['priority', 'category', 'status', 'created_at']
     search_fields = ['name', 'email', 'subject', 'message']
     readonly_fields = ['created_at', 'updated_at']
     ordering = ['-created_at']
+    date_hierarchy = 'created_at'
     
     fieldsets = (
         ('Basic Information', {
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class SupportConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'support'
+
+    def ready(self):
+        from jevelon_backend import caching
+        caching.watch(self.get_model('SupportTicket'))
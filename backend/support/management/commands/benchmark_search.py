@@ -0,0 +1,80 @@
+import statistics
+import time
+from functools import reduce
+from operator import and_, or_
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Q
+from django.test.utils import setup_test_environment
+
+from jevelon_backend.seeding import SupportTicketGenerator, seed
+from support.models import SupportTicket
+
+# Admin search fields before the full-text index replaced them.
+SEARCH_FIELDS = ('name', 'email', 'subject', 'message')
+# Common, rare and absent terms: a scan can stop early only when matches are everywhere.
+QUERIES = ('checkout', 'dashboard slow', 'vulnerability report', 'refund')
+
+
+class Command(BaseCommand):
+    help = (
+        'Measures support ticket search latency at increasing table sizes, full-text index vs '
+        'the icontains scan the admin used to run, on a throwaway test database'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            default='10000,100000,1000000',
+            help='Comma-separated table sizes to measure at',
+        )
+        parser.add_argument('--page-size', type=int, default=50)
+        parser.add_argument('--repeat', type=int, default=10, help='Queries timed per measurement')
+        parser.add_argument('--batch-size', type=int, default=10000, help='Rows per bulk_create')
+
+    def handle(self, *args, **options):
+        sizes = sorted(int(size) for size in options['sizes'].split(','))
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0)
+        try:
+            self.run(sizes, options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def run(self, sizes, options):
+        page_size, repeat = options['page_size'], options['repeat']
+        generator = SupportTicketGenerator()
+        self.stdout.write(
+            f"{'rows':>10} {'query':<22} {'matches':>9} {'ranked ms':>10} {'newest ms':>10} {'icontains ms':>13} "
+            f"{'count ms':>9} {'icontains count ms':>19}"
+        )
+        for size in sizes:
+            for _ in seed(generator, size - SupportTicket.objects.count(), options['batch_size']):
+                pass
+            for query in QUERIES:
+                matches = SupportTicket.search_index.search(SupportTicket.objects.all(), query)
+                ranked = SupportTicket.search_index.search(SupportTicket.objects.all(), query, rank=True)
+                scan = SupportTicket.objects.filter(reduce(and_, (
+                    reduce(or_, (Q(**{f'{field}__icontains': term}) for field in SEARCH_FIELDS))
+                    for term in query.split()
+                )))
+                ranked_ms = self.median_ms(lambda: list(ranked.order_by('-search_rank', '-pk')[:page_size]), repeat)
+                newest_ms = self.median_ms(lambda: list(matches.order_by('-created_at', '-id')[:page_size]), repeat)
+                scan_ms = self.median_ms(lambda: list(scan.order_by('-created_at', '-id')[:page_size]), repeat)
+                # The admin changelist also counts the matches.
+                count_ms = self.median_ms(matches.count, repeat)
+                scan_count_ms = self.median_ms(scan.count, repeat)
+                self.stdout.write(
+                    f'{size:>10} {query:<22} {matches.count():>9} {ranked_ms:>10.2f} {newest_ms:>10.2f} '
+                    f'{scan_ms:>13.2f} {count_ms:>9.2f} {scan_count_ms:>19.2f}'
+                )
+
+    @staticmethod
+    def median_ms(func, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
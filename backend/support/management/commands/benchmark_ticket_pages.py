@@ -0,0 +1,83 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import setup_test_environment
+from rest_framework.test import APIClient
+
+from jevelon_backend.pagination import after_position, encode_cursor
+from jevelon_backend.seeding import SupportTicketGenerator, seed
+from support.models import SupportTicket
+
+COLUMNS = ('id', 'subject', 'status', 'priority', 'created_at')
+
+
+class Command(BaseCommand):
+    help = (
+        'Measures ticket listing latency at increasing table sizes and page depths, '
+        'keyset cursor vs OFFSET, on a throwaway test database'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            default='10000,100000,1000000',
+            help='Comma-separated table sizes to measure at',
+        )
+        parser.add_argument('--page-size', type=int, default=50)
+        parser.add_argument('--repeat', type=int, default=20, help='Requests timed per measurement')
+        parser.add_argument('--batch-size', type=int, default=10000, help='Rows per bulk_create')
+
+    def handle(self, *args, **options):
+        sizes = sorted(int(size) for size in options['sizes'].split(','))
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0)
+        try:
+            self.run(sizes, options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def run(self, sizes, options):
+        client = APIClient()
+        page_size = options['page_size']
+        generator = SupportTicketGenerator()
+        self.stdout.write(f"{'rows':>10} {'depth':>6} {'api ms':>10} {'keyset ms':>10} {'offset ms':>10}")
+        for size in sizes:
+            for _ in seed(generator, size - SupportTicket.objects.count(), options['batch_size']):
+                pass
+            for depth in (0.0, 0.5, 0.99):
+                offset = int(size * depth)
+                api_ms, keyset_ms = self.time_keyset(client, offset, page_size, options['repeat'])
+                offset_ms = self.time_offset(offset, page_size, options['repeat'])
+                self.stdout.write(
+                    f'{size:>10} {depth:>6.0%} {api_ms:>10.2f} {keyset_ms:>10.2f} {offset_ms:>10.2f}'
+                )
+
+    def time_keyset(self, client, offset, page_size, repeat):
+        """Time one page through the API and as a bare keyset query."""
+        params = {'page_size': page_size, 'fields': ','.join(COLUMNS)}
+        queryset = SupportTicket.objects.only(*COLUMNS)
+        if offset:
+            # Locating the starting row is setup, not part of the measurement.
+            row = SupportTicket.objects.order_by('-created_at', '-id').only('created_at')[offset - 1]
+            params['cursor'] = encode_cursor(row.created_at, row.pk)
+            queryset = queryset.filter(after_position(row.created_at, row.pk))
+        queryset = queryset.order_by('-created_at', '-id')
+        return (
+            self.median_ms(lambda: client.get('/api/support/tickets/', params), repeat),
+            self.median_ms(lambda: list(queryset[:page_size]), repeat),
+        )
+
+    def time_offset(self, offset, page_size, repeat):
+        queryset = SupportTicket.objects.order_by('-created_at', '-id').only(*COLUMNS)
+        return self.median_ms(lambda: list(queryset[offset:offset + page_size]), repeat)
+
+    @staticmethod
+    def median_ms(func, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
@@ -0,0 +1,17 @@
+# Generated by Django 5.0 on 2026-10-18 12:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('support', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='supportticket',
+            index=models.Index(fields=['-created_at', '-id'], name='ticket_recent_idx'),
+        ),
+    ]
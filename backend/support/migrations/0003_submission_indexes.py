@@ -0,0 +1,29 @@
+# Generated by Django 5.0 on 2026-10-18 12:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('support', '0002_ticket_recent_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='supportticket',
+            index=models.Index(fields=['status', '-created_at'], name='ticket_status_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='supportticket',
+            index=models.Index(fields=['category', '-created_at'], name='ticket_category_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='supportticket',
+            index=models.Index(condition=models.Q(('status', 'open')), fields=['priority', '-created_at'], name='ticket_open_priority_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='supportticket',
+            index=models.Index(condition=models.Q(('email_sent', False)), fields=['created_at'], name='ticket_unsent_idx'),
+        ),
+    ]
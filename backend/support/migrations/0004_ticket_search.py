@@ -0,0 +1,17 @@
+from django.db import migrations
+
+from jevelon_backend.search import FullTextIndex
+
+# Columns as of this migration, so later model changes do not rewrite history.
+index = FullTextIndex('support_supportticket', {'subject': 'A', 'message': 'B', 'name': 'C', 'email': 'C'})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('support', '0003_submission_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(index.install, index.uninstall),
+    ]
@@ -1,5 +1,7 @@
 from django.db import models
 
+from jevelon_backend.search import FullTextIndex
+
 # Create your models here.
 
 class SupportTicket(models.Model):
@@ -35,9 +37,27 @@ class SupportTicket(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     email_sent = models.BooleanField(default=False)
+
+    search_index = FullTextIndex('support_supportticket', {'subject': 'A', 'message': 'B', 'name': 'C', 'email': 'C'})
     
     def __str__(self):
         return f"{self.name} - {self.subject} ({self.status})"
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Keyset pagination order for the ticket listing.
+            models.Index(fields=['-created_at', '-id'], name='ticket_recent_idx'),
+            # Delta sync order: changes since a watermark.
+            models.Index(fields=['updated_at', 'id'], name='ticket_updated_idx'),
+            models.Index(fields=['status', '-created_at'], name='ticket_status_recent_idx'),
+            models.Index(fields=['category', '-created_at'], name='ticket_category_recent_idx'),
+            # Triage queue: open tickets by priority, newest first.
+            models.Index(
+                fields=['priority', '-created_at'],
+                name='ticket_open_priority_idx',
+                condition=models.Q(status='open'),
+            ),
+            # Only the (few) rows still waiting on their notification.
+            models.Index(fields=['created_at'], name='ticket_unsent_idx', condition=models.Q(email_sent=False)),
+        ]
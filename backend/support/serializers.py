@@ -1,7 +1,8 @@
 from rest_framework import serializers
+from jevelon_backend.serializers import PrecompiledFieldsMixin, ProjectableSerializerMixin
 from .models import SupportTicket
 
-class SupportTicketSerializer(serializers.ModelSerializer):
+class SupportTicketSerializer(PrecompiledFieldsMixin, ProjectableSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = SupportTicket
         fields = ['id', 'name', 'email', 'priority', 'category', 'subject', 'message', 'status', 'created_at', 'updated_at']
@@ -1,3 +1,421 @@
-from django.test import TestCase
+import csv
+import gzip
+import io
+import json
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+
+from django.db import DatabaseError, connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from jevelon_backend.pagination import WatermarkPagination, changed_since
+from jevelon_backend.testing import ChangelistQueriesMixin, QueryPlanMixin, SubmissionWritesMixin, sample
+from .models import SupportTicket
+
+
+def make_ticket(**overrides):
+    fields = {
+        'name': 'Asha Verma',
+        'email': 'asha@example.com',
+        'subject': 'Login fails',
+        'message': 'The login button does nothing.',
+    }
+    fields.update(overrides)
+    return SupportTicket.objects.create(**fields)
+
+
+class SubmitTicketTests(SubmissionWritesMixin, TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_single_insert_and_deferred_email_sent_update(self):
+        payload = {
+            'name': 'Asha Verma',
+            'email': 'asha@example.com',
+            'priority': 'high',
+            'category': 'bug',
+            'subject': 'Login fails',
+            'message': 'The login button does nothing.',
+        }
+
+        # The deferred UPDATE sets only email_sent, so updated_at is untouched.
+        self.assertSubmissionWrites('/api/support/submit/', payload, SupportTicket)
+
+
+class TicketListingTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        cache.clear()
+
+    def test_pages_cover_every_ticket_once_despite_timestamp_ties(self):
+        tickets = [make_ticket(subject=f'Ticket {i}') for i in range(7)]
+        tied = timezone.now() - timedelta(days=1)
+        SupportTicket.objects.filter(pk__in=[t.pk for t in tickets[2:5]]).update(created_at=tied)
+
+        seen, cursor = [], None
+        while True:
+            params = {'page_size': 2, **({'cursor': cursor} if cursor else {})}
+            data = self.client.get('/api/support/tickets/', params).json()
+            seen += [ticket['id'] for ticket in data['tickets']]
+            cursor = data['next_cursor']
+            if cursor is None:
+                break
+
+        expected = list(SupportTicket.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_filters_by_priority_and_status(self):
+        make_ticket(priority='high')
+        make_ticket(priority='low')
+        make_ticket(priority='high', status='closed')
+
+        data = self.client.get('/api/support/tickets/', {'priority': 'high', 'status': 'open'}).json()
+
+        self.assertEqual(len(data['tickets']), 1)
+        self.assertEqual(data['tickets'][0]['priority'], 'high')
+
+    def test_invalid_filter_value_is_rejected(self):
+        response = self.client.get('/api/support/tickets/', {'priority': 'urgent'})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('priority', response.json()['errors'])
+
+    def test_impossible_dates_are_rejected(self):
+        response = self.client.get(
+            '/api/support/tickets/', {'created_after': '2026-02-30', 'created_before': '2026-13-01T10:00'},
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.json()['errors']), {'created_after', 'created_before'})
+
+    def test_field_projection_never_loads_message(self):
+        make_ticket()
+
+        with CaptureQueriesContext(connection) as queries:
+            data = self.client.get('/api/support/tickets/', {'fields': 'id,subject,status'}).json()
+
+        self.assertEqual(set(data['tickets'][0]), {'id', 'subject', 'status'})
+        self.assertNotIn('"message"', queries.captured_queries[-1]['sql'])
+
+    def test_page_size_is_bounded(self):
+        response = self.client.get('/api/support/tickets/', {'page_size': 10_000})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.json()['next_cursor'])
+
+
+class TicketSyncTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+    def sync(self, since=None, **params):
+        """Follow ``has_more`` from ``since``; returns the ids received and the final watermark."""
+        seen = []
+        while True:
+            data = self.client.get('/api/support/tickets/sync/', {**params, **({'since': since} if since else {})}).json()
+            seen += [ticket['id'] for ticket in data['tickets']]
+            since = data['watermark']
+            if not data['has_more']:
+                return seen, since
+
+    @override_settings(SYNC_SETTLE_SECONDS=0)
+    def test_pages_through_timestamp_ties_then_sends_only_changes(self):
+        tickets = [make_ticket(subject=f'Ticket {i}') for i in range(7)]
+        tied = timezone.now() - timedelta(hours=1)
+        SupportTicket.objects.filter(pk__in=[t.pk for t in tickets[1:6]]).update(updated_at=tied)
+
+        seen, watermark = self.sync(page_size=2)
+        self.assertEqual(sorted(seen), [t.pk for t in tickets])
+        self.assertEqual(len(seen), 7)
+
+        tickets[2].status = 'resolved'
+        tickets[2].save()
+        new = make_ticket(subject='New')
+        with self.assertNumQueries(1):
+            data = self.client.get('/api/support/tickets/sync/', {'since': watermark}).json()
+        self.assertEqual([ticket['id'] for ticket in data['tickets']], [tickets[2].pk, new.pk])
+        self.assertEqual(data['tickets'][0]['status'], 'resolved')
+        self.assertEqual(self.sync(data['watermark']), ([], data['watermark']))
+
+    def test_recent_changes_are_resent_to_catch_late_commits(self):
+        make_ticket()
+        seen, watermark = self.sync()
+        self.assertEqual(len(seen), 1)
+
+        # Saved by a worker whose clock is behind, or committed after the poll.
+        late = make_ticket(subject='Late')
+        SupportTicket.objects.filter(pk=late.pk).update(updated_at=timezone.now() - timedelta(seconds=2))
+
+        again, _ = self.sync(watermark)
+        self.assertIn(late.pk, again)
+
+    def test_invalid_watermark_is_rejected(self):
+        response = self.client.get('/api/support/tickets/sync/', {'since': 'not-a-watermark'})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('since', response.json()['errors'])
+
+    def test_database_errors_use_the_error_envelope(self):
+        with mock.patch.object(WatermarkPagination, 'paginate_queryset', side_effect=DatabaseError('disk I/O error')):
+            response = self.client.get('/api/support/tickets/sync/')
+
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(response.json(), {'success': False, 'error': 'disk I/O error'})
+
+
+class TicketSearchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        cache.clear()
+
+    def search(self, query, **params):
+        return self.client.get('/api/support/tickets/', {'q': query, **params}).json()
+
+    def test_matches_are_ranked_subject_first(self):
+        in_message = make_ticket(subject='Question', message='The checkout page crashes on Safari.')
+        in_subject = make_ticket(subject='Checkout crashes', message='See title.')
+        make_ticket(subject='Dark mode', message='Please add a dark theme.')
+
+        data = self.search('checkout crash')
+
+        self.assertEqual([ticket['id'] for ticket in data['tickets']], [in_subject.pk, in_message.pk])
+
+    def test_index_follows_updates_and_deletes(self):
+        ticket = make_ticket(subject='Invoice request')
+        SupportTicket.objects.filter(pk=ticket.pk).update(subject='Billing question')
+        make_ticket(subject='Invoice missing').delete()
+
+        self.assertEqual(self.search('invoice')['tickets'], [])
+        self.assertEqual(len(self.search('billing')['tickets']), 1)
+
+    def test_ranked_pages_cover_every_match_once(self):
+        for i in range(5):
+            make_ticket(subject='Timeouts at peak', message='timeouts ' * i)
+        make_ticket(subject='Unrelated')
+
+        seen, cursor = [], None
+        while True:
+            data = self.search('timeouts', page_size=2, **({'cursor': cursor} if cursor else {}))
+            seen += [ticket['id'] for ticket in data['tickets']]
+            cursor = data['next_cursor']
+            if cursor is None:
+                break
+
+        self.assertEqual(sorted(seen), sorted(SupportTicket.objects.exclude(subject='Unrelated').values_list('id', flat=True)))
+        self.assertEqual(len(seen), 5)
+
+    def test_search_syntax_in_input_is_literal(self):
+        make_ticket(subject='Login fails')
+
+        for query in ('login"', 'login OR', 'NEAR(login', '*'):
+            with self.subTest(query=query):
+                response = self.client.get('/api/support/tickets/', {'q': query})
+                self.assertEqual(response.status_code, 200)
+
+    def test_admin_search_uses_full_text_index(self):
+        make_ticket(subject='Dashboard is slow')
+        make_ticket(subject='Login fails')
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'password'))
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/admin/support/supportticket/', {'q': 'dashboard'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['cl'].result_list), 1)
+        self.assertFalse(any('LIKE' in query['sql'] for query in queries.captured_queries))
+
+
+class TicketCacheTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        cache.clear()
+        make_ticket(subject='Login fails')
+
+    def get(self, **params):
+        return self.client.get('/api/support/tickets/', params)
+
+    def test_repeated_page_is_served_without_queries(self):
+        first = self.get(priority='medium')
+        with self.assertNumQueries(0):
+            second = self.get(priority='medium')
+
+        self.assertEqual(first['X-Cache'], 'MISS')
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(self.get(priority='high')['X-Cache'], 'MISS')
+
+    def test_submission_invalidates_cached_pages(self):
+        self.get()
+        payload = {'name': 'Ravi Rao', 'email': 'ravi@example.com', 'subject': 'Export to Excel', 'message': 'Please.'}
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/api/support/submit/', payload, format='json')
+
+        response = self.get()
+
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['tickets'][0]['subject'], 'Export to Excel')
+
+    def test_status_change_and_delete_invalidate_cached_pages(self):
+        ticket = SupportTicket.objects.get()
+        self.get()
+        with self.captureOnCommitCallbacks(execute=True):
+            ticket.status = 'resolved'
+            ticket.save()
+        self.assertEqual(self.get().json()['tickets'][0]['status'], 'resolved')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ticket.delete()
+        self.assertEqual(self.get().json()['tickets'], [])
+
+    def test_bulk_submit_invalidates_cached_pages(self):
+        self.client.force_authenticate(User.objects.create_user('ingest'))
+        self.get()
+        payload = [{'name': 'Ravi Rao', 'email': 'ravi@example.com', 'subject': 'Bulk upload', 'message': 'Hi.'}]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/api/support/bulk/', payload, format='json')
+
+        self.assertEqual(len(self.get().json()['tickets']), 2)
+
+    def test_evicted_version_does_not_revive_old_pages(self):
+        self.get()
+        cache.delete('cache-version:support.supportticket')
+
+        self.assertEqual(self.get()['X-Cache'], 'MISS')
+
+    def test_hits_and_misses_are_counted(self):
+        labels = {'namespace': 'tickets'}
+        hits = sample('jevelon_cache_lookups_total', result='hit', **labels)
+        misses = sample('jevelon_cache_lookups_total', result='miss', **labels)
+
+        self.get()
+        self.get()
+        self.get()
+
+        self.assertEqual(sample('jevelon_cache_lookups_total', result='hit', **labels), hits + 2)
+        self.assertEqual(sample('jevelon_cache_lookups_total', result='miss', **labels), misses + 1)
+
+
+class TicketAdminTests(ChangelistQueriesMixin, TestCase):
+    changelist_url = '/admin/support/supportticket/'
+
+    def test_queries_do_not_grow_with_rows(self):
+        # session, user, capped count, page, date range, date drill-down
+        make_ticket()
+        self.assertChangelistQueries(6)
+        for _ in range(60):
+            make_ticket()
+        cache.clear()
+        self.assertChangelistQueries(6)
+
+    def test_facet_counts_and_date_drill_down_are_cached(self):
+        make_ticket(priority='high')
+
+        self.assertChangelistQueries(10, _facets='True')
+        response = self.assertChangelistQueries(4, _facets='True')
+
+        self.assertContains(response, 'High (1)')
+
+    def test_facets_are_cached_per_filter_selection(self):
+        make_ticket(priority='high', status='closed')
+        self.assertChangelistQueries(10, _facets='True')
+
+        # Only the status facets ignore the status filter, so only they come from the cache.
+        response = self.assertChangelistQueries(9, _facets='True', status__exact='open')
+
+        self.assertContains(response, 'High (0)')
+
+    def test_result_count_is_not_repeated_for_the_full_table(self):
+        make_ticket(subject='Login fails')
+
+        response = self.assertChangelistQueries(6, priority__exact='medium')
+
+        self.assertIsNone(response.context['cl'].full_result_count)
+
+
+class TicketQueryPlanTests(QueryPlanMixin, TestCase):
+    def test_listing_page_uses_keyset_index(self):
+        self.assertUsesIndex(SupportTicket.objects.order_by('-created_at', '-id')[:50], 'ticket_recent_idx')
+
+    def test_open_tickets_by_priority_use_partial_index(self):
+        self.assertUsesIndex(
+            SupportTicket.objects.filter(status='open', priority='critical'),
+            'ticket_open_priority_idx',
+        )
+
+    def test_status_filter_uses_index(self):
+        self.assertUsesIndex(SupportTicket.objects.filter(status='resolved'), 'ticket_status_recent_idx')
+
+    def test_category_filter_uses_index(self):
+        self.assertUsesIndex(SupportTicket.objects.filter(category='security'), 'ticket_category_recent_idx')
+
+    def test_date_hierarchy_range_uses_index(self):
+        now = timezone.now()
+        self.assertUsesIndex(
+            SupportTicket.objects.filter(created_at__gte=now - timedelta(days=30), created_at__lt=now)[:100],
+            'ticket_recent_idx',
+        )
+
+    def test_delta_sync_uses_updated_index(self):
+        self.assertUsesIndex(
+            SupportTicket.objects.filter(changed_since(timezone.now(), 1)).order_by('updated_at', 'id')[:200],
+            'ticket_updated_idx',
+        )
+
+    def test_unsent_retry_scan_uses_partial_index(self):
+        self.assertUsesIndex(
+            SupportTicket.objects.filter(email_sent=False).order_by('created_at'),
+            'ticket_unsent_idx',
+        )
+
+
+class TicketExportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user('ops', is_staff=True))
+        make_ticket(priority='high', subject='Checkout, broken')
+        make_ticket(priority='low')
+
+    def read(self, response):
+        return b''.join(response.streaming_content).decode()
+
+    def test_requires_staff(self):
+        response = APIClient().get('/api/support/export/')
+
+        self.assertIn(response.status_code, (401, 403))
+
+    def test_csv_export_streams_filtered_rows(self):
+        response = self.client.get('/api/support/export/', {'format': 'csv', 'priority': 'high'})
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        rows = list(csv.reader(io.StringIO(self.read(response))))
+        self.assertEqual(rows[0][:3], ['id', 'name', 'email'])
+        self.assertEqual(len(rows), 2)
+        self.assertIn('Checkout, broken', rows[1])
+
+    def test_ndjson_export_with_field_projection(self):
+        response = self.client.get('/api/support/export/', {'format': 'ndjson', 'fields': 'id,priority'})
+
+        lines = [json.loads(line) for line in self.read(response).splitlines()]
+        self.assertEqual([line['priority'] for line in lines], ['low', 'high'])
+        self.assertEqual(set(lines[0]), {'id', 'priority'})
+
+    def test_gzip_when_accepted(self):
+        response = self.client.get('/api/support/export/', {'format': 'csv'}, HTTP_ACCEPT_ENCODING='gzip')
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        body = gzip.decompress(b''.join(response.streaming_content)).decode()
+        self.assertEqual(len(body.splitlines()), 3)
+
+    def test_invalid_filter_is_reported_in_requested_format(self):
+        response = self.client.get('/api/support/export/', {'format': 'csv', 'status': 'bogus'})
+
+        self.assertEqual(response.status_code, 400)
+        rows = list(csv.reader(io.StringIO(response.content.decode())))
+        self.assertEqual(rows, [['field', 'error'], ['status', '"bogus" is not a valid choice.']])
@@ -1,7 +1,14 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 
+# Native async view when served over ASGI, DRF view otherwise
+submit_view = views.asubmit_support_ticket if settings.ASYNC_SUBMIT_VIEWS else views.submit_support_ticket
+
 urlpatterns = [
-    path('submit/', views.submit_support_ticket, name='submit_support_ticket'),
+    path('submit/', submit_view, name='submit_support_ticket'),
     path('tickets/', views.get_support_tickets, name='get_support_tickets'),
-] 
\ No newline at end of file
+    path('tickets/sync/', views.sync_support_tickets, name='sync_support_tickets'),
+    path('bulk/', views.bulk_submit_support_tickets, name='bulk_submit_support_tickets'),
+    path('export/', views.export_support_tickets, name='export_support_tickets'),
+]
@@ -1,26 +1,41 @@
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import AllowAny
+from rest_framework.exceptions import ValidationError
+from rest_framework.decorators import api_view, parser_classes, permission_classes, renderer_classes
+from rest_framework.parsers import JSONParser
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
-from django.core.mail import send_mail
 from django.conf import settings
+from jevelon_backend import caching
+from jevelon_backend.bulk import bulk_submit
+from jevelon_backend.exports import EXPORT_RENDERERS, export_response
+from jevelon_backend.filters import filter_queryset
+from jevelon_backend.parsers import NDJSONParser
+from jevelon_backend.pagination import KeysetPagination, RankedPagination, WatermarkPagination
+from jevelon_backend.serializers import only_columns, requested_fields
+from jevelon_backend.submissions import AsyncSubmissionView, SubmissionView
+from notifications import outbox
 from .models import SupportTicket
 from .serializers import SupportTicketSerializer
 
-@api_view(['POST'])
-@permission_classes([AllowAny])
-def submit_support_ticket(request):
+
+def digest_line(ticket):
+    return (
+        f'- #{ticket.id} [{ticket.get_priority_display()}/{ticket.get_category_display()}] '
+        f'{ticket.subject} - {ticket.name} <{ticket.email}>'
+    )
+
+
+class SupportTicketSubmissionView(SubmissionView):
     """Handle support ticket submissions"""
-    try:
-        # Create support ticket record
-        serializer = SupportTicketSerializer(data=request.data)
-        if serializer.is_valid():
-            ticket = serializer.save()
-            
-            # Send email notification to admin
-            email_sent = False
-            try:
-                admin_message = f"""
+
+    serializer_class = SupportTicketSerializer
+    success_message = 'Support ticket submitted successfully'
+    id_field = 'ticket_id'
+    event_type = 'ticket'
+    dedup_fields = ('email', 'subject', 'message')
+
+    def get_messages(self, ticket):
+        admin_message = f"""
                 New support ticket submitted:
                 
                 Ticket ID: {ticket.id}
@@ -33,56 +48,132 @@ def submit_support_ticket(request):
                 
                 Please respond within the appropriate timeframe based on priority.
                 """
-                
-                send_mail(
-                    subject=f'New Support Ticket #{ticket.id} - {ticket.subject}',
-                    message=admin_message,
-                    from_email=settings.DEFAULT_FROM_EMAIL,
-                    recipient_list=[settings.ADMIN_EMAIL],
-                    fail_silently=False,
-                )
-                
-                email_sent = True
-                print(f"✅ Support ticket email sent successfully to {settings.ADMIN_EMAIL}")
-                
-            except Exception as e:
-                print(f"❌ Error sending support ticket email: {e}")
-                email_sent = False
-            
-            # Update email_sent status
-            ticket.email_sent = email_sent
-            ticket.save()
-            
-            return Response({
-                'success': True,
-                'message': 'Support ticket submitted successfully',
-                'ticket_id': ticket.id
-            }, status=status.HTTP_201_CREATED)
-        else:
-            return Response({
-                'success': False,
-                'errors': serializer.errors
-            }, status=status.HTTP_400_BAD_REQUEST)
-            
+        return [
+            outbox.email(
+                subject=f'New Support Ticket #{ticket.id} - {ticket.subject}',
+                body=admin_message,
+                recipients=[settings.ADMIN_EMAIL],
+            ),
+        ]
+
+    def get_digest(self, ticket):
+        # Only priorities with a digest window wait; critical and high tickets go out at once.
+        return outbox.digest(ticket.priority, 'Support tickets', digest_line(ticket))
+
+
+submit_support_ticket = SupportTicketSubmissionView.as_view()
+asubmit_support_ticket = AsyncSubmissionView.as_view(pipeline_class=SupportTicketSubmissionView)
+
+
+def _ticket_page(request):
+    tickets = filter_queryset(
+        SupportTicket.objects.all(),
+        request.query_params,
+        fields=['status', 'priority', 'category'],
+    )
+    fields = requested_fields(request, SupportTicketSerializer)
+    query = request.query_params.get('q', '').strip()
+    if query:
+        tickets = SupportTicket.search_index.search(tickets, query, rank=True)
+        paginator = RankedPagination()
+    else:
+        paginator = KeysetPagination()
+    page = paginator.paginate_queryset(only_columns(tickets, fields), request)
+    serializer = SupportTicketSerializer(page, many=True, fields=fields)
+    return paginator.get_paginated_data(serializer.data, key='tickets')
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def get_support_tickets(request):
+    """List support tickets newest first, one keyset-paginated page at a time.
+
+    Supports ``status``, ``priority`` and ``category`` filters (comma-separated
+    for several values), a ``created_after``/``created_before`` range,
+    ``?fields=`` projection and ``cursor``/``page_size`` paging. ``?q=`` runs
+    a full-text search and orders the matches best first instead.
+
+    Pages are served from the shared cache until a ticket changes; the
+    ``X-Cache`` header says whether this one was.
+    """
+    try:
+        data, hit = caching.cached(
+            'tickets', [SupportTicket], caching.request_key(request), lambda: _ticket_page(request),
+        )
+        response = Response(data, status=status.HTTP_200_OK)
+        response['X-Cache'] = 'HIT' if hit else 'MISS'
+        return response
+    except ValidationError as e:
+        return Response({
+            'success': False,
+            'errors': e.detail
+        }, status=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
         return Response({
             'success': False,
             'error': str(e)
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+
 @api_view(['GET'])
 @permission_classes([AllowAny])
-def get_support_tickets(request):
-    """Get all support tickets (for admin purposes)"""
+def sync_support_tickets(request):
+    """Return the tickets created or changed since ``?since=<watermark>``.
+
+    Without ``since`` it starts from the oldest ticket. Each response carries
+    the ``watermark`` to send next; while ``has_more`` is true there are
+    further changes to fetch right away. Rows changed in the last few seconds
+    may be sent twice, so apply them by ``id``. Takes ``?fields=`` and
+    ``page_size`` like the listing.
+    """
     try:
-        tickets = SupportTicket.objects.all()
-        serializer = SupportTicketSerializer(tickets, many=True)
+        fields = requested_fields(request, SupportTicketSerializer)
+        paginator = WatermarkPagination()
+        tickets = only_columns(SupportTicket.objects.all(), fields, always=('id', 'updated_at'))
+        page = paginator.paginate_queryset(tickets, request)
+        serializer = SupportTicketSerializer(page, many=True, fields=fields)
+        return Response(paginator.get_paginated_data(serializer.data, key='tickets'), status=status.HTTP_200_OK)
+    except ValidationError as e:
         return Response({
-            'success': True,
-            'tickets': serializer.data
-        }, status=status.HTTP_200_OK)
+            'success': False,
+            'errors': e.detail
+        }, status=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
         return Response({
             'success': False,
             'error': str(e)
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+@renderer_classes(EXPORT_RENDERERS)
+def export_support_tickets(request):
+    """Stream support tickets as CSV or NDJSON (staff only).
+
+    Accepts the same filters as the admin (``status``, ``priority``,
+    ``category``, ``email_sent``, ``created_after``, ``created_before``) and
+    an optional ``?fields=`` column list.
+    """
+    tickets = filter_queryset(
+        SupportTicket.objects.all(),
+        request.query_params,
+        fields=['status', 'priority', 'category'],
+        boolean_fields=['email_sent'],
+    )
+    columns = requested_fields(request, SupportTicketSerializer) or SupportTicketSerializer.Meta.fields
+    return export_response(request, tickets, columns, 'support-tickets')
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+@parser_classes([JSONParser, NDJSONParser])
+def bulk_submit_support_tickets(request):
+    """Ingest a batch of support tickets (JSON array or NDJSON body)"""
+    return bulk_submit(
+        request,
+        SupportTicketSerializer,
+        digest_subject=lambda count: f'{count} New Support Tickets - Jevelon Technologies',
+        digest_line=digest_line,
+        event_type=SupportTicketSubmissionView.event_type,
+    )
@@ -46,6 +46,9 @@ export default function Contact() {
   const [isConsultationSubmitting, setIsConsultationSubmitting] = useState(false);
   const [formErrors, setFormErrors] = useState<FormErrors>({});
   const [consultationErrors, setConsultationErrors] = useState<FormErrors>({});
+  // Idempotency keys of the submission in flight, reused when it is retried
+  const [contactKey, setContactKey] = useState<string | null>(null);
+  const [consultationKey, setConsultationKey] = useState<string | null>(null);
 
   // Validation functions
   const validateEmail = (email: string): boolean => {
@@ -131,6 +134,8 @@ export default function Contact() {
     }
 
     setIsSubmitting(true);
+    const idempotencyKey = contactKey ?? crypto.randomUUID();
+    setContactKey(idempotencyKey);
     
     try {
       const apiUrl = (import.meta as { env?: { VITE_API_URL?: string } }).env?.VITE_API_URL || 'http://localhost:8000';
@@ -138,6 +143,7 @@ export default function Contact() {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
+          'Idempotency-Key': idempotencyKey,
         },
         body: JSON.stringify(formData),
       });
@@ -149,6 +155,7 @@ export default function Contact() {
         // Reset form
         setFormData({ name: "", email: "", service: "", message: "" });
         setFormErrors({});
+        setContactKey(null);
       } else {
         alert(`Error: ${result.error || 'Something went wrong'}`);
       }
@@ -168,6 +175,8 @@ export default function Contact() {
     }
 
     setIsConsultationSubmitting(true);
+    const idempotencyKey = consultationKey ?? crypto.randomUUID();
+    setConsultationKey(idempotencyKey);
 
     try {
       // Create consultation service instance
@@ -186,7 +195,7 @@ export default function Contact() {
       };
 
       // Schedule consultation
-      const result = await consultationService.scheduleConsultation(consultationRequest);
+      const result = await consultationService.scheduleConsultation(consultationRequest, idempotencyKey);
 
       if (result.success) {
         alert("Consultation scheduled successfully! We'll send you a confirmation email with meeting details.");
@@ -203,6 +212,7 @@ export default function Contact() {
           additionalNotes: ""
         });
         setConsultationErrors({});
+        setConsultationKey(null);
         setIsConsultationModalOpen(false);
       } else {
         alert(`Error: ${result.error || 'Failed to schedule consultation'}`);
@@ -217,6 +227,8 @@ export default function Contact() {
 
   const handleInputChange = (field: string, value: string) => {
     setFormData(prev => ({ ...prev, [field]: value }));
+    // An edited form is a new submission
+    setContactKey(null);
     // Clear error when user starts typing
     if (formErrors[field as keyof FormErrors]) {
       setFormErrors(prev => ({ ...prev, [field]: undefined }));
@@ -225,6 +237,8 @@ export default function Contact() {
 
   const handleConsultationInputChange = (field: string, value: string | Date | undefined) => {
     setConsultationData(prev => ({ ...prev, [field]: value }));
+    // An edited form is a new submission
+    setConsultationKey(null);
     // Clear error when user starts typing
     if (consultationErrors[field as keyof FormErrors]) {
       setConsultationErrors(prev => ({ ...prev, [field]: undefined }));
@@ -27,6 +27,8 @@ export default function SupportPage() {
   });
   const [isSubmitting, setIsSubmitting] = useState(false);
   const [submitMessage, setSubmitMessage] = useState<{ type: 'success' | 'error', message: string } | null>(null);
+  // Idempotency key of the submission in flight, reused when it is retried
+  const [idempotencyKey, setIdempotencyKey] = useState<string | null>(null);
 
   const supportPlans = [
     {
@@ -99,9 +101,11 @@ export default function SupportPage() {
     e.preventDefault();
     setIsSubmitting(true);
     setSubmitMessage(null);
+    const key = idempotencyKey ?? crypto.randomUUID();
+    setIdempotencyKey(key);
     
     try {
-      const response = await supportService.submitSupportTicket(formData);
+      const response = await supportService.submitSupportTicket(formData, key);
       
       if (response.success) {
         setSubmitMessage({
@@ -116,6 +120,7 @@ export default function SupportPage() {
           subject: "",
           message: ""
         });
+        setIdempotencyKey(null);
       } else {
         setSubmitMessage({
           type: 'error',
@@ -134,6 +139,8 @@ export default function SupportPage() {
 
   const handleInputChange = (field: string, value: string) => {
     setFormData(prev => ({ ...prev, [field]: value }));
+    // An edited form is a new submission
+    setIdempotencyKey(null);
   };
 
   const getColorClasses = (color: string) => {
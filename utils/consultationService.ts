@@ -98,7 +98,8 @@ export class ConsultationService {
     this.crmService = crmService;
   }
 
-  async scheduleConsultation(consultation: ConsultationRequest): Promise<{
+  // Pass the same idempotencyKey when retrying a booking: the server answers it with the original response.
+  async scheduleConsultation(consultation: ConsultationRequest, idempotencyKey: string): Promise<{
     success: boolean;
     eventId?: string;
     leadId?: string;
@@ -116,6 +117,7 @@ export class ConsultationService {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
+          'Idempotency-Key': idempotencyKey,
         },
         body: JSON.stringify({
           name: consultation.name,
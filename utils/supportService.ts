@@ -24,9 +24,12 @@ export interface SupportTicketResponse {
 class SupportService {
   private baseUrl = (import.meta as { env?: { VITE_API_URL?: string } }).env?.VITE_API_URL || 'http://localhost:8000/api/support';
 
-  async submitSupportTicket(ticketData: SupportTicket): Promise<SupportTicketResponse> {
+  // Pass the same idempotencyKey when retrying a submission: the server answers it with the original response.
+  async submitSupportTicket(ticketData: SupportTicket, idempotencyKey: string): Promise<SupportTicketResponse> {
     try {
-      const response = await axios.post(`${this.baseUrl}/submit/`, ticketData);
+      const response = await axios.post(`${this.baseUrl}/submit/`, ticketData, {
+        headers: { 'Idempotency-Key': idempotencyKey },
+      });
       return response.data;
     } catch (error: unknown) {
       console.error('Error submitting support ticket:', error);